@@ -1,8 +1,16 @@
 from fastapi import APIRouter
+from core.config import settings
 from api.v1.endpoints import system
 from api.v1.endpoints import novel
+from api.v1.endpoints import search
+from api.v1.endpoints import metrics
 
 api_router = APIRouter()
 
 api_router.include_router(system.router, prefix="/api/v1/system", tags=["system"])
-api_router.include_router(novel.router, prefix="/novels", tags=["Novels"])
\ No newline at end of file
+api_router.include_router(novel.router, prefix="/novels", tags=["Novels"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+
+# 📈 Prometheus 스크랩 경로는 관례대로 최상위 /metrics
+if settings.metrics.METRICS_ENABLED:
+    api_router.include_router(metrics.router, tags=["Metrics"])
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Response
+from core.logger import logger
+from core.metrics import render_metrics, set_queue_depth
+from service.job_service import JobService
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics(job_service: JobService = Depends()):
+    """Prometheus 스크랩용. 큐 적재량은 조회 시점에 DB에서 집계합니다."""
+    try:
+        set_queue_depth(job_service.count_active_jobs())
+    except Exception as e:
+        # DB 장애 중에도 나머지 지표는 내보냄
+        logger.warning(f"⚠️ 작업 큐 적재량 집계 실패: {e}")
+    data, content_type = render_metrics()
+    return Response(content=data, media_type=content_type)
@@ -1,39 +1,37 @@
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from database import SessionLocal
-from schemas.novel import GenerateConfig, NovelCreate, NovelResponse
-from modules.generator import NovelGenerator
+import json
+import asyncio
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from schemas.novel import GenerateConfig, NovelCreate, NovelResponse, NovelSearchPage
+from schemas.generation_log import GenerationLogPage, GenerationLogDetail
+from schemas.job import GenerationJobResponse
+from schemas.prompt import PromptResponse, PromptUpdate
+from schemas.usage import NovelUsage
 from service.novel_service import NovelService
+from service.novel_read_service import NovelReadService
+from service.job_service import JobService
+from modules.generator import NovelGenerator
+from modules.chapter_summarizer import ChapterSummarizer
+from core.lock import LeaseLock, get_lock_backend, novel_lock_key, try_lock
 
 router = APIRouter()
 
-# ----------------------------------------------------------------
-# 🔒 중복 실행 방지를 위한 전역 메모리 셋(Set)
-# ----------------------------------------------------------------
-active_generations = set()
-
-# ----------------------------------------------------------------
-# 🚀 백그라운드 태스크 (독립 세션 관리)
-# ----------------------------------------------------------------
-def run_generator_task(novel_id: int, config_dict: Dict[str, Any]):
-    db = SessionLocal()
-    try:
-        generator = NovelGenerator(db, novel_id)
-        generator.run_daily_routine(config_dict)
-    finally:
-        # DB 세션을 닫으면서, 진행 중 목록에서도 반드시 삭제 (에러가 나더라도 무조건 실행됨)
-        db.close()
-        active_generations.discard(novel_id)
-
 # ----------------------------------------------------------------
 # 🔍 소설 검색 API
 # ----------------------------------------------------------------
-@router.get("/search", summary="🔍 통합 콘텐츠 검색")
-def search_novel(
+@router.get("/search", response_model=NovelSearchPage, summary="🔍 통합 콘텐츠 검색")
+async def search_novel(
     keyword: str | None = Query(None, description="제목, 줄거리, 세계관 키워드 검색"),
-    novel_service: NovelService = Depends()
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    read_service: NovelReadService = Depends()
 ):
-    return novel_service.search_content(keyword)
+    try:
+        items, next_cursor = await read_service.search_content(keyword, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
 
 # ----------------------------------------------------------------
 # 📝 소설 프로젝트 생성 API
@@ -46,46 +44,201 @@ def create_novel_project(
     return novel_service.create_novel(novel_in)
 
 # ----------------------------------------------------------------
-# ✨ AI 소설 집필 API (비동기 처리 & 중복 방지)
+# ⚙️ 프롬프트 설정 API (저장 시 치환 자리 검사 결과를 함께 반환)
+# ----------------------------------------------------------------
+@router.get("/{novel_id}/prompts", response_model=PromptResponse, summary="⚙️ 프롬프트 설정 조회")
+def get_novel_prompts(
+    novel_id: int,
+    novel_service: NovelService = Depends()
+):
+    novel = novel_service.get_novel(novel_id)
+    prompt = novel_service.get_prompts(novel_id) if novel else None
+    if not prompt:
+        raise HTTPException(status_code=404, detail="해당 소설의 프롬프트 설정을 찾을 수 없습니다.")
+    return PromptResponse.model_validate(prompt).model_copy(update={"placeholder_issues": novel_service.check_prompts(novel, prompt)})
+
+@router.put("/{novel_id}/prompts", response_model=PromptResponse, summary="⚙️ 프롬프트 설정 수정")
+def update_novel_prompts(
+    novel_id: int,
+    prompt_in: PromptUpdate,
+    novel_service: NovelService = Depends()
+):
+    novel = novel_service.get_novel(novel_id)
+    prompt, issues = novel_service.update_prompts(novel, prompt_in) if novel else (None, {})
+    if not prompt:
+        raise HTTPException(status_code=404, detail="해당 소설의 프롬프트 설정을 찾을 수 없습니다.")
+    return PromptResponse.model_validate(prompt).model_copy(update={"placeholder_issues": issues})
+
+# ----------------------------------------------------------------
+# ✨ AI 소설 집필 API (작업 큐 등록 & 중복 방지)
 # ----------------------------------------------------------------
 @router.post("/{novel_id}/generate", summary="✨ AI 소설 자동 집필 시작")
 def generate_novel_chapter(
     novel_id: int, 
     config: GenerateConfig, 
-    background_tasks: BackgroundTasks,
-    novel_service: NovelService = Depends()
+    novel_service: NovelService = Depends(),
+    job_service: JobService = Depends()
 ):
-    # 🚨 1. 중복 실행 검증 (가장 먼저 체크하여 DB 조회 비용 아끼기)
-    if novel_id in active_generations:
-        raise HTTPException(
-            status_code=429, # 429 Too Many Requests
-            detail="⚠️ 현재 이 소설은 이미 AI가 집필을 진행 중입니다. 완료될 때까지 잠시만 기다려주세요."
-        )
-
-    # 2. 소설 존재 여부 사전 검증
+    # 1. 소설 존재 여부 사전 검증
     if not novel_service.get_novel(novel_id):
         raise HTTPException(status_code=404, detail="해당 소설을 찾을 수 없습니다.")
 
-    # 3. Pydantic v2 객체를 딕셔너리로 변환
-    config_data = config.model_dump()
-    
-    # 🔒 4. 락(Lock) 걸기: 진행 중 목록에 소설 ID 추가
-    active_generations.add(novel_id)
-    
-    # 5. 백그라운드 작업 큐에 등록
-    background_tasks.add_task(run_generator_task, novel_id, config_data)
+    # 🔒 2. 등록 구간 잠금: 여러 API 서버가 동시에 같은 소설을 등록하지 못하도록 '확인 → 등록'을 한 번에 처리
+    with try_lock(f"enqueue:{novel_lock_key(novel_id)}", ttl=10) as acquired:
+        # 🚨 3. 중복 실행 검증 (등록 경합 중이거나, 대기/실행 중인 작업 또는 집필 잠금이 있으면 거절)
+        if not acquired or job_service.get_active_job(novel_id) or get_lock_backend().is_locked(novel_lock_key(novel_id)):
+            raise HTTPException(
+                status_code=429, # 429 Too Many Requests
+                detail="⚠️ 현재 이 소설은 이미 AI가 집필을 진행 중입니다. 완료될 때까지 잠시만 기다려주세요."
+            )
+
+        # 4. 작업 큐에 등록 (실제 집필은 별도 워커 프로세스가 처리: python -m modules.worker)
+        job = job_service.enqueue(novel_id, config.model_dump())
 
     return {
-        "status": "started",
-        "message": f"최대 {config.max_attempts}회, 목표 {config.min_score}점으로 집필을 시작합니다."
+        "status": "queued",
+        "job_id": job.id,
+        "message": f"최대 {config.max_attempts}회, 목표 {config.min_score}점으로 집필 작업을 등록했습니다."
     }
 
+# ----------------------------------------------------------------
+# 📡 AI 소설 집필 실시간 스트리밍 API (Server-Sent Events)
+# ----------------------------------------------------------------
+@router.get("/{novel_id}/generate/stream", summary="📡 AI 소설 집필 실시간 스트리밍")
+async def stream_novel_chapter(
+    novel_id: int,
+    config: GenerateConfig = Depends(),
+    novel_service: NovelService = Depends(),
+    job_service: JobService = Depends()
+):
+    """
+    작업 큐를 거치지 않고 이 요청 안에서 바로 집필하며, 진행 상황을 SSE로 흘려보냅니다.
+    이벤트: plot_start, plot(토큰), draft_start, draft(토큰), prescreen_rejected(평가 전 반려), duplicate(유사 원고, 평가 재사용), review(시도별 점수), saved / rejected / error, done
+    클라이언트가 연결을 끊으면 집필도 함께 취소됩니다.
+    """
+    if not novel_service.get_novel(novel_id):
+        raise HTTPException(status_code=404, detail="해당 소설을 찾을 수 없습니다.")
+
+    # 🔒 작업 등록과 같은 try_lock 아래에서 확인하고 소설 잠금까지 잡아 둠 (동시 요청은 여기서 바로 429)
+    lease = LeaseLock(novel_lock_key(novel_id))
+    with try_lock(f"enqueue:{novel_lock_key(novel_id)}", ttl=10) as acquired:
+        if not acquired or job_service.get_active_job(novel_id) or not await lease.acquire():
+            raise HTTPException(
+                status_code=429,
+                detail="⚠️ 현재 이 소설은 이미 AI가 집필을 진행 중입니다. 완료될 때까지 잠시만 기다려주세요."
+            )
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_event(event: str, data: Dict[str, Any]):
+        await queue.put((event, data))
+
+    async def run():
+        try:
+            success = await NovelGenerator(novel_id, on_event=on_event).run_daily_routine(config.model_dump(), lease=lease)
+            await queue.put(("done", {"success": success}))
+        except Exception as e:
+            await queue.put(("error", {"detail": str(e)}))
+            await queue.put(("done", {"success": False}))
+        finally:
+            await lease.release()
+
+    # 스트림이 시작되기 전에 연결이 끊겨도 집필이 끝나면 잠금이 풀리도록 태스크는 바로 시작
+    task = asyncio.create_task(run())
+
+    async def event_stream():
+        try:
+            while True:
+                event, data = await queue.get()
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if event == "done":
+                    break
+        finally:
+            # 연결이 끊기면 제너레이터가 닫히면서 집필 태스크도 취소
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ----------------------------------------------------------------
+# 🧾 집필 작업 상태 조회 / 취소 API
+# ----------------------------------------------------------------
+@router.get("/jobs/{job_id}", response_model=GenerationJobResponse, summary="🧾 집필 작업 상태 조회")
+async def get_generation_job(
+    job_id: int,
+    read_service: NovelReadService = Depends()
+):
+    job = await read_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    return job
+
+@router.post("/jobs/{job_id}/cancel", response_model=GenerationJobResponse, summary="🛑 집필 작업 취소")
+def cancel_generation_job(
+    job_id: int,
+    job_service: JobService = Depends()
+):
+    job = job_service.cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    return job
+
+# ----------------------------------------------------------------
+# 📑 회차별 요약 백필 API
+# ----------------------------------------------------------------
+@router.post("/{novel_id}/chapters/summaries/backfill", summary="📑 기존 회차 요약 일괄 생성")
+async def backfill_chapter_summaries(
+    novel_id: int,
+    batch_size: int = Query(20, ge=1, le=100, description="이번 요청에서 요약할 최대 회차 수"),
+    novel_service: NovelService = Depends()
+):
+    """
+    요약이 비어 있는 회차를 오래된 순으로 batch_size개 요약합니다. remaining이 0이 될 때까지 반복 호출하세요.
+    DB 조회/저장은 스레드에서 짧게 하고, LLM 요약을 기다리는 동안에는 커넥션을 쥐지 않습니다.
+    """
+    if not await asyncio.to_thread(novel_service.get_novel, novel_id):
+        raise HTTPException(status_code=404, detail="해당 소설을 찾을 수 없습니다.")
+    return await ChapterSummarizer().backfill(novel_id, batch_size)
+
 # ----------------------------------------------------------------
 # 📊 히스토리 조회 API
 # ----------------------------------------------------------------
-@router.get("/{novel_id}/history", summary="📊 생성 프로세스 히스토리 조회")
-def get_novel_history(
+@router.get("/{novel_id}/history", response_model=GenerationLogPage, summary="📊 생성 프로세스 히스토리 조회")
+async def get_novel_history(
     novel_id: int, 
-    novel_service: NovelService = Depends()
+    limit: int = Query(50, ge=1, le=200, description="페이지 크기"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    read_service: NovelReadService = Depends()
+):
+    try:
+        items, next_cursor = await read_service.get_history(novel_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{novel_id}/history/{log_id}", response_model=GenerationLogDetail, summary="📄 생성 시도 상세 조회 (본문 포함)")
+async def get_novel_history_detail(
+    novel_id: int,
+    log_id: int,
+    read_service: NovelReadService = Depends()
+):
+    log = await read_service.get_history_detail(novel_id, log_id)
+    if not log:
+        raise HTTPException(status_code=404, detail="해당 생성 기록을 찾을 수 없습니다.")
+    return log
+
+# ----------------------------------------------------------------
+# 🧮 LLM 사용량 / 비용 조회 API
+# ----------------------------------------------------------------
+@router.get("/{novel_id}/usage", response_model=NovelUsage, summary="🧮 단계별 LLM 토큰/지연 시간/비용 조회")
+async def get_novel_usage(
+    novel_id: int,
+    chapter_num: int | None = Query(None, ge=1, description="특정 회차만 집계"),
+    read_service: NovelReadService = Depends()
 ):
-    return novel_service.get_history(novel_id)
\ No newline at end of file
+    """plot / draft / review / summary 단계별, 모델별 호출 수, 토큰, 지연 시간, 재시도, 캐시 적중, 추정 비용"""
+    return await read_service.get_usage(novel_id, chapter_num)
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from database import get_db
+from schemas.search import SearchPage
+from modules.search_index import DOC_TYPES, get_search_backend
+
+router = APIRouter()
+
+# ----------------------------------------------------------------
+# 🔎 전문 검색 API (소설 / 회차 본문 / 생성 기록)
+# ----------------------------------------------------------------
+@router.get("", response_model=SearchPage, summary="🔎 전문 검색 (관련도 순)")
+def full_text_search(
+    q: str = Query(..., min_length=1, description="검색어 (공백으로 여러 단어)"),
+    types: List[str] = Query(list(DOC_TYPES), description="검색 대상: novel, chapter, log"),
+    novel_id: Optional[int] = Query(None, description="특정 소설로 한정"),
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="이전 응답의 next_offset"),
+    db: Session = Depends(get_db)
+):
+    invalid = [t for t in types if t not in DOC_TYPES]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 검색 대상: {', '.join(invalid)}")
+
+    # limit + 1개를 읽어 다음 페이지 존재 여부 판단
+    hits = get_search_backend().search(db, q, types, novel_id, limit + 1, offset)
+    next_offset = offset + limit if len(hits) > limit else None
+    return {"items": hits[:limit], "next_offset": next_offset}
+
+# ----------------------------------------------------------------
+# 🛠️ 검색 색인 재구축 API (SQLite FTS5 보조 인덱스용, MySQL은 자동 유지)
+# ----------------------------------------------------------------
+@router.post("/reindex", summary="🛠️ 검색 색인 전체 재구축")
+def rebuild_search_index(db: Session = Depends(get_db)):
+    backend = get_search_backend()
+    backend.ensure_schema()
+    return {"backend": type(backend).__name__, "indexed": backend.rebuild(db)}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from core.llm_cache import get_llm_cache
 
 router = APIRouter()
 
@@ -8,4 +9,9 @@ def read_root():
         "status": "online",
         "message": "노드 기반 창작 시스템 서버가 정상 작동 중입니다!",
         "version": "0.1.0"
-    }
\ No newline at end of file
+    }
+
+@router.get("/llm-cache", summary="🗃️ LLM 응답 캐시 적중률 조회")
+def read_llm_cache_stats():
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
@@ -0,0 +1,139 @@
+"""
+핫 쿼리 실행 계획 / 속도 비교 벤치마크 (복합 인덱스 적용 전 vs 후)
+
+    cd backend
+    python -m benchmarks.query_plan_bench                              # 임시 SQLite 파일
+    python -m benchmarks.query_plan_bench --url mysql+pymysql://...    # 빈 MySQL 스키마 (테이블을 새로 만듭니다!)
+
+기본값은 소설 100개 × 120화 = 12,000화, 회차당 시도 3회(생성 기록 36,000건)입니다.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Engine
+
+from database import Base
+from models import novel, prompt, chapter, generation_log, generation_job, generation_lock  # noqa: F401
+from models.chapter import Chapter
+from models.generation_log import GenerationLog
+from models.novel import Novel
+
+HOT_INDEXES = [
+    ("chapters", "uq_chapters_novel_chapter"),
+    ("generation_logs", "ix_generation_logs_novel_chapter_attempt"),
+    ("generation_logs", "ix_generation_logs_novel_created"),
+]
+
+def hot_queries(novel_id: int, chapter_num: int):
+    """NovelGenerator / NovelService가 실제로 던지는 쿼리와 같은 모양"""
+    return {
+        "next_chapter_num (MAX)": select(func.max(Chapter.chapter_num)).where(Chapter.novel_id == novel_id),
+        "recent_context (LIMIT 3)": select(Chapter.chapter_num, Chapter.content)
+            .where(Chapter.novel_id == novel_id).order_by(Chapter.chapter_num.desc()).limit(3),
+        "chapter attempts": select(GenerationLog.id, GenerationLog.score)
+            .where(GenerationLog.novel_id == novel_id, GenerationLog.chapter_num == chapter_num)
+            .order_by(GenerationLog.attempt_num),
+        "history page (LIMIT 50)": select(GenerationLog.id, GenerationLog.score, GenerationLog.created_at)
+            .where(GenerationLog.novel_id == novel_id)
+            .order_by(GenerationLog.created_at.desc(), GenerationLog.id.desc()).limit(50),
+    }
+
+def seed(engine: Engine, novels: int, chapters: int, attempts: int, content_chars: int):
+    body = ("가" * content_chars)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(Novel), [{"id": n, "title": f"소설 {n}", "world_setting": {}, "rules": {}} for n in range(1, novels + 1)])
+
+    # 실제처럼 여러 소설의 회차가 섞여 저장되도록 회차 번호 순으로 돌며 모든 소설에 한 화씩 추가
+    log_id = 0
+    for c in range(1, chapters + 1):
+        chapter_rows, log_rows = [], []
+        for n in range(1, novels + 1):
+            created = start + timedelta(minutes=c * novels + n)
+            chapter_rows.append({"novel_id": n, "chapter_num": c, "content": body, "score": 95, "created_at": created})
+            for a in range(1, attempts + 1):
+                log_id += 1
+                log_rows.append({
+                    "id": log_id, "novel_id": n, "chapter_num": c, "attempt_num": a, "content": body[:content_chars // 4],
+                    "score": random.randint(60, 99), "is_selected": 1 if a == attempts else 0, "created_at": created,
+                })
+        with engine.begin() as conn:
+            conn.execute(insert(Chapter), chapter_rows)
+            conn.execute(insert(GenerationLog), log_rows)
+
+def explain(engine: Engine, stmt) -> str:
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.execute(text(prefix + sql)).fetchall()
+    return "\n".join("      " + " | ".join(str(v) for v in row) for row in rows)
+
+def measure(engine: Engine, novels: int, chapters: int, repeat: int):
+    results = {}
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            for name, stmt in hot_queries(random.randint(1, novels), random.randint(1, chapters)).items():
+                t0 = time.perf_counter()
+                conn.execute(stmt).fetchall()
+                results.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+    return {name: (statistics.median(ms), max(ms)) for name, ms in results.items()}
+
+def drop_hot_indexes(engine: Engine):
+    for table_name, index_name in HOT_INDEXES:
+        index = next(i for i in Base.metadata.tables[table_name].indexes if i.name == index_name)
+        index.drop(engine)
+
+def create_hot_indexes(engine: Engine):
+    for table_name, index_name in HOT_INDEXES:
+        index = next(i for i in Base.metadata.tables[table_name].indexes if i.name == index_name)
+        index.create(engine)
+
+def report(title: str, engine: Engine, timings, novels: int, chapters: int):
+    print(f"\n=== {title} ===")
+    for name, stmt in hot_queries(novels // 2 or 1, chapters // 2 or 1).items():
+        median, worst = timings[name]
+        print(f"  ▶ {name}: median {median:.3f}ms / max {worst:.3f}ms")
+        print(explain(engine, stmt))
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 쿼리 인덱스 전/후 비교")
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (기본: 임시 SQLite 파일)")
+    parser.add_argument("--novels", type=int, default=100)
+    parser.add_argument("--chapters", type=int, default=120, help="소설당 회차 수")
+    parser.add_argument("--attempts", type=int, default=3, help="회차당 생성 기록 수")
+    parser.add_argument("--content-chars", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}"
+    engine = create_engine(url)
+    print(f"🗄️ {url} - 소설 {args.novels}개 × {args.chapters}화 = {args.novels * args.chapters:,}화, 생성 기록 {args.novels * args.chapters * args.attempts:,}건")
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    drop_hot_indexes(engine)
+
+    t0 = time.perf_counter()
+    seed(engine, args.novels, args.chapters, args.attempts, args.content_chars)
+    print(f"🌱 데이터 적재 {time.perf_counter() - t0:.1f}s")
+
+    before = measure(engine, args.novels, args.chapters, args.repeat)
+    report("인덱스 적용 전 (PK만)", engine, before, args.novels, args.chapters)
+
+    create_hot_indexes(engine)
+    after = measure(engine, args.novels, args.chapters, args.repeat)
+    report("인덱스 적용 후", engine, after, args.novels, args.chapters)
+
+    print("\n=== 요약 (median) ===")
+    for name in before:
+        speedup = before[name][0] / after[name][0] if after[name][0] else float("inf")
+        print(f"  {name}: {before[name][0]:.3f}ms → {after[name][0]:.3f}ms (x{speedup:.1f})")
+
+if __name__ == "__main__":
+    main()
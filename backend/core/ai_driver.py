@@ -1,28 +1,38 @@
-import os
 import time
+import random
+import asyncio
 import re  # 👈 정규표현식 추가
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable, GoogleAPICallError, InvalidArgument
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Type, TypeVar
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable, GoogleAPICallError, InvalidArgument, NotFound
 from dotenv import load_dotenv
+from pydantic import BaseModel
+from core.config import settings
+from core.logger import logger
+from core.context_cache import ContextCache
+from core.llm_backends import get_llm_backend
+from core.llm_cache import LLMResponseCache, get_llm_cache
+from core.metrics import LLM_STRUCTURED_OUTPUT_TOTAL, observe_llm_attempt
+from core.model_router import get_model_router
+from core.structured_output import parse_structured, response_schema
+from core.usage import current_stage, estimate_tokens, record_llm_call, response_cached_tokens, response_token_counts
 
 # .env 로드
 load_dotenv()
 
+T = TypeVar("T", bound=BaseModel)
+
 class AIDriver:
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        
-        if not self.api_key:
-            raise ValueError("❌ .env 파일에 GEMINI_API_KEY가 설정되지 않았습니다.")
-        
-        genai.configure(api_key=self.api_key)
+        # 🔌 LLM 백엔드 (AI_BACKEND: gemini / fake)
+        self.backend = get_llm_backend()
 
         # 모델 풀 (최신 모델명 확인 필요: 현재 Gemini 2.0/1.5 등이 주류)
-        self.model_pool = [
-            "gemini-2.0-flash", 
-            "gemini-1.5-pro",
-            "gemini-1.5-flash"
-        ]
+        self.model_pool = settings.ai.AI_MODEL_POOL
+
+        # 🧭 단계별 모델 순서 + 서킷 브레이커 + 모델별 요청 한도
+        self.router = get_model_router()
 
         self.generation_config = {
             "temperature": 0.85,
@@ -32,47 +42,279 @@ class AIDriver:
             "response_mime_type": "text/plain",
         }
 
-    def generate(self, prompt):
+        self.max_retries = settings.ai.AI_MAX_RETRIES
+        self.retry_backoff = settings.ai.AI_RETRY_BACKOFF
+
+        # 🧠 모델 클라이언트 캐시 (model_pool 항목당 1개만 만들어 재사용)
+        self._models: Dict[str, Any] = {}
+
+        # 🚦 동시 호출 제한용 세마포어 (이벤트 루프마다 처음 쓸 때 생성)
+        #   세마포어는 만들어진 루프에 묶이므로, 싱글턴을 여러 루프(테스트, asyncio.run 반복)에서 써도 섞이지 않게 루프별로 둠
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _get_model(self, model_name: str) -> Any:
+        model = self._models.get(model_name)
+        if model is None:
+            model = self.backend.get_model(model_name, self.generation_config)
+            self._models[model_name] = model
+        return model
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(settings.ai.AI_MAX_CONCURRENCY))
+        return semaphore
+
+    def _backoff_delay(self, round_num: int) -> float:
+        """지수 백오프 + 지터 (여러 소설이 동시에 같은 타이밍에 재시도하지 않도록)"""
+        return self.retry_backoff * (2 ** round_num) * random.uniform(0.5, 1.0)
+
+    def _cache_key(self, prompt, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        config = {**self.generation_config, **generation_config} if generation_config else self.generation_config
+        return LLMResponseCache.make_key(self.router.models_for(current_stage()), config, prompt)
+
+    def _record_usage(self, model_name: str, prompt, text: str, response, started: float, retries: int):
+        """호출 1건의 사용량 기록 (usage_metadata가 없으면 문자 수로 추정, 실패한 호출은 토큰 0)"""
+        prompt_tokens, output_tokens = response_token_counts(response)
+        if prompt_tokens is None:
+            prompt_tokens, output_tokens = (estimate_tokens(prompt), estimate_tokens(text)) if text else (0, 0)
+        record_llm_call(model_name, prompt_tokens, output_tokens, time.monotonic() - started, retries,
+                        cached_tokens=response_cached_tokens(response))
+
+    def _cached(self, cache, prompt, generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        started = time.monotonic()
+        cached = cache.get(self._cache_key(prompt, generation_config))
+        if cached is not None:
+            record_llm_call("cache", latency=time.monotonic() - started, cached=True)
+        return cached
+
+    # ---------------------------------------------------------
+    # 🗂️ 제공자 측 컨텍스트 캐시
+    # ---------------------------------------------------------
+    def context_cache(self, prefix: str) -> Optional[ContextCache]:
+        """고정 앞부분용 컨텍스트 캐시 (꺼져 있거나 최소 크기보다 작으면 None → 평소처럼 전체 전송)"""
+        if not settings.ai.AI_CONTEXT_CACHE_ENABLED or estimate_tokens(prefix) < settings.ai.AI_CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        return ContextCache(self.backend, prefix, settings.ai.AI_CONTEXT_CACHE_TTL_SECONDS, self.generation_config)
+
+    async def _model_and_prompt(self, model_name: str, prompt, context: Optional[ContextCache]) -> Tuple[Any, Any, bool]:
+        """(호출할 모델, 보낼 프롬프트, 캐시 참조 여부) - 캐시를 못 쓰면 앞부분까지 붙여 일반 모델로"""
+        if context is None:
+            return self._get_model(model_name), prompt, False
+        model = await context.model_for(model_name)
+        if model is None:
+            return self._get_model(model_name), context.full_prompt(prompt), False
+        return model, prompt, True
+
+    def generate(self, prompt, use_cache: bool = False):
         """
         모델 풀을 순회하며 성공할 때까지 시도하는 이어달리기 로직
+        use_cache=True면 같은 프롬프트의 최근 응답을 캐시에서 재사용합니다.
         """
-        
-        for model_name in self.model_pool:
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            cached = self._cached(cache, prompt)
+            if cached is not None:
+                return cached
+
+        text = self._generate_uncached(prompt)
+        if cache and text:
+            cache.set(self._cache_key(prompt), text)
+        return text
+
+    def _generate_uncached(self, prompt):
+        started, failures = time.monotonic(), 0
+        models = self.router.models_for(current_stage())
+        for model_name in models:
+            # 서킷이 열렸거나 요청 한도가 찬 모델은 호출 없이 건너뜀 (기다리지 않고 바로 다음 모델로)
+            if not self.router.acquire(model_name):
+                continue
+            attempt_started, outcome = time.monotonic(), "empty"
             try:
-                model = genai.GenerativeModel(
-                    model_name=model_name,
-                    generation_config=self.generation_config
-                )
+                model = self._get_model(model_name)
 
                 response = model.generate_content(prompt)
-                
+
                 # 가끔 safety_ratings에 의해 차단될 경우 response.text가 에러를 냄
                 if response and response.text:
+                    observe_llm_attempt(model_name, attempt_started, "ok")
+                    self.router.record(model_name, "ok")
+                    self._record_usage(model_name, prompt, response.text, response, started, failures)
                     return response.text
-            
+
             except ResourceExhausted:
-                # 할당량 초과 시 약간 대기 후 다음 모델로
-                time.sleep(2)
-                continue 
+                logger.warning(f"⏳ 할당량 초과 ({model_name}), 다음 모델로 전환합니다.")
+                outcome = "resource_exhausted"
 
             except (ServiceUnavailable, GoogleAPICallError) as e:
-                print(f"🌐 API 호출 오류 ({model_name}): {e}")
-                time.sleep(1)
-                continue
+                logger.warning(f"🌐 API 호출 오류 ({model_name}): {e}")
+                outcome = "api_error"
 
             except Exception as e:
-                print(f"❌ 알 수 없는 오류 ({model_name}): {e}")
-                continue
+                logger.error(f"❌ 알 수 없는 오류 ({model_name}): {e}")
+                outcome = "error"
+
+            observe_llm_attempt(model_name, attempt_started, outcome)
+            self.router.record(model_name, outcome)
+            failures += 1
+
+        self._record_usage(models[-1], prompt, "", None, started, failures)
+        return ""
+
+    async def agenerate(self, prompt, use_cache: bool = False, context: Optional[ContextCache] = None,
+                        generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        generate의 비동기 버전.
+        세마포어로 동시 호출 수를 제한하고, 대기는 asyncio.sleep으로 처리해 스레드를 붙잡지 않습니다.
+        모델 풀 전체가 실패하면 백오프 후 최대 max_retries 바퀴까지 다시 돕니다.
+        context를 주면 prompt는 고정 앞부분 뒤에 이어질 부분이며, 앞부분은 컨텍스트 캐시로 참조합니다.
+        generation_config는 이번 호출에만 덮어쓸 설정입니다. (예: 구조화 출력의 응답 스키마)
+        """
+        cache = get_llm_cache() if use_cache else None
+        # 응답 캐시는 모델이 실제로 보는 전체 입력 기준
+        key_prompt = context.full_prompt(prompt) if context else prompt
+        if cache:
+            cached = self._cached(cache, key_prompt, generation_config)
+            if cached is not None:
+                return cached
+
+        text = await self._agenerate_uncached(prompt, context, generation_config)
+        if cache and text:
+            cache.set(self._cache_key(key_prompt, generation_config), text)
+        return text
+
+    async def _agenerate_uncached(self, prompt, context: Optional[ContextCache] = None,
+                                  generation_config: Optional[Dict[str, Any]] = None) -> str:
+        call_kwargs = {"generation_config": generation_config} if generation_config else {}
+        # 지연 시간은 재시도/백오프 대기까지 포함한 호출 전체 시간
+        started, failures = time.monotonic(), 0
+        stage = current_stage()
+        models = self.router.models_for(stage)
+        for round_num in range(self.max_retries):
+            for model_name in models:
+                # 서킷이 열렸거나 요청 한도가 찬 모델은 호출 없이 건너뜀 (기다리지 않고 바로 다음 모델로)
+                if not self.router.acquire(model_name):
+                    continue
+                outcome, attempt_started, call_prompt, uses_context = "empty", time.monotonic(), prompt, False
+                try:
+                    model, call_prompt, uses_context = await self._model_and_prompt(model_name, prompt, context)
+                    async with self._get_semaphore():
+                        # 세마포어 대기 시간은 빼고 실제 호출 시간만 측정
+                        attempt_started = time.monotonic()
+                        response = await model.generate_content_async(call_prompt, **call_kwargs)
+
+                    if response and response.text:
+                        observe_llm_attempt(model_name, attempt_started, "ok")
+                        self.router.record(model_name, "ok")
+                        self._record_usage(model_name, call_prompt, response.text, response, started, failures)
+                        return response.text
+
+                except NotFound as e:
+                    outcome = await self._context_not_found(model_name, context, uses_context, e)
+
+                except ResourceExhausted:
+                    # 할당량 초과 → 기다리지 않고 바로 다음 모델로
+                    logger.warning(f"⏳ 할당량 초과 ({model_name}), 다음 모델로 전환합니다.")
+                    outcome = "resource_exhausted"
 
+                except (ServiceUnavailable, GoogleAPICallError) as e:
+                    logger.warning(f"🌐 API 호출 오류 ({model_name}): {e}")
+                    outcome = "api_error"
+
+                except Exception as e:
+                    logger.error(f"❌ 알 수 없는 오류 ({model_name}): {e}")
+                    outcome = "error"
+
+                observe_llm_attempt(model_name, attempt_started, outcome)
+                self.router.record(model_name, outcome)
+                failures += 1
+
+            if round_num < self.max_retries - 1:
+                # 단계의 모든 모델이 막혀 있으면 백오프 대신 가장 먼저 풀리는 모델까지 대기
+                wait = min(self.router.wait_time(stage), settings.ai.AI_ROUTER_MAX_WAIT)
+                await asyncio.sleep(max(self._backoff_delay(round_num), wait))
+
+        self._record_usage(models[-1], prompt, "", None, started, failures)
         return ""
 
+    async def _context_not_found(self, model_name: str, context: Optional[ContextCache], uses_context: bool, error: Exception) -> str:
+        """캐시를 참조한 호출이 NotFound면 제공자 쪽에서 캐시가 만료된 것 → 버리고 다음 시도에서 새로 만듦"""
+        if uses_context and context is not None:
+            logger.warning(f"🗂️ 컨텍스트 캐시 만료 ({model_name}), 다음 시도에서 다시 만듭니다.")
+            await context.invalidate(model_name)
+            return "context_expired"
+        logger.warning(f"🌐 API 호출 오류 ({model_name}): {error}")
+        return "api_error"
+
+    async def astream(self, prompt, use_cache: bool = False, context: Optional[ContextCache] = None,
+                      generation_config: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        응답을 생성되는 대로 조각(chunk) 단위로 흘려보내는 스트리밍 버전.
+        첫 조각을 받기 전에 실패하면 다음 모델로 넘어가고, 이미 내보낸 뒤 끊기면 거기서 종료합니다.
+        """
+        cache = get_llm_cache() if use_cache else None
+        key_prompt = context.full_prompt(prompt) if context else prompt
+        if cache:
+            cached = self._cached(cache, key_prompt, generation_config)
+            if cached is not None:
+                yield cached
+                return
+
+        call_kwargs = {"generation_config": generation_config} if generation_config else {}
+        started, failures = time.monotonic(), 0
+        models = self.router.models_for(current_stage())
+        for model_name in models:
+            if not self.router.acquire(model_name):
+                continue
+            chunks, completed, usage_chunk, outcome = [], False, None, "empty"
+            attempt_started, call_prompt, uses_context = time.monotonic(), prompt, False
+            try:
+                model, call_prompt, uses_context = await self._model_and_prompt(model_name, prompt, context)
+                async with self._get_semaphore():
+                    attempt_started = time.monotonic()
+                    response = await model.generate_content_async(call_prompt, stream=True, **call_kwargs)
+                    async for chunk in response:
+                        # 누적 사용량은 마지막 조각의 usage_metadata에 담겨 옴
+                        if response_token_counts(chunk)[0] is not None:
+                            usage_chunk = chunk
+                        text = chunk.text if chunk.parts else ""
+                        if text:
+                            chunks.append(text)
+                            yield text
+                completed = True
+
+            except NotFound as e:
+                outcome = await self._context_not_found(model_name, context, uses_context, e)
+            except ResourceExhausted:
+                logger.warning(f"⏳ 할당량 초과 ({model_name}), 다음 모델로 전환합니다.")
+                outcome = "resource_exhausted"
+            except (ServiceUnavailable, GoogleAPICallError) as e:
+                logger.warning(f"🌐 API 호출 오류 ({model_name}): {e}")
+                outcome = "api_error"
+            except Exception as e:
+                logger.error(f"❌ 알 수 없는 오류 ({model_name}): {e}")
+                outcome = "error"
+
+            # 이미 조각을 내보냈다면 중간에 끊겼어도 다음 모델로 넘어가지 않으므로 ok로 집계
+            observe_llm_attempt(model_name, attempt_started, "ok" if chunks else outcome)
+            self.router.record(model_name, "ok" if chunks else outcome)
+            if chunks:
+                self._record_usage(model_name, call_prompt, "".join(chunks), usage_chunk, started, failures)
+                if cache and completed:
+                    cache.set(self._cache_key(key_prompt, generation_config), "".join(chunks))
+                return
+            failures += 1
+
+        self._record_usage(models[-1], prompt, "", None, started, failures)
+
     def extract_json(self, text: str) -> str:
         """
         텍스트 내부에 포함된 JSON만 추출하는 강력한 정규표현식 로직
         """
         if not text:
             return "{}"
-        
+
         # 가장 바깥쪽의 { ... } 구조를 찾습니다 (마크다운 블록이 있어도 무관)
         json_match = re.search(r"\{.*\}", text, re.DOTALL)
         if json_match:
@@ -80,24 +322,56 @@ class AIDriver:
             # 제어 문자 제거 (줄바꿈 등으로 인한 파싱 에러 방지)
             clean_json = re.sub(r'[\x00-\x1F\x7F]', '', clean_json)
             return clean_json
-            
+
         return "{}"
 
-    def generate_json(self, prompt):
-        """JSON 포맷 추출 로직 강화"""
-        full_prompt = (
+    def _build_json_prompt(self, prompt) -> str:
+        return (
             f"{prompt}\n\n"
             "--- IMPORTANT ---\n"
             "응답은 반드시 유효한 JSON 형식이어야 합니다. "
             "추가 설명이나 인사말 없이 오직 JSON 데이터만 출력하세요."
         )
-        
-        raw_text = self.generate(full_prompt)
-        
+
+    def _clean_json_text(self, raw_text: str) -> str:
         # 1. 정규표현식으로 { } 구간만 추출
         json_text = self.extract_json(raw_text)
-        
+
         # 2. 마크다운 기호가 남아있을 경우를 대비한 2차 정지
-        json_text = json_text.replace('```json', '').replace('```', '').strip()
-        
-        return json_text
\ No newline at end of file
+        return json_text.replace('```json', '').replace('```', '').strip()
+
+    def generate_json(self, prompt, use_cache: bool = False):
+        """JSON 포맷 추출 로직 강화"""
+        raw_text = self.generate(self._build_json_prompt(prompt), use_cache=use_cache)
+        return self._clean_json_text(raw_text)
+
+    async def agenerate_json(self, prompt, use_cache: bool = False, context: Optional[ContextCache] = None) -> str:
+        """generate_json의 비동기 버전"""
+        raw_text = await self.agenerate(self._build_json_prompt(prompt), use_cache=use_cache, context=context)
+        return self._clean_json_text(raw_text)
+
+    async def agenerate_structured(self, prompt, output_model: Type[T], use_cache: bool = False,
+                                   context: Optional[ContextCache] = None) -> Tuple[Optional[T], str]:
+        """
+        구조화 출력: JSON 모드 + output_model에서 만든 응답 스키마로 요청하고 Pydantic으로 검증합니다.
+        깨진 JSON은 로컬에서만 복구하며(코드 펜스/끝 쉼표/잘린 괄호/필드 단위 추출) 다시 호출하지 않습니다.
+        (검증된 값 또는 None, 응답 원문)
+        """
+        if settings.ai.AI_STRUCTURED_OUTPUT:
+            config = {"response_mime_type": "application/json", "response_schema": response_schema(output_model)}
+            raw_text = await self.agenerate(prompt, use_cache=use_cache, context=context, generation_config=config)
+        else:
+            raw_text = await self.agenerate(self._build_json_prompt(prompt), use_cache=use_cache, context=context)
+
+        parsed, result = parse_structured(raw_text, output_model)
+        if raw_text:
+            LLM_STRUCTURED_OUTPUT_TOTAL.labels(schema=output_model.__name__, result=result).inc()
+        if result != "valid" and raw_text:
+            logger.warning(f"🩹 {output_model.__name__} 응답 JSON {'복구' if parsed else '복구 실패'} ({result})")
+        return parsed, raw_text
+
+
+@lru_cache(maxsize=None)
+def get_ai_driver() -> AIDriver:
+    """프로세스 전체에서 공유하는 AIDriver (모델 클라이언트와 세마포어를 함께 공유)"""
+    return AIDriver()
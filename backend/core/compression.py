@@ -0,0 +1,52 @@
+import zlib
+from typing import Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+from core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 zlib으로 대체
+    zstandard = None
+
+# ----------------------------------------------------------------
+# 🗜️ 압축 텍스트 컬럼
+#   압축된 값은 b"\x00" + 코덱 문자로 시작합니다. (UTF-8 텍스트는 NUL로 시작하지 않음)
+#   접두어가 없는 값은 압축하지 않은 UTF-8 (짧은 본문 / TEXT 시절 기존 행)로 읽습니다.
+# ----------------------------------------------------------------
+_ZLIB = b"\x00z"
+_ZSTD = b"\x00s"
+
+def compress_text(value: str, codec: Optional[str] = None) -> bytes:
+    raw = value.encode("utf-8")
+    codec = codec or settings.storage.LOG_CONTENT_COMPRESSION
+    if codec == "none" or len(raw) < settings.storage.LOG_COMPRESSION_MIN_BYTES:
+        return raw
+    if codec == "zstd" and zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor().compress(raw)
+    return _ZLIB + zlib.compress(raw)
+
+def decompress_text(value) -> str:
+    if isinstance(value, str):  # SQLite에서 TEXT로 남아 있는 기존 행
+        return value
+    value = bytes(value)
+    if value[:2] == _ZLIB:
+        return zlib.decompress(value[2:]).decode("utf-8")
+    if value[:2] == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 생성 기록을 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(value[2:]).decode("utf-8")
+    return value.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """파이썬에서는 str, DB에는 압축된 바이너리로 저장 (MySQL: MEDIUMBLOB)"""
+    impl = LargeBinary(length=2 ** 24 - 1)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decompress_text(value)
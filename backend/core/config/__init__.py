@@ -1,10 +1,26 @@
 from .db import DatabaseSettings
 from .app import AppSettings
+from .ai import AISettings
+from .worker import WorkerSettings
+from .lock import LockSettings
+from .context import ContextSettings
+from .search import SearchSettings
+from .log_sink import LogSinkSettings
+from .storage import StorageSettings
+from .metrics import MetricsSettings
 
 class Settings:
     def __init__(self):
         self.db = DatabaseSettings()
         self.app = AppSettings()
+        self.ai = AISettings()
+        self.worker = WorkerSettings()
+        self.lock = LockSettings()
+        self.context = ContextSettings()
+        self.search = SearchSettings()
+        self.log_sink = LogSinkSettings()
+        self.storage = StorageSettings()
+        self.metrics = MetricsSettings()
         
     # 이렇게 직접 꺼내주면 settings.APP_NAME으로 접근 가능합니다.
     @property
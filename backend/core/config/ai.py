@@ -0,0 +1,77 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+from typing import Dict, List
+
+class AISettings(BaseSettings):
+    # 0. 모델 풀 (단계별 설정이 없을 때 이 순서로 시도)
+    AI_MODEL_POOL: List[str] = Field(default=["gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"])
+
+    # 0-1. 단계별 모델 순서 (plot / draft / review / summary). 비어 있는 단계는 AI_MODEL_POOL 순서
+    #      예) {"draft": ["gemini-1.5-pro", "gemini-2.0-flash"], "review": ["gemini-1.5-flash", "gemini-2.0-flash"]}
+    AI_STAGE_MODELS: Dict[str, List[str]] = Field(default={})
+
+    # 0-2. 모델별 분당 요청 한도 (토큰 버킷, 이 프로세스 기준). 없는 모델은 제한 없음
+    #      예) {"gemini-1.5-pro": 2, "gemini-2.0-flash": 15}
+    AI_MODEL_RPM: Dict[str, float] = Field(default={})
+
+    # 0-3. 서킷 브레이커: 할당량 초과/서비스 불가가 연속 N회면 쿨다운 동안 그 모델을 건너뜀
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=3)
+    AI_CIRCUIT_COOLDOWN_SECONDS: float = Field(default=60.0)
+
+    # 0-4. 단계의 모든 모델이 막혔을 때(서킷 열림/요청 한도) 다음 바퀴 전에 기다릴 최대 시간(초)
+    AI_ROUTER_MAX_WAIT: float = Field(default=30.0)
+
+    # 1. 동시 호출 제한 (프로세스 전체에서 동시에 나갈 수 있는 LLM 요청 수)
+    AI_MAX_CONCURRENCY: int = Field(default=8)
+
+    # 2. 재시도 전략 (모델 풀 전체를 몇 바퀴 돌지, 대기 시간은 몇 초부터 시작할지)
+    AI_MAX_RETRIES: int = Field(default=3)
+    AI_RETRY_BACKOFF: float = Field(default=2.0)
+
+    # 3. LLM 응답 캐시 (같은 모델/설정/프롬프트 재요청 시 네트워크 호출 생략)
+    LLM_CACHE_ENABLED: bool = Field(default=False)
+    LLM_CACHE_PATH: str = Field(default=".cache/llm_cache.sqlite3")
+    LLM_CACHE_TTL_SECONDS: int = Field(default=3600)
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=5000)
+
+    # 3-0. 구조화 출력: 평가/요약 단계는 JSON 모드 + 응답 스키마(Pydantic 모델에서 생성)로 요청
+    #      응답 스키마를 지원하지 않는 모델이면 끄세요. (그때는 프롬프트에 JSON 지시를 덧붙임, 검증/복구는 동일)
+    AI_STRUCTURED_OUTPUT: bool = Field(default=True)
+
+    # 3-1. 제공자 측 컨텍스트 캐시: 회차 집필 동안 세계관/설정/최근 맥락(고정 앞부분)을 한 번만 올려 두고 매 시도에서 참조
+    #      Gemini는 버전이 고정된 모델명(예: gemini-1.5-flash-002)만 캐시를 지원하고, 최소 크기보다 작으면 캐시 없이 전체 전송
+    AI_CONTEXT_CACHE_ENABLED: bool = Field(default=False)
+    AI_CONTEXT_CACHE_TTL_SECONDS: int = Field(default=900)
+    AI_CONTEXT_CACHE_MIN_TOKENS: int = Field(default=4096)
+
+    # 4. 모델별 단가 (100만 토큰당 USD [입력, 출력, 캐시된 입력(생략 시 입력 단가)]) - /novels/{id}/usage 비용 계산용
+    AI_MODEL_PRICES: Dict[str, List[float]] = Field(default={
+        "gemini-2.0-flash": [0.10, 0.40, 0.025],
+        "gemini-1.5-pro": [1.25, 5.00, 0.3125],
+        "gemini-1.5-flash": [0.075, 0.30, 0.01875],
+    })
+
+    # 5. LLM 백엔드 (gemini: 실제 API / fake: API 키 없이 지연·점수·장애를 흉내 내는 가짜 응답, 부하 테스트용)
+    AI_BACKEND: str = Field(default="gemini")
+
+    # 5-1. 가짜 백엔드 설정 (같은 시드면 같은 결과)
+    FAKE_LLM_SEED: int = Field(default=0)
+    FAKE_LLM_LATENCY_MS: float = Field(default=300.0)    # 호출 지연 중앙값 (로그정규분포)
+    FAKE_LLM_LATENCY_SIGMA: float = Field(default=0.4)   # 지연 퍼짐 정도 (클수록 꼬리가 김)
+    FAKE_LLM_MS_PER_TOKEN: float = Field(default=0.5)    # 출력 토큰당 추가 지연
+    FAKE_LLM_MS_PER_PROMPT_TOKEN: float = Field(default=0.02)  # 입력 토큰당 추가 지연 (컨텍스트 캐시에 든 토큰은 제외)
+    FAKE_LLM_SCORE_MEAN: float = Field(default=85.0)     # 평가 점수 분포
+    FAKE_LLM_SCORE_STDDEV: float = Field(default=8.0)
+    FAKE_LLM_QUOTA_RATE: float = Field(default=0.0)      # 호출당 할당량 초과(ResourceExhausted) 확률
+    FAKE_LLM_ERROR_RATE: float = Field(default=0.0)      # 호출당 서비스 불가(ServiceUnavailable) 확률
+    FAKE_LLM_MALFORMED_JSON_RATE: float = Field(default=0.0)  # JSON 응답을 코드 펜스/군더더기/끝 쉼표로 망가뜨릴 확률
+    FAKE_LLM_DUPLICATE_DRAFT_RATE: float = Field(default=0.0)  # 재작성 때 직전 원고를 거의 그대로 다시 낼 확률 (온도를 올리면 줄어듦)
+    FAKE_LLM_QUOTA_MODELS: List[str] = Field(default=[]) # 항상 할당량 초과로 응답할 모델
+    FAKE_LLM_DRAFT_CHARS: int = Field(default=4500)      # 가짜 원고 분량(자)
+
+    # 6. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
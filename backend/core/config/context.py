@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class ContextSettings(BaseSettings):
+    # 1. {context}에 넣을 이전 화 맥락의 토큰 예산
+    CONTEXT_TOKEN_BUDGET: int = Field(default=6000)
+
+    # 2. 원문 그대로 넣을 최근 회차 수 (그 이전 회차는 회차별 요약으로 대체)
+    CONTEXT_RECENT_VERBATIM: int = Field(default=1)
+
+    # 3. 토큰 수 추정용 (한국어 기준 대략 글자 1.5개 ≈ 1토큰)
+    CONTEXT_CHARS_PER_TOKEN: float = Field(default=1.5)
+
+    # 4. 요약이 아직 없는 회차는 본문 앞부분을 이 글자 수만큼 잘라 대신 사용
+    CONTEXT_FALLBACK_SUMMARY_CHARS: int = Field(default=300)
+
+    # 5. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
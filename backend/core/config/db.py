@@ -9,15 +9,46 @@ class DatabaseSettings(BaseSettings):
     DB_PASSWORD: str = Field(default="root")
     DB_NAME: str = Field(default="creative")
 
-    # 2. 실행 전략 (환경에 따라 update 또는 none)
+    # 2. 실행 전략 (migrate: 기동 시 alembic upgrade head 실행 / none: 건너뜀, update는 migrate의 옛 이름)
     DB_STRATEGY: str = Field(default="none")
 
-    # 3. SQLAlchemy에서 사용할 URL 생성 프로퍼티
+    # 3. 커넥션 풀 (API 요청용)
+    DB_POOL_SIZE: int = Field(default=10)        # 항상 열어두는 커넥션 수
+    DB_MAX_OVERFLOW: int = Field(default=10)     # 몰릴 때 잠깐 더 여는 커넥션 수
+    DB_POOL_TIMEOUT: int = Field(default=10)     # 풀이 비었을 때 기다리는 최대 시간(초), 넘으면 에러
+    DB_POOL_RECYCLE: int = Field(default=1800)   # MySQL wait_timeout보다 짧게: 오래된 커넥션은 새로 연결
+    DB_POOL_PRE_PING: bool = Field(default=True) # 꺼내기 전에 끊긴 커넥션인지 확인
+
+    # 4. 집필(워커/스트리밍) 전용 풀: 오래 걸리는 집필이 API 요청용 커넥션을 다 가져가지 못하도록 분리
+    DB_BACKGROUND_POOL_SIZE: int = Field(default=5)
+    DB_BACKGROUND_MAX_OVERFLOW: int = Field(default=5)
+
+    # 5. 비동기 엔진 (조회 API용, aiomysql 또는 asyncmy)
+    DB_ASYNC_DRIVER: str = Field(default="aiomysql")
+    DB_ASYNC_POOL_SIZE: int = Field(default=10)
+    DB_ASYNC_MAX_OVERFLOW: int = Field(default=10)
+
+    # 6. 접속 URL 직접 지정 (부하 테스트/로컬 실행용, 예: sqlite:///./bench.sqlite3). 비우면 위 접속 정보로 MySQL URL 생성
+    DB_URL: str = Field(default="")
+
+    # 7. SQLAlchemy에서 사용할 URL 생성 프로퍼티
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
-    # 4. .env 파일 설정
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            # 동기 드라이버 부분만 비동기 드라이버로 교체 (sqlite → aiosqlite, mysql → DB_ASYNC_DRIVER)
+            scheme, _, rest = self.DB_URL.partition("://")
+            backend = scheme.split("+")[0]
+            driver = "aiosqlite" if backend == "sqlite" else self.DB_ASYNC_DRIVER
+            return f"{backend}+{driver}://{rest}"
+        return f"mysql+{self.DB_ASYNC_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    # 8. .env 파일 설정
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
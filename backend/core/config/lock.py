@@ -0,0 +1,17 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class LockSettings(BaseSettings):
+    # 1. 잠금 저장소 (database: 여러 프로세스/서버 공유, memory: 단일 프로세스 전용)
+    LOCK_BACKEND: str = Field(default="database")
+
+    # 2. 임대 시간과 연장 주기 (초) - 연장이 끊기면 LOCK_LEASE_SECONDS 뒤 자동 해제
+    LOCK_LEASE_SECONDS: int = Field(default=120)
+    LOCK_HEARTBEAT_INTERVAL: float = Field(default=30.0)
+
+    # 3. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
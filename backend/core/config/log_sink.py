@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class LogSinkSettings(BaseSettings):
+    # 1. 생성 기록 일괄 저장 기준 (건수가 차거나 시간이 지나면 한 번에 INSERT)
+    LOG_SINK_BATCH_SIZE: int = Field(default=50)
+    LOG_SINK_FLUSH_INTERVAL: float = Field(default=2.0)
+
+    # 2. 아직 DB에 못 쓴 기록을 보관하는 로컬 스풀 디렉터리 (프로세스마다 파일 1개)
+    LOG_SINK_SPOOL_DIR: str = Field(default=".cache/log_spool")
+
+    # 3. 스풀에 쓸 때마다 fsync (끄면 빠르지만 OS가 죽으면 마지막 몇 건을 잃을 수 있음)
+    LOG_SINK_FSYNC: bool = Field(default=True)
+
+    # 4. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
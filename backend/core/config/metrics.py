@@ -0,0 +1,17 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class MetricsSettings(BaseSettings):
+    # 1. Prometheus /metrics 엔드포인트 노출 여부
+    #    (API 서버 + 워커 프로세스를 합쳐서 보려면 모든 프로세스에 PROMETHEUS_MULTIPROC_DIR 환경변수를 같은 경로로 지정)
+    METRICS_ENABLED: bool = Field(default=True)
+
+    # 2. 파이프라인 단계(span)가 끝날 때마다 소요 시간을 JSON 한 줄로 로그에 남길지 여부
+    METRICS_SPAN_LOG: bool = Field(default=False)
+
+    # 3. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class SearchSettings(BaseSettings):
+    # 1. 검색 백엔드 (auto: MySQL이면 FULLTEXT, 아니면 SQLite FTS5 / mysql / sqlite)
+    SEARCH_BACKEND: str = Field(default="auto")
+
+    # 2. SQLite FTS5 보조 인덱스 파일 위치
+    SEARCH_INDEX_PATH: str = Field(default=".cache/search_index.sqlite3")
+
+    # 3. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
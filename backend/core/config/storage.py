@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class StorageSettings(BaseSettings):
+    # 1. 생성 기록 본문 압축 (zstd: zstandard 패키지 필요 / zlib / none)
+    LOG_CONTENT_COMPRESSION: str = Field(default="zlib")
+    LOG_COMPRESSION_MIN_BYTES: int = Field(default=256)  # 이보다 짧은 본문은 압축하지 않음
+
+    # 2. 보존 정책: 회차마다 채택 원고 + 점수 상위 K개 탈락 원고만 전문 보관 (-1이면 정리하지 않음)
+    LOG_RETENTION_TOP_K: int = Field(default=3)
+
+    # 3. 나머지 탈락 원고 처리 (diff: 채택 원고 대비 차이만 보관 / score: 점수·피드백만 남기고 본문 삭제)
+    LOG_RETENTION_MODE: str = Field(default="diff")
+
+    # 4. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
@@ -0,0 +1,28 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+class WorkerSettings(BaseSettings):
+    # 1. 워커 규모 (프로세스 수 × 프로세스당 동시 작업 수 = 최대 동시 집필 수)
+    WORKER_PROCESSES: int = Field(default=1)
+    WORKER_CONCURRENCY: int = Field(default=4)
+
+    # 2. 큐 폴링 및 생존 신호 주기 (초)
+    WORKER_POLL_INTERVAL: float = Field(default=2.0)
+    WORKER_HEARTBEAT_INTERVAL: float = Field(default=10.0)
+
+    # 3. 이 시간(초) 동안 생존 신호가 없는 running 작업은 워커가 죽은 것으로 보고 다시 가져감
+    JOB_STALE_SECONDS: int = Field(default=300)
+
+    # 3-1. 작업 큐 DB 호출(점유/생존 신호/종료 기록) 실패 시 재시도 대기(초): 실패할 때마다 두 배, 최대 WORKER_DB_RETRY_MAX
+    WORKER_DB_RETRY_BACKOFF: float = Field(default=0.5)
+    WORKER_DB_RETRY_MAX: float = Field(default=30.0)
+
+    # 4. 워커 지표 노출 포트 (0이면 끔). 프로세스가 여러 개면 PROMETHEUS_MULTIPROC_DIR도 지정해야 합쳐서 보임
+    WORKER_METRICS_PORT: int = Field(default=0)
+
+    # 5. .env 파일 설정
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from core.logger import logger
+from core.metrics import LLM_CONTEXT_CACHES_TOTAL
+
+# ----------------------------------------------------------------
+# 🗂️ 제공자 측 컨텍스트 캐시 (회차 1개 집필 동안 유지)
+#   세계관/설정/최근 맥락처럼 시도마다 똑같이 보내던 앞부분을 제공자 쪽에 한 번 올려 두고,
+#   이후 호출은 캐시를 참조하는 모델로 뒷부분만 보냅니다. (입력 토큰 단가/전송 시간 절약)
+#   캐시는 모델마다 따로 만들어야 하므로 그 모델을 처음 쓸 때 만들고,
+#   만들 수 없거나(미지원 모델, 너무 작음) 만료됐으면 앞부분 + 뒷부분을 그대로 보냅니다.
+# ----------------------------------------------------------------
+class ContextCache:
+    # 만료 직전에 참조하다 실패하지 않도록 이만큼 남으면 새로 만듦(초)
+    EXPIRY_MARGIN = 30
+
+    def __init__(self, backend, prefix: str, ttl_seconds: int, generation_config: Dict[str, Any]):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.generation_config = generation_config
+        self._models: Dict[str, Optional[Any]] = {}  # 모델명 → 캐시 참조 모델 (None: 이 모델은 캐시 없이 전송)
+        self._handles: Dict[str, Any] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    def full_prompt(self, prompt: str) -> str:
+        """캐시 없이 보낼 때의 전체 프롬프트 (응답 캐시 키로도 사용)"""
+        return f"{self.prefix}\n\n{prompt}"
+
+    async def model_for(self, model_name: str) -> Optional[Any]:
+        """이 모델로 캐시를 참조해 호출할 클라이언트 (없으면 None → full_prompt로 전송)"""
+        async with self._lock:
+            if model_name in self._models and time.monotonic() >= self._expires_at.get(model_name, float("inf")):
+                await self._drop(model_name, "expired")
+            if model_name not in self._models:
+                self._models[model_name] = await self._create(model_name)
+            return self._models[model_name]
+
+    async def invalidate(self, model_name: str):
+        """제공자 쪽에서 캐시가 사라진 경우 (다음 호출에서 새로 만듦)"""
+        async with self._lock:
+            await self._drop(model_name, "expired")
+
+    async def close(self):
+        """집필이 끝나면 TTL을 기다리지 않고 바로 지움 (보관 비용 절약)"""
+        async with self._lock:
+            for model_name in list(self._handles):
+                await self._drop(model_name)
+            self._models.clear()
+
+    async def _create(self, model_name: str) -> Optional[Any]:
+        started = time.monotonic()
+        try:
+            handle = await asyncio.to_thread(self.backend.create_context_cache, model_name, self.prefix, self.ttl_seconds)
+            model = self.backend.get_cached_model(handle, self.generation_config)
+        except Exception as e:
+            LLM_CONTEXT_CACHES_TOTAL.labels(model=model_name, result="failed").inc()
+            logger.warning(f"⚠️ 컨텍스트 캐시 생성 실패 ({model_name}) → 캐시 없이 전송합니다: {e}")
+            return None
+        LLM_CONTEXT_CACHES_TOTAL.labels(model=model_name, result="created").inc()
+        self._handles[model_name] = handle
+        self._expires_at[model_name] = started + self.ttl_seconds - self.EXPIRY_MARGIN
+        return model
+
+    async def _drop(self, model_name: str, result: Optional[str] = None):
+        self._models.pop(model_name, None)
+        self._expires_at.pop(model_name, None)
+        handle = self._handles.pop(model_name, None)
+        if result:
+            LLM_CONTEXT_CACHES_TOTAL.labels(model=model_name, result=result).inc()
+        if handle is not None:
+            try:
+                await asyncio.to_thread(self.backend.delete_context_cache, handle)
+            except Exception as e:
+                logger.warning(f"⚠️ 컨텍스트 캐시 삭제 실패 ({model_name}, TTL 후 자동 만료): {e}")
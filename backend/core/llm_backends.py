@@ -0,0 +1,345 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from google.api_core.exceptions import NotFound, ResourceExhausted, ServiceUnavailable
+
+from core.config import settings
+from core.usage import current_stage
+
+# 가짜 모델이 기준으로 삼는 온도 (AIDriver 기본 generation_config와 같음)
+FAKE_BASE_TEMPERATURE = 0.85
+
+# ----------------------------------------------------------------
+# 🔌 LLM 제공자 백엔드
+#   AIDriver는 백엔드가 돌려주는 "모델 클라이언트"로만 호출합니다.
+#   클라이언트는 Gemini GenerativeModel과 같은 모양이어야 합니다:
+#     generate_content(prompt) / await generate_content_async(prompt, stream=False)
+#     → 응답(.text, .parts, .usage_metadata), stream=True면 응답 조각의 async iterator
+#   실패는 google.api_core 예외(ResourceExhausted / ServiceUnavailable 등)로 알립니다.
+#   컨텍스트 캐시(고정 앞부분을 제공자 쪽에 올려 두고 참조)는 선택 기능이며, 지원하지 않으면 예외를 던집니다.
+# ----------------------------------------------------------------
+class LLMBackend(ABC):
+    """LLM 백엔드 공통 인터페이스 (get_model만 필수, 컨텍스트 캐시는 지원하는 백엔드만 재정의)"""
+    name = "base"
+
+    @abstractmethod
+    def get_model(self, model_name: str, generation_config: Dict[str, Any]) -> Any:
+        """Gemini GenerativeModel과 같은 모양의 모델 클라이언트"""
+
+    def create_context_cache(self, model_name: str, prefix: str, ttl_seconds: int) -> Any:
+        """prefix를 제공자 쪽 캐시에 올리고 핸들을 반환 (동기 호출)"""
+        raise NotImplementedError(f"{self.name} 백엔드는 컨텍스트 캐시를 지원하지 않습니다.")
+
+    def get_cached_model(self, handle: Any, generation_config: Dict[str, Any]) -> Any:
+        """캐시를 참조하는 모델 클라이언트 (프롬프트에는 prefix 뒷부분만 보냄)"""
+        raise NotImplementedError(f"{self.name} 백엔드는 컨텍스트 캐시를 지원하지 않습니다.")
+
+    def delete_context_cache(self, handle: Any) -> None:
+        pass
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self):
+        import google.generativeai as genai
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("❌ .env 파일에 GEMINI_API_KEY가 설정되지 않았습니다. (API 키 없이 돌리려면 AI_BACKEND=fake)")
+        genai.configure(api_key=api_key)
+        self._genai = genai
+
+    def get_model(self, model_name: str, generation_config: Dict[str, Any]) -> Any:
+        return self._genai.GenerativeModel(model_name=model_name, generation_config=generation_config)
+
+    def create_context_cache(self, model_name: str, prefix: str, ttl_seconds: int) -> Any:
+        from google.generativeai import caching
+
+        # 캐시는 모델(버전 고정 이름)에 묶이므로 모델마다 따로 만듦
+        return caching.CachedContent.create(
+            model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+            display_name="my-creative-chapter-context",
+            contents=[prefix],
+            ttl=timedelta(seconds=ttl_seconds),
+        )
+
+    def get_cached_model(self, handle: Any, generation_config: Dict[str, Any]) -> Any:
+        return self._genai.GenerativeModel.from_cached_content(cached_content=handle, generation_config=generation_config)
+
+    def delete_context_cache(self, handle: Any) -> None:
+        handle.delete()
+
+# ----------------------------------------------------------------
+# 🧪 가짜 LLM 백엔드 (API 키/네트워크 없이 집필 파이프라인 전체를 돌리는 용도)
+#   - 지연 시간: 로그정규분포(중앙값 FAKE_LLM_LATENCY_MS, 퍼짐 FAKE_LLM_LATENCY_SIGMA) + 입력/출력 토큰당 시간
+#   - 평가 점수: 정규분포(FAKE_LLM_SCORE_MEAN, FAKE_LLM_SCORE_STDDEV)
+#   - 장애 주입: 할당량 초과 / 서비스 불가 확률, 항상 할당량 초과인 모델 목록
+#   같은 시드 + 같은 프롬프트 + 같은 호출 순번이면 항상 같은 결과 (병렬 실행 순서와 무관)
+# ----------------------------------------------------------------
+@dataclass
+class FakeUsage:
+    prompt_token_count: int
+    candidates_token_count: int
+    total_token_count: int = 0
+    cached_content_token_count: int = 0
+
+    def __post_init__(self):
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+@dataclass
+class FakeResponse:
+    text: str
+    usage_metadata: Optional[FakeUsage] = None
+    parts: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.text and not self.parts:
+            self.parts = [self.text]
+
+
+@dataclass
+class FakePlan:
+    """호출 1건의 결과 (미리 정해 두고 지연 시간만큼 기다린 뒤 돌려줌)"""
+    latency: float
+    text: str
+    prompt_tokens: int
+    error: Optional[Exception] = None
+    cached_tokens: int = 0
+
+
+@dataclass
+class FakeContextCache:
+    name: str
+    model_name: str
+    prefix: str
+    expires_at: float
+
+
+class FakeModel:
+    def __init__(self, backend: "FakeBackend", model_name: str, context: Optional[FakeContextCache] = None,
+                 generation_config: Optional[Dict[str, Any]] = None):
+        self.backend = backend
+        self.model_name = model_name
+        self.context = context
+        self.generation_config = generation_config or {}
+
+    def _temperature(self, generation_config: Optional[Dict[str, Any]]) -> float:
+        return {**self.generation_config, **(generation_config or {})}.get("temperature", FAKE_BASE_TEMPERATURE)
+
+    def generate_content(self, prompt, generation_config: Optional[Dict[str, Any]] = None):
+        plan = self.backend.plan(self.model_name, prompt, self.context, self._temperature(generation_config))
+        time.sleep(plan.latency)
+        return self.backend.finish(plan)
+
+    async def generate_content_async(self, prompt, stream: bool = False, generation_config: Optional[Dict[str, Any]] = None):
+        plan = self.backend.plan(self.model_name, prompt, self.context, self._temperature(generation_config))
+        if stream:
+            return self.backend.stream(plan)
+        await asyncio.sleep(plan.latency)
+        return self.backend.finish(plan)
+
+
+class FakeBackend(LLMBackend):
+    name = "fake"
+
+    def __init__(self, seed: int = 0, latency_ms: float = 300.0, latency_sigma: float = 0.4, ms_per_token: float = 0.5,
+                 ms_per_prompt_token: float = 0.02, score_mean: float = 85.0, score_stddev: float = 8.0, quota_rate: float = 0.0, error_rate: float = 0.0,
+                 quota_models: Optional[List[str]] = None, draft_chars: int = 4500, malformed_json_rate: float = 0.0,
+                 duplicate_draft_rate: float = 0.0):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.ms_per_token = ms_per_token
+        self.ms_per_prompt_token = ms_per_prompt_token
+        self.score_mean = score_mean
+        self.score_stddev = score_stddev
+        self.quota_rate = quota_rate
+        self.error_rate = error_rate
+        self.quota_models = set(quota_models or [])
+        self.draft_chars = draft_chars
+        self.malformed_json_rate = malformed_json_rate
+        self.duplicate_draft_rate = duplicate_draft_rate
+        self._counters: Dict[str, int] = {}
+        self._last_drafts: Dict[str, str] = {}
+        self._caches: Dict[str, FakeContextCache] = {}
+        self._lock = threading.Lock()
+
+    def get_model(self, model_name: str, generation_config: Dict[str, Any]) -> Any:
+        return FakeModel(self, model_name, generation_config=generation_config)
+
+    # ---------------------------------------------------------
+    # 🗂️ 가짜 컨텍스트 캐시 (캐시된 앞부분은 입력 지연에 포함하지 않음)
+    # ---------------------------------------------------------
+    def create_context_cache(self, model_name: str, prefix: str, ttl_seconds: int) -> FakeContextCache:
+        with self._lock:
+            handle = FakeContextCache(f"cachedContents/fake-{len(self._caches) + 1}", model_name, prefix, time.monotonic() + ttl_seconds)
+            self._caches[handle.name] = handle
+        return handle
+
+    def get_cached_model(self, handle: FakeContextCache, generation_config: Dict[str, Any]) -> Any:
+        return FakeModel(self, handle.model_name, handle, generation_config)
+
+    def delete_context_cache(self, handle: FakeContextCache) -> None:
+        with self._lock:
+            self._caches.pop(handle.name, None)
+
+    def active_context_caches(self) -> int:
+        with self._lock:
+            return len(self._caches)
+
+    # ---------------------------------------------------------
+    # 🎲 호출 결과 정하기
+    # ---------------------------------------------------------
+    def _rng(self, model_name: str, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\x00{model_name}\x00{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            n = self._counters.get(digest, 0)
+            self._counters[digest] = n + 1
+        return random.Random(f"{digest}:{n}")
+
+    def plan(self, model_name: str, prompt: Any, context: Optional[FakeContextCache] = None,
+             temperature: float = FAKE_BASE_TEMPERATURE) -> FakePlan:
+        prompt = str(prompt)
+        if context is not None:
+            with self._lock:
+                alive = context.name in self._caches and time.monotonic() < context.expires_at
+            if not alive:
+                return FakePlan(0.0, "", 0, NotFound(f"fake context cache expired ({context.name})"))
+        # 캐시를 참조해도 모델이 보는 전체 입력은 같으므로 결과도 같게 (앞부분 + 뒷부분 기준으로 시드)
+        full_prompt = f"{context.prefix}\n\n{prompt}" if context else prompt
+        rng = self._rng(model_name, full_prompt)
+        cached_tokens = _tokens(context.prefix) if context else 0
+        prompt_tokens = _tokens(full_prompt)
+        base = self.latency_ms * math.exp(self.latency_sigma * rng.gauss(0, 1)) / 1000
+        base += (prompt_tokens - cached_tokens) * self.ms_per_prompt_token / 1000
+
+        if model_name in self.quota_models or rng.random() < self.quota_rate:
+            # 할당량 초과는 보통 빨리 돌아옴
+            return FakePlan(base * 0.2, "", prompt_tokens, ResourceExhausted(f"fake quota exceeded ({model_name})"))
+        if rng.random() < self.error_rate:
+            return FakePlan(base, "", prompt_tokens, ServiceUnavailable(f"fake service unavailable ({model_name})"))
+
+        text = self._text(rng, current_stage(), full_prompt, temperature)
+        return FakePlan(base + _tokens(text) * self.ms_per_token / 1000, text, prompt_tokens, cached_tokens=cached_tokens)
+
+    def finish(self, plan: FakePlan) -> FakeResponse:
+        if plan.error:
+            raise plan.error
+        return FakeResponse(plan.text, _usage(plan))
+
+    async def stream(self, plan: FakePlan, chunk_chars: int = 200) -> AsyncIterator[FakeResponse]:
+        if plan.error:
+            await asyncio.sleep(plan.latency)
+            raise plan.error
+        chunks = [plan.text[i:i + chunk_chars] for i in range(0, len(plan.text), chunk_chars)] or [""]
+        for i, chunk in enumerate(chunks):
+            await asyncio.sleep(plan.latency / len(chunks))
+            # 누적 사용량은 마지막 조각에만 (Gemini 스트리밍과 같은 방식)
+            usage = _usage(plan) if i == len(chunks) - 1 else None
+            yield FakeResponse(chunk, usage)
+
+    # ---------------------------------------------------------
+    # ✍️ 단계별 가짜 응답
+    # ---------------------------------------------------------
+    def _text(self, rng: random.Random, stage: str, prompt: str, temperature: float = FAKE_BASE_TEMPERATURE) -> str:
+        if stage == "review":
+            score = max(0, min(100, round(rng.gauss(self.score_mean, self.score_stddev))))
+            return self._json(rng, {
+                "score": score,
+                "feedback": f"[가짜 평가] {score}점: 대사 비율과 문단 길이를 조금 더 다듬으세요.",
+                "details": {"readability": min(20, score // 5 + rng.randint(-2, 2)), "fun": min(20, score // 5 + rng.randint(-2, 2))},
+            })
+        if stage == "summary" or (stage != "draft" and "JSON" in prompt):
+            return self._json(rng, {"summary": f"[가짜 요약] 주인공이 새로운 단서를 발견한다. ({rng.randint(1, 9999)})"})
+        if stage == "plot":
+            return "\n".join(f"{i}. [가짜 플롯] 사건 {rng.randint(1, 999)}이(가) 벌어진다." for i in range(1, 6))
+        return self._draft_for(rng, prompt, temperature)
+
+    def _json(self, rng: random.Random, data: Dict[str, Any]) -> str:
+        """가끔 모델이 내놓는 깨진 JSON 흉내 (코드 펜스 + 끝 쉼표 + 뒤에 붙은 설명)"""
+        text = json.dumps(data, ensure_ascii=False)
+        if rng.random() < self.malformed_json_rate:
+            text = f"```json\n{text[:-1]},\n}}\n```\n위 평가는 참고용입니다. {{추가 의견 없음}}"
+        return text
+
+    def _draft_for(self, rng: random.Random, prompt: str, temperature: float) -> str:
+        """
+        재작성 지시를 무시하고 직전 원고를 거의 그대로 다시 내는 모델 흉내 (FAKE_LLM_DUPLICATE_DRAFT_RATE)
+        같은 원고 흐름 = 재작성 지시(🚨) 앞부분이 같은 프롬프트. 온도를 올릴수록 반복 확률이 줄어듦
+        """
+        key = hashlib.sha256(prompt.split("🚨")[0].encode("utf-8")).hexdigest()
+        rate = self.duplicate_draft_rate * max(0.0, 1 - (temperature - FAKE_BASE_TEMPERATURE) * 2)
+        with self._lock:
+            previous = self._last_drafts.get(key)
+        if previous and rng.random() < rate:
+            lines = previous.split("\n")
+            for i in rng.sample(range(len(lines)), k=max(1, len(lines) // 20)):
+                lines[i] = lines[i].replace("번째", f"{rng.randint(1, 9)}번째", 1)
+            text = "\n".join(lines)
+        else:
+            text = self._draft(rng)
+        with self._lock:
+            self._last_drafts[key] = text
+        return text
+
+    def _draft(self, rng: random.Random) -> str:
+        """대사/서술이 섞인 1~3줄 문단 (분량 FAKE_LLM_DRAFT_CHARS 내외)"""
+        lines, size = [], 0
+        target = int(self.draft_chars * rng.uniform(0.85, 1.15))
+        while size < target:
+            if rng.random() < 0.6:
+                line = f"\"{rng.choice(_DIALOGUE)} {rng.randint(1, 99)}번째야.\""
+            else:
+                line = f"{rng.choice(_NARRATION)} 바람이 {rng.randint(1, 9)}번 불었다."
+            lines.append(line)
+            size += len(line) + 1
+            if rng.random() < 0.4:
+                lines.append("")
+        return "\n".join(lines)
+
+
+_DIALOGUE = ["지금 뭐라고 했어?", "이건 말도 안 돼.", "내가 먼저 갈게.", "그 문을 열면 안 돼.", "기억나지 않아?"]
+_NARRATION = ["그는 숨을 골랐다.", "어둠 속에서 발소리가 울렸다.", "그녀의 눈빛이 흔들렸다.", "창밖으로 비가 쏟아졌다."]
+
+
+def _tokens(text: str) -> int:
+    return math.ceil(len(text) / settings.context.CONTEXT_CHARS_PER_TOKEN) if text else 0
+
+
+def _usage(plan: FakePlan) -> FakeUsage:
+    return FakeUsage(plan.prompt_tokens, _tokens(plan.text), cached_content_token_count=plan.cached_tokens)
+
+
+@lru_cache(maxsize=None)
+def get_llm_backend() -> LLMBackend:
+    """AI_BACKEND 설정에 맞는 LLM 백엔드 (프로세스당 1개)"""
+    if settings.ai.AI_BACKEND == "fake":
+        return FakeBackend(
+            seed=settings.ai.FAKE_LLM_SEED,
+            latency_ms=settings.ai.FAKE_LLM_LATENCY_MS,
+            latency_sigma=settings.ai.FAKE_LLM_LATENCY_SIGMA,
+            ms_per_token=settings.ai.FAKE_LLM_MS_PER_TOKEN,
+            ms_per_prompt_token=settings.ai.FAKE_LLM_MS_PER_PROMPT_TOKEN,
+            score_mean=settings.ai.FAKE_LLM_SCORE_MEAN,
+            score_stddev=settings.ai.FAKE_LLM_SCORE_STDDEV,
+            quota_rate=settings.ai.FAKE_LLM_QUOTA_RATE,
+            error_rate=settings.ai.FAKE_LLM_ERROR_RATE,
+            quota_models=settings.ai.FAKE_LLM_QUOTA_MODELS,
+            draft_chars=settings.ai.FAKE_LLM_DRAFT_CHARS,
+            malformed_json_rate=settings.ai.FAKE_LLM_MALFORMED_JSON_RATE,
+            duplicate_draft_rate=settings.ai.FAKE_LLM_DUPLICATE_DRAFT_RATE,
+        )
+    return GeminiBackend()
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence
+
+from core.config import settings
+from core.logger import logger
+
+class LLMResponseCache:
+    """
+    프롬프트 내용 기반(content-addressed) LLM 응답 캐시.
+    키는 hash(모델, generation_config, 프롬프트)이고, 로컬 SQLite 파일에 저장됩니다.
+    - TTL이 지난 항목은 조회 시 무시하고 삭제
+    - 항목 수가 max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(models: Sequence[str], generation_config: Dict[str, Any], prompt: Any) -> str:
+        payload = json.dumps(
+            {"models": list(models), "config": generation_config, "prompt": prompt},
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[1] <= self.ttl_seconds:
+                self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                return row[0]
+
+            if row:
+                # TTL 만료 → 바로 정리
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        if not response:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """항목 수 상한을 넘은 만큼 LRU 순으로 제거"""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        total = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """LLM_CACHE_ENABLED일 때만 캐시 인스턴스를 반환 (프로세스당 1개)"""
+    if not settings.ai.LLM_CACHE_ENABLED:
+        return None
+    logger.info(f"🗃️ LLM 응답 캐시 사용: {settings.ai.LLM_CACHE_PATH}")
+    return LLMResponseCache(
+        path=settings.ai.LLM_CACHE_PATH,
+        ttl_seconds=settings.ai.LLM_CACHE_TTL_SECONDS,
+        max_entries=settings.ai.LLM_CACHE_MAX_ENTRIES,
+    )
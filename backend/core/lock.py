@@ -0,0 +1,245 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from core.config import settings
+from core.logger import logger
+from database import SessionLocal
+from models.generation_lock import GenerationLock
+
+# ----------------------------------------------------------------
+# 🔒 잠금 저장소 (lease 방식: 만료 시각이 지나면 누구나 다시 가져갈 수 있음)
+# ----------------------------------------------------------------
+class LockBackend(ABC):
+    """잠금 저장소 공통 인터페이스"""
+
+    @abstractmethod
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        """비어 있거나 만료됐거나 이미 내 것이면 가져오고 True"""
+
+    @abstractmethod
+    def refresh(self, key: str, owner: str, ttl: int) -> bool:
+        """보유 중인 잠금의 만료 시각 연장. 이미 빼앗겼으면 False"""
+
+    @abstractmethod
+    def release(self, key: str, owner: str) -> None:
+        """내 잠금일 때만 해제"""
+
+    @abstractmethod
+    def is_locked(self, key: str) -> bool:
+        """누군가 만료 전 잠금을 보유 중인지"""
+
+
+class InProcessLockBackend(LockBackend):
+    """단일 프로세스 전용 (DB 없이 개발할 때의 대체 구현)"""
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[str, datetime]] = {}
+        self._mutex = threading.Lock()
+
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        with self._mutex:
+            current = self._locks.get(key)
+            if current and current[0] != owner and current[1] > _now():
+                return False
+            self._locks[key] = (owner, _now() + timedelta(seconds=ttl))
+            return True
+
+    def refresh(self, key: str, owner: str, ttl: int) -> bool:
+        with self._mutex:
+            current = self._locks.get(key)
+            if not current or current[0] != owner:
+                return False
+            self._locks[key] = (owner, _now() + timedelta(seconds=ttl))
+            return True
+
+    def release(self, key: str, owner: str) -> None:
+        with self._mutex:
+            current = self._locks.get(key)
+            if current and current[0] == owner:
+                del self._locks[key]
+
+    def is_locked(self, key: str) -> bool:
+        with self._mutex:
+            current = self._locks.get(key)
+            return bool(current and current[1] > _now())
+
+
+class DatabaseLockBackend(LockBackend):
+    """
+    generation_locks 테이블의 잠금 행(lock row)을 이용한 프로세스/서버 간 공유 잠금.
+    매 호출마다 짧은 세션을 열고 바로 닫으므로 잠금을 보유하는 동안 커넥션을 붙잡지 않습니다.
+    """
+
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        expires_at = _now() + timedelta(seconds=ttl)
+        db = SessionLocal()
+        try:
+            # 1. 잠금 행이 없으면 새로 만들어 획득
+            try:
+                db.add(GenerationLock(lock_key=key, owner=owner, expires_at=expires_at))
+                db.commit()
+                return True
+            except IntegrityError:
+                db.rollback()
+
+            # 2. 이미 있으면 만료됐거나 내 것일 때만 조건부 UPDATE로 탈취 (원자적)
+            updated = db.query(GenerationLock).filter(
+                GenerationLock.lock_key == key,
+                (GenerationLock.expires_at < _now()) | (GenerationLock.owner == owner)
+            ).update({"owner": owner, "expires_at": expires_at}, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        finally:
+            db.close()
+
+    def refresh(self, key: str, owner: str, ttl: int) -> bool:
+        db = SessionLocal()
+        try:
+            updated = db.query(GenerationLock).filter(
+                GenerationLock.lock_key == key, GenerationLock.owner == owner
+            ).update({"expires_at": _now() + timedelta(seconds=ttl)}, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        finally:
+            db.close()
+
+    def release(self, key: str, owner: str) -> None:
+        db = SessionLocal()
+        try:
+            db.query(GenerationLock).filter(
+                GenerationLock.lock_key == key, GenerationLock.owner == owner
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def is_locked(self, key: str) -> bool:
+        db = SessionLocal()
+        try:
+            return db.query(GenerationLock.lock_key).filter(
+                GenerationLock.lock_key == key, GenerationLock.expires_at >= _now()
+            ).first() is not None
+        finally:
+            db.close()
+
+
+@lru_cache(maxsize=None)
+def get_lock_backend() -> LockBackend:
+    """LOCK_BACKEND 설정에 맞는 잠금 저장소 (프로세스당 1개)"""
+    if settings.lock.LOCK_BACKEND == "memory":
+        return InProcessLockBackend()
+    return DatabaseLockBackend()
+
+# ----------------------------------------------------------------
+# ⏱️ 자동 연장(heartbeat)되는 잠금
+# ----------------------------------------------------------------
+class LeaseLostError(RuntimeError):
+    """임대가 만료되어 잠금을 잃었음 (다른 프로세스가 같은 자원을 쓰고 있을 수 있음)"""
+
+
+class LeaseLock:
+    """
+    async with LeaseLock(key) as acquired:
+        if not acquired: ...
+        ...
+        lock.ensure_held()  # 되돌릴 수 없는 쓰기 직전에 확인
+
+    보유하는 동안 백그라운드 태스크가 주기적으로 만료 시각을 연장하고,
+    블록을 빠져나오면(에러/취소 포함) 반드시 해제합니다.
+    연장이 거절되거나 마지막 연장 후 ttl이 지나면 잃은 것으로 보고 lost를 세웁니다.
+    """
+
+    def __init__(self, key: str, ttl: Optional[int] = None, backend: Optional[LockBackend] = None):
+        self.key = key
+        self.ttl = ttl or settings.lock.LOCK_LEASE_SECONDS
+        self.backend = backend or get_lock_backend()
+        self.owner = _make_owner()
+        self.acquired = False
+        self.lost = False
+        self._refreshed_at = 0.0  # 마지막으로 만료 시각을 연장한 시각 (time.monotonic)
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> bool:
+        return await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    async def acquire(self) -> bool:
+        """async with 없이 잡을 때 (잡은 쪽이 끝나면 반드시 release)"""
+        self.acquired = await asyncio.to_thread(self.backend.acquire, self.key, self.owner, self.ttl)
+        if self.acquired:
+            self._refreshed_at = time.monotonic()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        return self.acquired
+
+    async def release(self):
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self.acquired:
+            self.acquired = False
+            await asyncio.to_thread(self.backend.release, self.key, self.owner)
+
+    @property
+    def held(self) -> bool:
+        """지금도 잠금을 보유 중인지 (연장이 밀려 ttl이 지났으면 다른 프로세스가 가져갔을 수 있으므로 False)"""
+        return self.acquired and not self.lost and time.monotonic() - self._refreshed_at < self.ttl
+
+    def ensure_held(self):
+        if not self.held:
+            raise LeaseLostError(f"잠금 '{self.key}'을(를) 잃었습니다: 임대가 만료되어 다른 프로세스가 가져갔을 수 있습니다.")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.lock.LOCK_HEARTBEAT_INTERVAL)
+            started = time.monotonic()
+            try:
+                refreshed = await asyncio.to_thread(self.backend.refresh, self.key, self.owner, self.ttl)
+            except Exception as e:
+                # 일시적인 DB 오류는 다음 주기에 다시 시도 (그 사이 ttl이 지나면 held가 False가 됨)
+                logger.warning(f"⚠️ 잠금 '{self.key}' 연장 중 오류 (다음 주기에 재시도): {e}")
+                continue
+            if not refreshed:
+                self.lost = True
+                logger.error(f"❌ 잠금 '{self.key}' 연장 실패: 임대가 만료되어 다른 프로세스가 가져갔을 수 있습니다.")
+                return
+            self._refreshed_at = started
+
+
+@contextmanager
+def try_lock(key: str, ttl: int):
+    """
+    동기 코드용 짧은 잠금 (연장 없음)
+    with try_lock(key, ttl=10) as acquired: ...
+    """
+    backend = get_lock_backend()
+    owner = _make_owner()
+    acquired = backend.acquire(key, owner, ttl)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            backend.release(key, owner)
+
+
+def novel_lock_key(novel_id: int) -> str:
+    return f"novel:{novel_id}"
+
+
+def _make_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, start_http_server
+from prometheus_client import multiprocess
+
+from core.config import settings
+
+# ----------------------------------------------------------------
+# 📈 Prometheus 지표
+#   PROMETHEUS_MULTIPROC_DIR가 지정되면 프로세스별 값을 파일로 남기고 /metrics에서 합쳐서 보여줍니다.
+#   (API 서버와 집필 워커가 서로 다른 프로세스이므로 운영에서는 지정 권장)
+# ----------------------------------------------------------------
+_LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+_STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds", "모델 호출 1회 소요 시간 (모델 풀의 각 시도 단위)",
+    ["model", "outcome"], buckets=_LLM_BUCKETS,
+)
+LLM_FALLBACKS_TOTAL = Counter(
+    "llm_model_fallbacks_total", "모델 풀에서 다음 모델로 넘어간 횟수 (resource_exhausted / api_error / error / empty)",
+    ["model", "reason"],
+)
+LLM_ROUTER_SKIPS_TOTAL = Counter(
+    "llm_router_skips_total", "호출하지 않고 건너뛴 모델 (circuit_open / rate_limited)", ["model", "reason"],
+)
+LLM_CIRCUIT_OPENED_TOTAL = Counter(
+    "llm_circuit_opened_total", "연속 실패로 모델 서킷이 열린 횟수", ["model"],
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total", "LLM 토큰 사용량 (kind: prompt / output / cached - cached는 prompt 중 컨텍스트 캐시에서 읽은 양)",
+    ["model", "stage", "kind"],
+)
+LLM_STRUCTURED_OUTPUT_TOTAL = Counter(
+    "llm_structured_output_total", "구조화 출력 검증 결과 (valid / repaired / salvaged / invalid)", ["schema", "result"],
+)
+LLM_CONTEXT_CACHES_TOTAL = Counter(
+    "llm_context_caches_total", "제공자 측 컨텍스트 캐시 생성 결과 (created / failed / expired)", ["model", "result"],
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "generation_stage_seconds", "집필 파이프라인 단계별 소요 시간",
+    ["stage", "status"], buckets=_STAGE_BUCKETS,
+)
+GENERATIONS_ACTIVE = Gauge(
+    "generations_active", "현재 진행 중인 집필 수", multiprocess_mode="livesum",
+)
+GENERATIONS_TOTAL = Counter(
+    "generations_total", "종료된 집필 수 (saved / rejected / missing / locked / error / cancelled)", ["outcome"],
+)
+DRAFT_PRESCREEN_TOTAL = Counter(
+    "draft_prescreen_total", "평가 전 원고 사전 검사 결과 (passed / rejected / flagged: 위반이지만 반려 안 함)", ["result"],
+)
+DRAFT_DUPLICATES_TOTAL = Counter(
+    "draft_duplicates_total", "이전 시도(attempt) / 최근 회차(chapter)와 거의 같은 원고 수", ["source"],
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "generation_jobs", "집필 작업 큐 적재량 (상태별, /metrics 조회 시점 기준)", ["status"],
+    multiprocess_mode="mostrecent",
+)
+
+span_logger = logging.getLogger("my-creative.span")
+
+
+@contextmanager
+def span(stage: str, **fields: Any) -> Iterator[None]:
+    """
+    블록 소요 시간을 generation_stage_seconds에 기록합니다.
+    METRICS_SPAN_LOG가 켜져 있으면 {"span", "status", "duration_ms", ...fields} 한 줄 로그도 남깁니다.
+    """
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        PIPELINE_STAGE_SECONDS.labels(stage=stage, status=status).observe(elapsed)
+        if settings.metrics.METRICS_SPAN_LOG:
+            span_logger.info(json.dumps(
+                {"span": stage, "status": status, "duration_ms": round(elapsed * 1000, 1), **fields},
+                ensure_ascii=False, default=str,
+            ))
+
+
+def observe_llm_attempt(model: str, started: float, outcome: str) -> None:
+    """모델 1회 호출 결과 기록 (outcome이 ok가 아니면 다음 모델로 넘어간 것으로 집계)"""
+    LLM_REQUEST_SECONDS.labels(model=model, outcome=outcome).observe(time.monotonic() - started)
+    if outcome != "ok":
+        LLM_FALLBACKS_TOTAL.labels(model=model, reason=outcome).inc()
+
+
+def set_queue_depth(counts: Dict[str, int]) -> None:
+    for status, count in counts.items():
+        JOB_QUEUE_DEPTH.labels(status=status).set(count)
+
+
+def _registry() -> CollectorRegistry:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type"""
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """API 서버가 없는 프로세스(집필 워커)용 /metrics HTTP 서버 (백그라운드 스레드)"""
+    start_http_server(port, registry=_registry())
+
+
+def mark_process_dead() -> None:
+    """워커 프로세스 종료 시 호출 (멀티프로세스 모드에서 이 프로세스의 livesum 게이지 제거)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
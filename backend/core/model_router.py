@@ -0,0 +1,171 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from core.config import settings
+from core.logger import logger
+from core.metrics import LLM_CIRCUIT_OPENED_TOTAL, LLM_ROUTER_SKIPS_TOTAL
+
+# ----------------------------------------------------------------
+# 🪣 모델별 요청 한도 (토큰 버킷, 분당 요청 수 기준)
+# ----------------------------------------------------------------
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, rate_per_minute / 6)  # 기본 10초치
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        """다음 요청이 가능해질 때까지 남은 초"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+# ----------------------------------------------------------------
+# 🔌 서킷 브레이커 (연속 실패 시 쿨다운 동안 해당 모델을 건너뜀)
+#   closed → (연속 실패 threshold회) → open → (쿨다운 경과) → half_open: 1건만 시험 호출
+#   시험 호출이 성공하면 closed, 실패하면 다시 open
+# ----------------------------------------------------------------
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown_seconds else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self):
+        """allow()로 받은 시험 호출 기회를 쓰지 않고 돌려줌"""
+        with self._lock:
+            self._probing = False
+
+    def remaining(self) -> float:
+        """다시 시험 호출이 가능해질 때까지 남은 초"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.failures, self.opened_at, self._probing = 0, None, False
+
+    def record_failure(self) -> bool:
+        """실패 기록. 이번 실패로 서킷이 열렸으면 True"""
+        with self._lock:
+            self.failures += 1
+            was_probing, self._probing = self._probing, False
+            if was_probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+# 서킷 실패로 세는 호출 결과 (AIDriver의 outcome 값)
+CIRCUIT_FAILURES = ("resource_exhausted", "api_error")
+
+# ----------------------------------------------------------------
+# 🧭 단계별 모델 라우터
+#   단계(plot / draft / review / summary)마다 선호 모델 순서를 따로 두고,
+#   서킷이 열렸거나 요청 한도가 찬 모델은 건너뛰어 바로 다음 모델로 보냅니다.
+#   (상태는 프로세스 단위로 유지)
+# ----------------------------------------------------------------
+class ModelRouter:
+    def __init__(self, model_pool: Sequence[str], stage_models: Dict[str, List[str]], rpm_limits: Dict[str, float],
+                 failure_threshold: int, cooldown_seconds: float):
+        self.model_pool = list(model_pool)
+        self.stage_models = {stage: list(models) for stage, models in stage_models.items() if models}
+        self.buckets = {model: TokenBucket(rpm) for model, rpm in rpm_limits.items() if rpm}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+
+    def models_for(self, stage: str) -> List[str]:
+        """단계의 모델 순서 (설정이 없으면 기본 모델 풀 순서)"""
+        return self.stage_models.get(stage, self.model_pool)
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(model)
+            if breaker is None:
+                breaker = self.breakers[model] = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+            return breaker
+
+    def acquire(self, model: str) -> bool:
+        """이 모델로 지금 호출해도 되는지 (서킷 → 요청 한도 순으로 확인, 통과하면 한도 1 차감)"""
+        if not self._breaker(model).allow():
+            LLM_ROUTER_SKIPS_TOTAL.labels(model=model, reason="circuit_open").inc()
+            return False
+        bucket = self.buckets.get(model)
+        if bucket and not bucket.try_acquire():
+            # half_open 시험 호출 기회를 쓰지 않았으므로 되돌림
+            self._breaker(model).release()
+            LLM_ROUTER_SKIPS_TOTAL.labels(model=model, reason="rate_limited").inc()
+            return False
+        return True
+
+    def record(self, model: str, outcome: str):
+        """
+        acquire()가 통과시킨 호출의 결과 기록.
+        할당량 초과 / API 오류만 서킷 실패로 세고, 빈 응답·파싱 오류처럼 모델 상태와 무관한 결과는 시험 호출 기회만 돌려줌
+        """
+        breaker = self._breaker(model)
+        if outcome == "ok":
+            breaker.record_success()
+        elif outcome in CIRCUIT_FAILURES:
+            if breaker.record_failure():
+                LLM_CIRCUIT_OPENED_TOTAL.labels(model=model).inc()
+                logger.warning(f"🔌 {model} 서킷 열림: {self.cooldown_seconds:.0f}초 동안 다른 모델로 우회합니다.")
+        else:
+            breaker.release()
+
+    def wait_time(self, stage: str) -> float:
+        """단계의 모델 중 하나라도 다시 호출 가능해질 때까지 남은 초"""
+        waits = []
+        for model in self.models_for(stage):
+            bucket = self.buckets.get(model)
+            waits.append(max(self._breaker(model).remaining(), bucket.wait_time() if bucket else 0.0))
+        return min(waits) if waits else 0.0
+
+
+@lru_cache(maxsize=None)
+def get_model_router() -> ModelRouter:
+    """프로세스 전체에서 공유하는 라우터 (서킷/요청 한도 상태를 모든 집필 작업이 함께 씀)"""
+    return ModelRouter(
+        model_pool=settings.ai.AI_MODEL_POOL,
+        stage_models=settings.ai.AI_STAGE_MODELS,
+        rpm_limits=settings.ai.AI_MODEL_RPM,
+        failure_threshold=settings.ai.AI_CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds=settings.ai.AI_CIRCUIT_COOLDOWN_SECONDS,
+    )
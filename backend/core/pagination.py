@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+# ----------------------------------------------------------------
+# 📄 (created_at, id) 기준 커서 페이지네이션
+#   OFFSET 없이 "마지막으로 본 행 다음부터" 읽으므로 행이 수천 개여도 속도가 일정합니다.
+# ----------------------------------------------------------------
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    payload = json.dumps({"c": created_at.isoformat() if created_at else None, "i": row_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """잘못된 커서면 ValueError"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = datetime.fromisoformat(payload["c"]) if payload["c"] else None
+        return created_at, int(payload["i"])
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+def _keyset(query: Any, created_col: Any, id_col: Any, limit: int, cursor: Optional[str]) -> Any:
+    """Query / Select 공통: 커서 이후 조건 + 정렬 + limit + 1"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id)
+        ))
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+def _split_page(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+def paginate_desc(query: Query, created_col: Any, id_col: Any, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    created_at DESC, id DESC 순으로 limit개를 읽고 (행 목록, 다음 커서)를 반환합니다.
+    다음 페이지 존재 여부는 limit + 1개를 읽어 판단합니다.
+    """
+    rows = _keyset(query, created_col, id_col, limit, cursor).all()
+    return _split_page(rows, limit)
+
+async def apaginate_desc(db: AsyncSession, stmt: Select, created_col: Any, id_col: Any, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """paginate_desc의 비동기 버전 (select() 문을 받음)"""
+    result = await db.execute(_keyset(stmt, created_col, id_col, limit, cursor))
+    return _split_page(list(result.all()), limit)
@@ -0,0 +1,149 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound=BaseModel)
+
+# Gemini 응답 스키마(OpenAPI 부분집합)가 받는 키만 남김 (title, default, additionalProperties 등은 거절됨)
+_SCHEMA_KEYS = ("type", "format", "description", "nullable", "enum", "items", "properties", "required")
+
+# ----------------------------------------------------------------
+# 📐 Pydantic 모델 → 응답 스키마
+#   $ref는 펼치고, Optional(anyOf [X, null])은 nullable로 바꿉니다.
+#   속성이 정해지지 않은 자유 형식 객체는 스키마로 표현할 수 없으므로 스키마에서 뺍니다. (검증은 Pydantic이 그대로 함)
+# ----------------------------------------------------------------
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    schema = model.model_json_schema()
+    return _convert(schema, schema.get("$defs", {})) or {"type": "object"}
+
+
+def _convert(node: Dict[str, Any], defs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if "$ref" in node:
+        return _convert({**defs[node["$ref"].split("/")[-1]], **{k: v for k, v in node.items() if k != "$ref"}}, defs)
+    if "anyOf" in node:
+        options = [o for o in node["anyOf"] if o.get("type") != "null"]
+        if len(options) != 1:
+            return None
+        converted = _convert({**options[0], "description": node.get("description", options[0].get("description"))}, defs)
+        return {**converted, "nullable": True} if converted else None
+
+    if node.get("type") == "object":
+        properties = {}
+        for name, prop in node.get("properties", {}).items():
+            converted = _convert(prop, defs)
+            if converted:
+                properties[name] = converted
+        if not properties:
+            return None
+        node = {**node, "properties": properties, "required": [r for r in node.get("required", []) if r in properties]}
+    elif node.get("type") == "array":
+        items = _convert(node.get("items", {}), defs)
+        if not items:
+            return None
+        node = {**node, "items": items}
+    elif "type" not in node:
+        return None
+
+    result = {key: node[key] for key in _SCHEMA_KEYS if node.get(key) not in (None, [])}
+    if "description" in result and not isinstance(result["description"], str):
+        del result["description"]
+    return result
+
+# ----------------------------------------------------------------
+# 🩹 응답 검증 + 로컬 복구 (추가 LLM 호출 없음)
+#   1) valid: 그대로 검증
+#   2) repaired: 코드 펜스 제거, 첫 번째 { } 블록만 (문자열 안의 중괄호는 무시),
+#      문자열 안의 줄바꿈/탭은 이스케이프, 닫는 괄호 앞 쉼표 제거 후 다시 검증
+#   3) salvaged: 그래도 안 되면 최상위 필드("score": 85, "feedback": "...")만 골라 읽어 검증
+# ----------------------------------------------------------------
+def parse_structured(text: str, model: Type[T]) -> Tuple[Optional[T], str]:
+    """(검증된 모델 인스턴스 또는 None, valid / repaired / salvaged / invalid)"""
+    if not text:
+        return None, "invalid"
+    try:
+        return model.model_validate_json(text), "valid"
+    except (ValidationError, ValueError):
+        pass
+    repaired = repair_json(text)
+    if repaired is not None:
+        try:
+            return model.model_validate(json.loads(repaired)), "repaired"
+        except (ValidationError, ValueError):
+            pass
+    fields = salvage_fields(text, model)
+    try:
+        return model.model_validate(fields), "salvaged"
+    except ValidationError:
+        return None, "invalid"
+
+
+def repair_json(text: str) -> Optional[str]:
+    obj = extract_json_object(re.sub(r"```(?:json)?", "", text))
+    if obj is None:
+        return None
+    obj = _escape_control_chars(obj)
+    return re.sub(r",(\s*[}\]])", r"\1", obj)
+
+
+def salvage_fields(text: str, model: Type[BaseModel]) -> Dict[str, Any]:
+    """모델의 최상위 필드 중 문자열/숫자 값만 개별로 찾아 읽음 (객체 전체가 깨졌을 때)"""
+    fields = {}
+    for name in model.model_fields:
+        match = re.search(rf'"{re.escape(name)}"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)', text, re.DOTALL)
+        if not match:
+            continue
+        try:
+            fields[name] = json.loads(_escape_control_chars(match.group(1)))
+        except ValueError:
+            fields[name] = match.group(1).strip('"')
+    return fields
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """처음 나오는 균형 잡힌 { ... } 블록 (탐욕적 정규식과 달리 뒤에 붙은 설명/두 번째 객체를 포함하지 않음)"""
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    # 응답이 잘려 닫는 괄호가 없으면 열린 만큼 닫아 봄
+    return text[start:] + ('"' if in_string else "") + "}" * depth
+
+
+def _escape_control_chars(obj: str) -> str:
+    """문자열 안의 날것 줄바꿈/탭은 JSON에서 허용되지 않으므로 지우지 않고 이스케이프"""
+    out, in_string, escaped = [], False, False
+    for ch in obj:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch < " ":
+                ch = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}.get(ch, "")
+        elif ch == '"':
+            in_string = True
+        out.append(ch)
+    return "".join(out)
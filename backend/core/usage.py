@@ -0,0 +1,114 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.config import settings
+from core.metrics import LLM_TOKENS_TOTAL
+
+# ----------------------------------------------------------------
+# 🧮 LLM 호출별 사용량 (모델, 입력/출력 토큰, 지연 시간, 재시도 횟수)
+#   AIDriver가 호출할 때마다 현재 수집 블록(track_llm_usage)에 한 건씩 남깁니다.
+#   블록은 중첩할 수 있고, 안쪽 블록이 끝나면 기록이 바깥 블록에도 합쳐집니다.
+#   (asyncio 태스크마다 컨텍스트가 복사되므로 병렬 후보끼리 기록이 섞이지 않음)
+# ----------------------------------------------------------------
+@dataclass
+class LLMCallUsage:
+    stage: str
+    model: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: int = 0
+    retries: int = 0       # 성공하기 전에 실패한 모델 호출 수
+    cached: bool = False   # 응답 캐시 적중 (토큰 비용 없음)
+    cached_tokens: int = 0  # prompt_tokens 중 제공자 측 컨텍스트 캐시에서 읽은 토큰
+    attempt_num: Optional[int] = None  # 집필/평가 호출이면 생성 기록의 시도 번호
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+
+_calls: ContextVar[Optional[List[LLMCallUsage]]] = ContextVar("llm_calls", default=None)
+_stage: ContextVar[str] = ContextVar("llm_stage", default="other")
+
+
+@contextmanager
+def track_llm_usage(stage: Optional[str] = None) -> Iterator[List[LLMCallUsage]]:
+    """블록 안의 LLM 호출 기록을 모읍니다. stage를 주면 블록 안 호출의 단계 이름이 됩니다."""
+    parent = _calls.get()
+    calls: List[LLMCallUsage] = []
+    calls_token = _calls.set(calls)
+    stage_token = _stage.set(stage) if stage else None
+    try:
+        yield calls
+    finally:
+        _calls.reset(calls_token)
+        if stage_token is not None:
+            _stage.reset(stage_token)
+        if parent is not None:
+            parent.extend(calls)
+
+
+def current_stage() -> str:
+    """지금 호출이 속한 파이프라인 단계 (모델 라우팅에 사용)"""
+    return _stage.get()
+
+
+def record_llm_call(model: str, prompt_tokens: int = 0, output_tokens: int = 0, latency: float = 0.0,
+                    retries: int = 0, cached: bool = False, cached_tokens: int = 0) -> None:
+    """토큰 지표는 항상 올리고, 호출 기록은 수집 블록 안에서 호출됐을 때만 남김"""
+    stage = _stage.get()
+    if prompt_tokens or output_tokens:
+        LLM_TOKENS_TOTAL.labels(model=model, stage=stage, kind="prompt").inc(prompt_tokens)
+        LLM_TOKENS_TOTAL.labels(model=model, stage=stage, kind="output").inc(output_tokens)
+    if cached_tokens:
+        LLM_TOKENS_TOTAL.labels(model=model, stage=stage, kind="cached").inc(cached_tokens)
+    calls = _calls.get()
+    if calls is None:
+        return
+    calls.append(LLMCallUsage(
+        stage=stage, model=model, prompt_tokens=prompt_tokens, output_tokens=output_tokens,
+        latency_ms=int(latency * 1000), retries=retries, cached=cached, cached_tokens=cached_tokens,
+    ))
+
+
+def response_token_counts(response: Any) -> Tuple[Optional[int], Optional[int]]:
+    """응답의 usage_metadata에서 (입력, 출력) 토큰 수. 없으면 (None, None)"""
+    meta = getattr(response, "usage_metadata", None)
+    if meta is None or not getattr(meta, "total_token_count", 0):
+        return None, None
+    return int(meta.prompt_token_count or 0), int(meta.candidates_token_count or 0)
+
+
+def response_cached_tokens(response: Any) -> int:
+    """입력 토큰 중 컨텍스트 캐시에서 읽은 양 (캐시를 안 썼으면 0)"""
+    meta = getattr(response, "usage_metadata", None)
+    return int(getattr(meta, "cached_content_token_count", 0) or 0) if meta is not None else 0
+
+
+def estimate_tokens(text: Any) -> int:
+    """usage_metadata를 주지 않는 응답용 문자 수 기반 추정치"""
+    return math.ceil(len(str(text or "")) / settings.context.CONTEXT_CHARS_PER_TOKEN)
+
+
+def estimate_cost(model: str, prompt_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+    """AI_MODEL_PRICES(100만 토큰당 USD [입력, 출력, 캐시된 입력]) 기준 비용. 가격표에 없는 모델은 0"""
+    price = settings.ai.AI_MODEL_PRICES.get(model)
+    if not price:
+        return 0.0
+    cached_price = price[2] if len(price) > 2 else price[0]
+    return ((prompt_tokens - cached_tokens) * price[0] + cached_tokens * cached_price + output_tokens * price[1]) / 1_000_000
+
+
+def aggregate_calls(calls: Iterable[LLMCallUsage]) -> Dict[str, Any]:
+    """시도 1건(집필 + 평가)의 호출을 생성 기록 컬럼 값으로 합산"""
+    calls = list(calls)
+    return {
+        "model": next((c.model for c in calls if c.stage == "draft"), calls[0].model if calls else None),
+        "prompt_tokens": sum(c.prompt_tokens for c in calls),
+        "output_tokens": sum(c.output_tokens for c in calls),
+        "latency_ms": sum(c.latency_ms for c in calls),
+        "retries": sum(c.retries for c in calls),
+    }
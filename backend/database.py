@@ -1,17 +1,54 @@
+import os
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from core.config import settings
 from core.logger import logger
 
+def pool_options(pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """엔진 공통 풀 설정 (크기만 용도별로 다름)"""
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.db.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.db.DB_POOL_PRE_PING,
+    }
+
 # 1. SQLAlchemy 엔진 생성 (연결 통로)
-engine = create_engine(settings.db.DATABASE_URL)
+#    - engine: API 요청 처리용 (짧게 빌리고 바로 반납)
+#    - background_engine: 워커/스트리밍 집필용 (오래 붙잡아도 API 풀에 영향 없음)
+engine = create_engine(
+    settings.db.DATABASE_URL,
+    **pool_options(settings.db.DB_POOL_SIZE, settings.db.DB_MAX_OVERFLOW)
+)
+background_engine = create_engine(
+    settings.db.DATABASE_URL,
+    **pool_options(settings.db.DB_BACKGROUND_POOL_SIZE, settings.db.DB_BACKGROUND_MAX_OVERFLOW)
+)
 
 # 2. 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
 
 # 3. 모델의 부모 클래스
 Base = declarative_base()
 
+# 4. 비동기 엔진 (조회 API용) - 드라이버(aiomysql/asyncmy)는 처음 쓸 때 불러옵니다.
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.db.ASYNC_DATABASE_URL,
+        **pool_options(settings.db.DB_ASYNC_POOL_SIZE, settings.db.DB_ASYNC_MAX_OVERFLOW)
+    )
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    # expire_on_commit=False: 커밋 후 응답 직렬화 중에 속성을 다시 읽으려고 await 없이 I/O가 일어나지 않도록
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
 def check_db_connection():
     """단순 연결 확인용 함수 (SELECT 1 쿼리 실행)"""
     try:
@@ -22,20 +59,28 @@ def check_db_connection():
         logger.error(f"❌ DB 연결 상태 확인 실패: {e}")
         return False
 
+def run_migrations():
+    """alembic upgrade head (스키마 변경은 migrations/versions의 리비전으로만 관리)"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    config.attributes["skip_logging_config"] = True  # 앱 로거 설정을 덮어쓰지 않도록
+    command.upgrade(config, "head")
+
 def init_db():
     """서버 시작 시 호출할 DB 초기화 함수"""
-    
-    # 🚀 [핵심] 여기서 모든 모델을 다 불러와야 KeyError가 안 터집니다!
-    import models
 
-    # 1. DB_STRATEGY가 'update'인 경우 테이블 자동 생성
-    if settings.db.DB_STRATEGY == "update":
-        logger.info("🛠️ DB_STRATEGY='update': 테이블 동기화를 시작합니다.")
+    # 1. DB_STRATEGY가 'migrate'(또는 예전 이름 'update')인 경우 마이그레이션 적용
+    if settings.db.DB_STRATEGY in ("migrate", "update"):
+        if settings.db.DB_STRATEGY == "update":
+            logger.warning("⚠️ DB_STRATEGY='update'는 더 이상 create_all을 쓰지 않고 'migrate'와 동일하게 동작합니다.")
+        logger.info("🛠️ 마이그레이션(alembic upgrade head)을 시작합니다.")
         try:
-            Base.metadata.create_all(bind=engine)
-            logger.info("📊 모든 데이터베이스 테이블 동기화 완료")
+            run_migrations()
+            logger.info("📊 데이터베이스 스키마가 최신 리비전입니다.")
         except Exception as e:
-            logger.error(f"❌ 테이블 생성 중 오류 발생: {e}")
+            logger.error(f"❌ 마이그레이션 중 오류 발생: {e}")
             raise e
     else:
         logger.info(f"⏭️ DB_STRATEGY='{settings.db.DB_STRATEGY}': 테이블 생성을 건너뜁니다.")
@@ -52,4 +97,24 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_background_db():
+    """LLM 호출을 기다리며 세션을 오래 쥐는 엔드포인트용 (집필 전용 풀에서 빌림)"""
+    db = BackgroundSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """조회 API용 비동기 세션 (이벤트 루프를 막지 않고, 스레드풀 대신 비동기 풀을 씀)"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+async def dispose_engines():
+    """서버 종료 시 풀에 남은 커넥션 정리"""
+    engine.dispose()
+    background_engine.dispose()
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
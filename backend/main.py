@@ -4,7 +4,9 @@ from fastapi import FastAPI
 from core.config import settings
 from core.logger import logger
 from core.middleware import setup_middleware
-from database import init_db
+from database import dispose_engines, init_db
+from modules.log_sink import close_log_sink
+from modules.search_index import get_search_backend
 
 from api.v1.api import api_router  # 1. api_router를 import 하세요
 
@@ -16,10 +18,18 @@ async def lifespan(app: FastAPI):
         init_db()
     except Exception as e:
         logger.error(f"❌ 초기화 중 치명적 오류 발생: {e}")
+
+    # [Startup] 검색 색인 준비 (실패해도 서버는 기동)
+    try:
+        get_search_backend().ensure_schema()
+    except Exception as e:
+        logger.warning(f"⚠️ 검색 색인 준비 실패: {e}")
     
     yield  # --- 서버 가동 ---
     
-    # [Shutdown]
+    # [Shutdown] 남은 생성 기록 저장 후 풀에 남은 커넥션 정리
+    close_log_sink()
+    await dispose_engines()
     logger.info("🛑 서버 종료.")
 
 def get_application() -> FastAPI:
@@ -0,0 +1,75 @@
+"""baseline: DB_STRATEGY=update(create_all) 시절의 기본 테이블
+
+기존에 create_all로 만든 DB는 이 리비전으로 stamp한 뒤 upgrade 하세요.
+    alembic stamp 0001_baseline && alembic upgrade head
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "novels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("genre", sa.String(100)),
+        sa.Column("world_setting", sa.JSON()),
+        sa.Column("rules", sa.JSON()),
+        sa.Column("story_summary", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_novels_id", "novels", ["id"])
+
+    op.create_table(
+        "prompt_settings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id", ondelete="CASCADE"), unique=True),
+        sa.Column("plot_prompt", sa.Text(), nullable=False),
+        sa.Column("writing_prompt", sa.Text(), nullable=False),
+        sa.Column("review_prompt", sa.Text(), nullable=False),
+        sa.Column("summary_prompt", sa.Text(), nullable=False),
+    )
+    op.create_index("ix_prompt_settings_id", "prompt_settings", ["id"])
+
+    op.create_table(
+        "chapters",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("chapter_num", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("score", sa.Integer()),
+        sa.Column("feedback", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_chapters_id", "chapters", ["id"])
+
+    op.create_table(
+        "generation_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("chapter_num", sa.Integer(), nullable=False),
+        sa.Column("attempt_num", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("score", sa.Integer()),
+        sa.Column("feedback", sa.Text(), nullable=True),
+        sa.Column("raw_review", sa.JSON(), nullable=True),
+        sa.Column("is_selected", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_generation_logs_id", "generation_logs", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("generation_logs")
+    op.drop_table("chapters")
+    op.drop_table("prompt_settings")
+    op.drop_table("novels")
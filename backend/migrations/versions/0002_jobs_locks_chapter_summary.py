@@ -0,0 +1,57 @@
+"""집필 작업 큐, 잠금 테이블, 회차별 요약 컬럼
+
+DB_STRATEGY=update 시절 create_all로 일부가 이미 만들어졌을 수 있으므로 존재 여부를 확인하고 추가합니다.
+
+Revision ID: 0002_jobs_locks_chapter_summary
+Revises: 0001_baseline
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_jobs_locks_chapter_summary"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "summary" not in {c["name"] for c in inspector.get_columns("chapters")}:
+        op.add_column("chapters", sa.Column("summary", sa.Text(), nullable=True))
+
+    if "generation_jobs" not in tables:
+        op.create_table(
+            "generation_jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("config", sa.JSON(), nullable=False),
+            sa.Column("worker_id", sa.String(100), nullable=True),
+            sa.Column("cancel_requested", sa.Integer()),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_generation_jobs_id", "generation_jobs", ["id"])
+        op.create_index("ix_generation_jobs_novel_id", "generation_jobs", ["novel_id"])
+        op.create_index("ix_generation_jobs_status", "generation_jobs", ["status"])
+
+    if "generation_locks" not in tables:
+        op.create_table(
+            "generation_locks",
+            sa.Column("lock_key", sa.String(100), primary_key=True),
+            sa.Column("owner", sa.String(100), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("acquired_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("generation_locks")
+    op.drop_table("generation_jobs")
+    op.drop_column("chapters", "summary")
@@ -0,0 +1,30 @@
+"""회차/생성 기록 조회용 복합 인덱스
+
+- chapters (novel_id, chapter_num) UNIQUE : 다음 회차 번호, 최근 맥락 조회 + 같은 회차 중복 저장 방지
+- generation_logs (novel_id, chapter_num, attempt_num) : 회차별 시도 조회
+- generation_logs (novel_id, created_at, id) : 히스토리 커서 페이지네이션
+
+이미 같은 회차가 중복 저장된 DB라면 UNIQUE 생성 전에 중복 행을 정리해야 합니다.
+
+Revision ID: 0003_hot_query_indexes
+Revises: 0002_jobs_locks_chapter_summary
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003_hot_query_indexes"
+down_revision = "0002_jobs_locks_chapter_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("uq_chapters_novel_chapter", "chapters", ["novel_id", "chapter_num"], unique=True)
+    op.create_index("ix_generation_logs_novel_chapter_attempt", "generation_logs", ["novel_id", "chapter_num", "attempt_num"])
+    op.create_index("ix_generation_logs_novel_created", "generation_logs", ["novel_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_logs_novel_created", table_name="generation_logs")
+    op.drop_index("ix_generation_logs_novel_chapter_attempt", table_name="generation_logs")
+    op.drop_index("uq_chapters_novel_chapter", table_name="chapters")
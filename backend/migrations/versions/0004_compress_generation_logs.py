@@ -0,0 +1,159 @@
+"""생성 기록 본문 압축 저장 + 회차별 보존 정책 컬럼
+
+- generation_logs.content: TEXT → 압축 바이너리 (MySQL MEDIUMBLOB)
+- generation_logs.storage / diff_base_id: 전문(full) / 차이(diff) / 본문 삭제(pruned)
+- 기존 행은 id 순으로 배치마다 다시 써서 압축만 합니다.
+  회차별 보존 정책(diff/본문 삭제)은 마이그레이션에서 적용하지 않습니다. 배포 후 `python -m modules.log_retention`으로 적용하세요.
+- 압축 형식은 이 리비전 시점의 core.compression을 그대로 옮겨 고정했습니다. (앱 코드/환경 설정이 바뀌어도 결과가 같도록)
+- MySQL: content를 포함한 FULLTEXT 인덱스는 BLOB에 걸 수 없으므로 먼저 삭제 (피드백 인덱스는 기동 시 생성)
+
+Revision ID: 0004_compress_generation_logs
+Revises: 0003_hot_query_indexes
+Create Date: 2026-10-17
+"""
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: zstd로 압축된 행이 있을 때만 필요
+    zstandard = None
+
+revision = "0004_compress_generation_logs"
+down_revision = "0003_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# ----------------------------------------------------------------
+# 🧊 고정된 압축 형식 (0004 시점의 core.compression 사본, 업그레이드는 zlib만 사용)
+# ----------------------------------------------------------------
+_ZLIB = b"\x00z"
+_ZSTD = b"\x00s"
+MIN_BYTES = 256  # 이보다 짧은 본문은 압축하지 않음
+
+
+def _compress(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return raw if len(raw) < MIN_BYTES else _ZLIB + zlib.compress(raw)
+
+
+def _decompress(value) -> str:
+    if isinstance(value, str):  # SQLite에서 TEXT로 남아 있는 기존 행
+        return value
+    value = bytes(value)
+    if value[:2] == _ZLIB:
+        return zlib.decompress(value[2:]).decode("utf-8")
+    if value[:2] == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 생성 기록을 되돌리려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(value[2:]).decode("utf-8")
+    return value.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    impl = sa.LargeBinary(length=2 ** 24 - 1)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else _compress(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else _decompress(value)
+
+
+def _restore_content(row, base_content):
+    """보존 정책이 적용된 행을 전문으로 복원 (0004 시점 log_retention의 줄 단위 diff 형식, pruned면 None)"""
+    if row.storage == "diff":
+        if base_content is None or row.content is None:
+            return None
+        a = base_content.splitlines(keepends=True)
+        return "".join("".join(a[op[0]:op[1]]) if isinstance(op, list) else op for op in json.loads(row.content))
+    if row.storage == "pruned":
+        return None
+    return row.content
+
+
+logs = sa.table(
+    "generation_logs",
+    sa.column("id", sa.Integer),
+    sa.column("content", CompressedText),
+    sa.column("storage", sa.String),
+    sa.column("diff_base_id", sa.Integer),
+)
+
+
+def _drop_fulltext(index_name: str):
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        return
+    exists = bind.execute(sa.text(
+        "SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+        "AND TABLE_NAME = 'generation_logs' AND INDEX_NAME = :name LIMIT 1"
+    ), {"name": index_name}).first()
+    if exists:
+        op.drop_index(index_name, table_name="generation_logs")
+
+
+def _rewrite_contents(transform):
+    """id 순으로 BATCH_SIZE개씩 본문을 읽어 transform 결과로 다시 씀"""
+    bind = op.get_bind()
+    update = sa.update(logs).where(logs.c.id == sa.bindparam("_id")).values(content=sa.bindparam("content", type_=CompressedText))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(logs.c.id, logs.c.content, logs.c.storage, logs.c.diff_base_id)
+            .where(logs.c.id > last_id, logs.c.content.isnot(None))
+            .order_by(logs.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [{"_id": r.id, "content": transform(r)} for r in rows])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    _drop_fulltext("ft_generation_logs_text")
+
+    with op.batch_alter_table("generation_logs") as batch:
+        batch.add_column(sa.Column("storage", sa.String(10), nullable=False, server_default="full"))
+        batch.add_column(sa.Column("diff_base_id", sa.Integer(), nullable=True))
+        batch.alter_column("content", type_=sa.LargeBinary(length=2 ** 24 - 1), existing_type=sa.Text(), existing_nullable=True)
+
+    # 기존 행 압축 (TEXT 시절 값은 그대로 읽히므로 다시 쓰기만 하면 됨)
+    _rewrite_contents(lambda r: r.content)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    _drop_fulltext("ft_generation_logs_feedback")
+
+    # diff로 정리된 원고를 전문으로 되돌린 뒤 압축 해제 (본문이 삭제된 원고는 NULL로 남음)
+    base_ids = {r.diff_base_id for r in bind.execute(sa.select(logs.c.diff_base_id).where(logs.c.storage == "diff").distinct())}
+    bases = dict(bind.execute(sa.select(logs.c.id, logs.c.content).where(logs.c.id.in_(base_ids))).all()) if base_ids else {}
+    _rewrite_contents(lambda r: _restore_content(r, bases.get(r.diff_base_id)))
+
+    # 압축 해제: TEXT로 바꾸기 전에 원문 문자열로 다시 저장
+    plain = sa.table("generation_logs", sa.column("id", sa.Integer), sa.column("content", sa.Text))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(logs.c.id, logs.c.content).where(logs.c.id > last_id, logs.c.content.isnot(None)).order_by(logs.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.update(plain).where(plain.c.id == sa.bindparam("_id")).values(content=sa.bindparam("content", type_=sa.Text)),
+            [{"_id": r.id, "content": r.content} for r in rows]
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("generation_logs") as batch:
+        batch.alter_column("content", type_=sa.Text(), existing_type=sa.LargeBinary(length=2 ** 24 - 1), existing_nullable=True)
+        batch.drop_column("diff_base_id")
+        batch.drop_column("storage")
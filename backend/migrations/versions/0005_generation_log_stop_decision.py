@@ -0,0 +1,24 @@
+"""생성 기록에 재작성 루프 중단 결정 컬럼 추가
+
+Revision ID: 0005_generation_log_stop_decision
+Revises: 0004_compress_generation_logs
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_generation_log_stop_decision"
+down_revision = "0004_compress_generation_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("generation_logs", sa.Column("stop_policy", sa.String(30), nullable=True))
+    op.add_column("generation_logs", sa.Column("stop_reason", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("generation_logs") as batch:
+        batch.drop_column("stop_reason")
+        batch.drop_column("stop_policy")
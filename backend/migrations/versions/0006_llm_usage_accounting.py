@@ -0,0 +1,49 @@
+"""LLM 호출별 사용량 테이블 + 생성 기록 시도별 사용량 컬럼
+
+Revision ID: 0006_llm_usage_accounting
+Revises: 0005_generation_log_stop_decision
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_llm_usage_accounting"
+down_revision = "0005_generation_log_stop_decision"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_calls",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("chapter_num", sa.Integer(), nullable=False),
+        sa.Column("attempt_num", sa.Integer(), nullable=True),
+        sa.Column("stage", sa.String(20), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("retries", sa.Integer(), nullable=False),
+        sa.Column("cached", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_llm_calls_novel_chapter", "llm_calls", ["novel_id", "chapter_num"])
+
+    op.add_column("generation_logs", sa.Column("model", sa.String(100), nullable=True))
+    op.add_column("generation_logs", sa.Column("prompt_tokens", sa.Integer(), nullable=True))
+    op.add_column("generation_logs", sa.Column("output_tokens", sa.Integer(), nullable=True))
+    op.add_column("generation_logs", sa.Column("latency_ms", sa.Integer(), nullable=True))
+    op.add_column("generation_logs", sa.Column("retries", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("generation_logs") as batch:
+        batch.drop_column("retries")
+        batch.drop_column("latency_ms")
+        batch.drop_column("output_tokens")
+        batch.drop_column("prompt_tokens")
+        batch.drop_column("model")
+    op.drop_index("ix_llm_calls_novel_chapter", table_name="llm_calls")
+    op.drop_table("llm_calls")
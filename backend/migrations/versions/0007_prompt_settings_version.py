@@ -0,0 +1,22 @@
+"""프롬프트 설정에 버전 컬럼 추가 (컴파일된 템플릿 캐시 키)
+
+Revision ID: 0007_prompt_settings_version
+Revises: 0006_llm_usage_accounting
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_prompt_settings_version"
+down_revision = "0006_llm_usage_accounting"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("prompt_settings", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("prompt_settings") as batch:
+        batch.drop_column("version")
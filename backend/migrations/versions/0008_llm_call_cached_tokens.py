@@ -0,0 +1,22 @@
+"""LLM 호출 기록에 컨텍스트 캐시 토큰 컬럼 추가
+
+Revision ID: 0008_llm_call_cached_tokens
+Revises: 0007_prompt_settings_version
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_llm_call_cached_tokens"
+down_revision = "0007_prompt_settings_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("llm_calls", sa.Column("cached_tokens", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("llm_calls") as batch:
+        batch.drop_column("cached_tokens")
@@ -0,0 +1,27 @@
+"""생성 기록에 스풀 기록 식별자 추가
+
+- generation_logs.spool_id: write-behind 저장소가 기록마다 붙이는 고유값
+  복구한 스풀 기록이 이미 저장됐는지 이 값으로 확인합니다. (created_at은 DB 기본값에 맡김)
+
+Revision ID: 0009_generation_log_spool_id
+Revises: 0008_llm_call_cached_tokens
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_generation_log_spool_id"
+down_revision = "0008_llm_call_cached_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("generation_logs", sa.Column("spool_id", sa.String(32), nullable=True))
+    op.create_index("ix_generation_logs_spool_id", "generation_logs", ["spool_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_logs_spool_id", table_name="generation_logs")
+    with op.batch_alter_table("generation_logs") as batch:
+        batch.drop_column("spool_id")
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 
 class Chapter(Base):
     __tablename__ = "chapters"
+    __table_args__ = (
+        # 🚀 다음 회차 번호 / 최근 맥락 조회 (novel_id 필터 + chapter_num 정렬) + 같은 회차 중복 저장 방지
+        Index("uq_chapters_novel_chapter", "novel_id", "chapter_num", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     novel_id = Column(Integer, ForeignKey("novels.id", ondelete="CASCADE"), nullable=False)
@@ -15,6 +19,9 @@ class Chapter(Base):
     # ✍️ 집필된 소설 본문
     content = Column(Text, nullable=False)
     
+    # 📑 회차별 요약 (이전 화 맥락을 만들 때 본문 대신 사용)
+    summary = Column(Text, nullable=True)
+    
     # 🎯 AI가 매긴 최종 원고 점수 (0~100)
     score = Column(Integer, default=0)
     
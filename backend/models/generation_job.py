@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from database import Base
+
+class JobStatus:
+    """집필 작업 상태값 (문자열 그대로 DB에 저장)"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    SKIPPED = "skipped"      # 다른 실행(SSE 스트리밍 등)이 이미 소설 잠금을 쥐고 있어 집필하지 않음
+
+    ACTIVE = (QUEUED, RUNNING)
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 🔗 집필 대상 소설
+    novel_id = Column(Integer, ForeignKey("novels.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # 🚦 작업 상태 (queued → running → succeeded / failed / cancelled / skipped)
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED, index=True)
+    
+    # ⚙️ 요청 당시의 GenerateConfig (JSON)
+    config = Column(JSON, nullable=False, default={})
+    
+    # 👷 작업을 가져간 워커 식별자 (호스트명:PID:슬롯)
+    worker_id = Column(String(100), nullable=True)
+    
+    # 🛑 실행 중 취소 요청 여부 (0: 없음, 1: 요청됨)
+    cancel_requested = Column(Integer, default=0)
+    
+    # ❌ 실패 사유
+    error = Column(Text, nullable=True)
+    
+    # ⏰ 생성 / 시작 / 생존 신호 / 종료 시각
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # 🔗 관계 설정: Novel 모델과의 연결
+    novel = relationship("Novel", back_populates="generation_jobs")
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, novel_id={self.novel_id}, status='{self.status}')>"
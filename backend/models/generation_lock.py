@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+class GenerationLock(Base):
+    __tablename__ = "generation_locks"
+
+    # 🔑 잠금 대상 키 (예: "novel:12")
+    lock_key = Column(String(100), primary_key=True)
+    
+    # 👷 잠금을 보유한 주체 (호스트명:PID:UUID)
+    owner = Column(String(100), nullable=False)
+    
+    # ⏳ 임대(lease) 만료 시각 - 보유자가 주기적으로 연장하지 않으면 다른 프로세스가 가져갈 수 있음
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # ⏰ 최초 획득 시각
+    acquired_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<GenerationLock(key='{self.lock_key}', owner='{self.owner}')>"
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
+from core.compression import CompressedText
 
 class GenerationLog(Base):
     __tablename__ = "generation_logs"
+    __table_args__ = (
+        # 🚀 회차별 시도 조회
+        Index("ix_generation_logs_novel_chapter_attempt", "novel_id", "chapter_num", "attempt_num"),
+        # 🚀 히스토리 커서 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_generation_logs_novel_created", "novel_id", "created_at", "id"),
+        # 🚀 스풀 복구 시 중복 저장 확인
+        Index("ix_generation_logs_spool_id", "spool_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -15,8 +24,12 @@ class GenerationLog(Base):
     chapter_num = Column(Integer, nullable=False)
     attempt_num = Column(Integer, nullable=False)
     
-    # ✍️ AI가 생성한 원고 본문
-    content = Column(Text, nullable=True)
+    # ✍️ AI가 생성한 원고 본문 (압축 저장, storage가 diff면 기준 원고 대비 차이)
+    content = Column(CompressedText, nullable=True)
+
+    # 🗄️ 본문 보관 형태 (full: 전문 / diff: diff_base_id 원고 대비 차이 / pruned: 본문 삭제, 점수·피드백만)
+    storage = Column(String(10), nullable=False, default="full", server_default="full")
+    diff_base_id = Column(Integer, nullable=True)
     
     # 🎯 AI가 스스로 매긴 점수 (0~100)
     score = Column(Integer, default=0)
@@ -29,8 +42,23 @@ class GenerationLog(Base):
     
     # ✅ 최종 원고로 채택 여부 (0: 탈락, 1: 채택)
     is_selected = Column(Integer, default=0)
+
+    # 🛑 재작성 루프를 끝낸 결정 (해당 회차 실행의 마지막 시도에만 기록)
+    #    min_score / fallback / plateau / time_budget / token_budget / max_attempts
+    stop_policy = Column(String(30), nullable=True)
+    stop_reason = Column(Text, nullable=True)
+
+    # 🧮 이 시도(집필 + 평가)의 LLM 사용량 합계 - 호출별 기록은 llm_calls
+    model = Column(String(100), nullable=True)  # 집필 원고를 작성한 모델
+    prompt_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    latency_ms = Column(Integer, nullable=True)
+    retries = Column(Integer, nullable=True)
     
-    # ⏰ 기록 생성 시각
+    # 🧾 write-behind 스풀 기록 식별자 (복구한 기록이 이미 저장됐는지 확인용)
+    spool_id = Column(String(32), nullable=True)
+
+    # ⏰ 기록 생성 시각 (DB 기본값: 다른 테이블/행과 같은 시계로 맞춰야 커서 정렬이 어긋나지 않음)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # 🔗 관계 설정: Novel 모델과의 연결
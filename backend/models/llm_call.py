@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class LLMCall(Base):
+    __tablename__ = "llm_calls"
+    __table_args__ = (
+        # 🚀 소설/회차별 단계 사용량 집계 (/novels/{id}/usage)
+        Index("ix_llm_calls_novel_chapter", "novel_id", "chapter_num"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    # 🔗 호출이 속한 소설 / 회차 / 시도 (플롯·요약처럼 시도와 무관한 호출은 attempt_num 없음)
+    novel_id = Column(Integer, ForeignKey("novels.id", ondelete="CASCADE"), nullable=False)
+    chapter_num = Column(Integer, nullable=False)
+    attempt_num = Column(Integer, nullable=True)
+
+    # 🧭 파이프라인 단계 (plot / draft / review / summary) 와 응답한 모델 (캐시 적중이면 cache)
+    stage = Column(String(20), nullable=False)
+    model = Column(String(100), nullable=False)
+
+    # 🧮 토큰 사용량 (usage_metadata 기준, 없으면 문자 수 추정치)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+
+    # ⏱️ 재시도/백오프 대기를 포함한 호출 시간, 성공 전 실패한 모델 호출 수
+    latency_ms = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+
+    # 🗃️ 응답 캐시 적중 여부 (0/1)
+    cached = Column(Integer, nullable=False, default=0)
+
+    # 🗂️ prompt_tokens 중 제공자 측 컨텍스트 캐시에서 읽은 토큰 (단가가 낮음)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+
+    # ⏰ 기록 시각
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<LLMCall(novel_id={self.novel_id}, ch={self.chapter_num}, stage='{self.stage}', model='{self.model}')>"
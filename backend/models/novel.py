@@ -35,5 +35,8 @@ class Novel(Base):
     # 📊 생성 과정 로그 (1:N)
     generation_logs = relationship("GenerationLog", back_populates="novel", cascade="all, delete-orphan")
 
+    # 🧾 집필 작업 큐 (1:N)
+    generation_jobs = relationship("GenerationJob", back_populates="novel", cascade="all, delete-orphan")
+
     def __repr__(self):
         return f"<Novel(id={self.id}, title='{self.title}', genre='{self.genre}')>"
\ No newline at end of file
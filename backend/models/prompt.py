@@ -22,8 +22,13 @@ class PromptSetting(Base):
     # 📑 4단계: 전체 줄거리 요약 및 갱신용 프롬프트
     summary_prompt = Column(Text, nullable=False)
 
+    # 🔢 수정될 때마다 1씩 오르는 버전 (컴파일된 템플릿 캐시 키, ORM이 UPDATE 시 자동 증가)
+    version = Column(Integer, nullable=False, server_default="1")
+
     # 🔗 관계 설정: Novel 모델과의 1:1 연결
     novel = relationship("Novel", back_populates="prompts")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<PromptSetting(novel_id={self.novel_id})>"
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import sessionmaker
+from database import BackgroundSessionLocal
+from models.chapter import Chapter
+from core.ai_driver import get_ai_driver
+from core.usage import track_llm_usage
+from modules.context_builder import get_context_assembler
+from modules.search_index import index_safely, document_for
+from schemas.llm_output import ChapterSummaryOutput
+
+# 회차 1개만 요약하는 전용 프롬프트 (소설별 summary_prompt는 세계관 갱신까지 하므로 백필에 쓰지 않음)
+CHAPTER_SUMMARY_PROMPT = """당신은 이야기의 모든 복선을 기억하는 기록관입니다.
+아래 제 {chapter_num}화 본문의 핵심 사건과 떡밥을 1~2문장으로 요약하세요.
+
+[본문]
+{content}
+
+[출력 형식] 반드시 아래 JSON 형식을 지키세요:
+{{"summary": "이번 화 핵심 요약 (1~2문장)"}}"""
+
+class ChapterSummarizer:
+    """
+    요약이 비어 있는 기존 회차를 배치 단위로 채우는 백필 도구
+    집필기와 같이 DB는 짧은 트랜잭션(asyncio.to_thread)으로만 쓰고, LLM 요약을 기다리는 동안에는 커넥션을 쥐지 않습니다.
+    """
+
+    def __init__(self, session_factory: sessionmaker = BackgroundSessionLocal):
+        self.session_factory = session_factory
+        self.ai = get_ai_driver()
+
+    async def backfill(self, novel_id: int, batch_size: int = 20) -> Dict[str, Any]:
+        # 1. 요약이 없는 회차를 오래된 순으로 batch_size개만 (본문 외 큰 컬럼은 읽지 않음)
+        rows = await asyncio.to_thread(self._load_pending, novel_id, batch_size)
+
+        # 2. 배치 안의 회차들을 동시에 요약 (동시 호출 수는 AIDriver 세마포어가 제한)
+        summaries = await asyncio.gather(*[self._summarize(chapter_num, content) for _, chapter_num, content in rows])
+
+        # 3. 성공한 것만 한 번에 갱신
+        done = [(row, summary) for row, summary in zip(rows, summaries) if summary]
+        remaining = await asyncio.to_thread(self._save_summaries, novel_id, done)
+
+        return {
+            "processed": len(rows),
+            "updated": len(done),
+            "failed": len(rows) - len(done),
+            "remaining": remaining,
+        }
+
+    def _load_pending(self, novel_id: int, batch_size: int) -> List[Tuple[int, int, str]]:
+        with self.session_factory() as db:
+            rows = (
+                db.query(Chapter.id, Chapter.chapter_num, Chapter.content)
+                .filter(Chapter.novel_id == novel_id, Chapter.summary.is_(None))
+                .order_by(Chapter.chapter_num)
+                .limit(batch_size)
+                .all()
+            )
+        return [(r.id, r.chapter_num, r.content) for r in rows]
+
+    def _save_summaries(self, novel_id: int, done: List[Tuple[Tuple[int, int, str], str]]) -> int:
+        """요약 저장 후 아직 요약이 없는 회차 수"""
+        with self.session_factory() as db:
+            if done:
+                db.bulk_update_mappings(Chapter, [{"id": chapter_id, "summary": summary} for (chapter_id, _, _), summary in done])  # type: ignore
+                db.commit()
+            remaining = db.query(Chapter.id).filter(Chapter.novel_id == novel_id, Chapter.summary.is_(None)).count()
+
+        if done:
+            get_context_assembler().invalidate(novel_id)
+            index_safely(
+                document_for("chapter", (chapter_id, novel_id, chapter_num, content, summary))
+                for (chapter_id, chapter_num, content), summary in done
+            )
+        return remaining
+
+    async def _summarize(self, chapter_num: int, content: str) -> Optional[str]:
+        prompt = CHAPTER_SUMMARY_PROMPT.format(chapter_num=chapter_num, content=content)
+        # 요약 단계 모델 순서(AI_STAGE_MODELS["summary"])로 라우팅
+        with track_llm_usage("summary"):
+            summary, _ = await self.ai.agenerate_structured(prompt, ChapterSummaryOutput, use_cache=True)
+        return (summary.summary or None) if summary else None
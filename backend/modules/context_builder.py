@@ -0,0 +1,169 @@
+import math
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from core.config import settings
+from models.chapter import Chapter
+
+@dataclass
+class ChapterContext:
+    chapter_num: int
+    summary: str
+    content: Optional[str] = None  # 원문은 최근 회차만 보관
+
+@dataclass
+class NovelContextState:
+    last_chapter_num: int
+    entries: List[ChapterContext] = field(default_factory=list)  # 오래된 회차 → 최근 회차 순
+    assembled: Optional[str] = None
+
+class ContextAssembler:
+    """
+    {context} 조립기.
+    토큰 예산 안에서 최근 회차는 원문 그대로, 그 이전 회차는 회차별 요약으로 채웁니다.
+    조립 결과는 소설별로 캐시하고, 회차가 저장되면 DB를 다시 읽지 않고 증분 갱신합니다.
+    build는 집필기가 스레드에서 부르므로 캐시 변경은 잠금 안에서만 합니다. (DB 조회는 잠금 밖)
+    """
+
+    def __init__(self, token_budget: int, recent_verbatim: int, chars_per_token: float, fallback_summary_chars: int):
+        self.token_budget = token_budget
+        self.recent_verbatim = max(recent_verbatim, 0)
+        self.chars_per_token = chars_per_token
+        self.fallback_summary_chars = fallback_summary_chars
+        self._cache: Dict[int, NovelContextState] = {}
+        self._lock = threading.Lock()
+
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    # ---------------------------------------------------------
+    # 📖 조회
+    # ---------------------------------------------------------
+    def build(self, db: Session, novel_id: int) -> str:
+        # 다른 프로세스가 회차를 저장했을 수 있으므로 마지막 회차 번호만 가볍게 확인
+        last_num = db.query(func.max(Chapter.chapter_num)).filter(Chapter.novel_id == novel_id).scalar() or 0
+
+        with self._lock:
+            state = self._cache.get(novel_id)
+        if state is None or state.last_chapter_num != last_num:
+            state = self._load(db, novel_id, int(last_num))
+            with self._lock:
+                self._cache[novel_id] = state
+
+        with self._lock:
+            if state.assembled is None:
+                state.assembled = self._assemble(state)
+            return state.assembled
+
+    # ---------------------------------------------------------
+    # 💾 증분 갱신 (회차 저장 직후 호출)
+    # ---------------------------------------------------------
+    def on_chapter_saved(self, novel_id: int, chapter_num: int, content: str, summary: Optional[str] = None):
+        with self._lock:
+            state = self._cache.get(novel_id)
+            if state is None or chapter_num != state.last_chapter_num + 1:
+                # 캐시가 없거나 중간 회차가 빠졌으면 다음 build에서 새로 적재
+                self._cache.pop(novel_id, None)
+                return
+
+            state.entries.append(ChapterContext(chapter_num, summary or self._fallback_summary(content), content))
+            self._drop_old_contents(state)
+            state.last_chapter_num = chapter_num
+            state.assembled = None
+
+    def invalidate(self, novel_id: int):
+        with self._lock:
+            self._cache.pop(novel_id, None)
+
+    # ---------------------------------------------------------
+    # 🛠️ 내부 로직
+    # ---------------------------------------------------------
+    def _load(self, db: Session, novel_id: int, last_num: int) -> NovelContextState:
+        """최근 N화는 원문까지, 그 이전은 예산이 찰 때까지 요약(없으면 본문 앞부분)만 읽어옵니다."""
+        state = NovelContextState(last_chapter_num=last_num)
+
+        recent = (
+            db.query(Chapter.chapter_num, Chapter.summary, Chapter.content)
+            .filter(Chapter.novel_id == novel_id)
+            .order_by(Chapter.chapter_num.desc())
+            .limit(self.recent_verbatim)
+            .all()
+        ) if self.recent_verbatim else []
+
+        older: List[ChapterContext] = []
+        used = sum(self.estimate_tokens(c.content) for c in recent)
+        before = recent[-1].chapter_num if recent else last_num + 1
+        page_size = 50
+        while used < self.token_budget:
+            rows = (
+                db.query(Chapter.chapter_num, Chapter.summary, func.substr(Chapter.content, 1, self.fallback_summary_chars))
+                .filter(Chapter.novel_id == novel_id, Chapter.chapter_num < before)
+                .order_by(Chapter.chapter_num.desc())
+                .limit(page_size)
+                .all()
+            )
+            for num, summary, head in rows:
+                entry = ChapterContext(num, summary or self._fallback_summary(head or ""))
+                older.append(entry)
+                used += self.estimate_tokens(entry.summary)
+                if used >= self.token_budget:
+                    break
+            if len(rows) < page_size:
+                break
+            before = rows[-1][0]
+
+        state.entries = list(reversed(older)) + [
+            ChapterContext(c.chapter_num, c.summary or self._fallback_summary(c.content), c.content)
+            for c in reversed(recent)
+        ]
+        return state
+
+    def _assemble(self, state: NovelContextState) -> str:
+        """
+        최근 회차부터 거꾸로 예산을 채운 결과만 만듭니다.
+        예산 밖으로 밀려난 회차도 캐시(state.entries)에는 그대로 남겨 둡니다.
+        (예산이 커지거나 원문이 요약으로 바뀌면 다시 들어와야 하므로 잘라내면 DB보다 맥락이 줄어듦)
+        """
+        remaining = self.token_budget
+        blocks: List[str] = []
+
+        for entry in reversed(state.entries):
+            if entry.content is not None:
+                block = f"\n[Chapter {entry.chapter_num}]\n{entry.content}\n"
+                if self.estimate_tokens(block) > remaining:
+                    # 직전 화가 예산보다 길면 끝부분(다음 화와 이어지는 장면)만 남김
+                    keep_chars = int(remaining * self.chars_per_token)
+                    if keep_chars > 0:
+                        blocks.append(f"\n[Chapter {entry.chapter_num}]\n…{entry.content[-keep_chars:]}\n")
+                    break
+            else:
+                block = f"\n[Chapter {entry.chapter_num} 요약]\n{entry.summary}\n"
+                if self.estimate_tokens(block) > remaining:
+                    break
+
+            blocks.append(block)
+            remaining -= self.estimate_tokens(block)
+
+        return "".join(reversed(blocks))
+
+    def _drop_old_contents(self, state: NovelContextState):
+        cutoff = len(state.entries) - self.recent_verbatim
+        for entry in state.entries[:max(cutoff, 0)]:
+            entry.content = None
+
+    def _fallback_summary(self, content: str) -> str:
+        return content[:self.fallback_summary_chars].strip()
+
+
+@lru_cache(maxsize=None)
+def get_context_assembler() -> ContextAssembler:
+    """프로세스 전체에서 공유하는 조립기 (소설별 캐시 공유)"""
+    return ContextAssembler(
+        token_budget=settings.context.CONTEXT_TOKEN_BUDGET,
+        recent_verbatim=settings.context.CONTEXT_RECENT_VERBATIM,
+        chars_per_token=settings.context.CONTEXT_CHARS_PER_TOKEN,
+        fallback_summary_chars=settings.context.CONTEXT_FALLBACK_SUMMARY_CHARS,
+    )
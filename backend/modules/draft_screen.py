@@ -0,0 +1,109 @@
+import math
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+# 대사 문단으로 보는 시작 문자 (따옴표/낫표)
+DIALOGUE_OPENERS = ('"', "“", "「", "『", "'", "‘")
+
+# 문장 끝: 마침표/물음표/느낌표/말줄임표 뒤에 공백·닫는 따옴표·줄끝
+SENTENCE_END_RE = re.compile(r"[^.!?…。]+(?:[.!?…。]+[\"”」』'’]*|$)")
+
+# ----------------------------------------------------------------
+# 📏 원고 사전 검사 (LLM 평가 전에 로컬에서)
+#   집필 프롬프트의 측정 가능한 규칙(분량, 1~3줄 문단, 대화 6 : 서술 4, 단문)을 수치로 재고,
+#   기준에서 크게 벗어난 원고는 평가 호출 없이 반려하고 재작성 지시를 자동으로 만듭니다.
+#   반려 기준은 "명백한 위반"만 잡도록 프롬프트 목표보다 넉넉하게 둡니다. (애매한 건 편집장이 판단)
+# ----------------------------------------------------------------
+@dataclass(frozen=True)
+class ScreenRules:
+    min_chars: int = 3000              # 목표 4,500자의 2/3 미만이면 반려
+    max_chars: int = 7000
+    screen_line_chars: int = 30        # 스마트폰 한 줄 글자 수 (문단 줄 수 환산용)
+    max_paragraph_lines: int = 3       # 이보다 긴 문단은 '벽돌 문단'
+    max_brick_ratio: float = 0.2       # 벽돌 문단 비율이 이보다 크면 반려
+    min_dialogue_ratio: float = 0.3    # 목표 0.6 (대화 6 : 서술 4)
+    max_dialogue_ratio: float = 0.85
+    max_avg_sentence_chars: float = 60.0
+    enforce: bool = True               # False면 지표/위반만 기록하고 반려하지 않음
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ScreenRules":
+        """GenerateConfig 값으로 구성"""
+        defaults = cls()
+        return cls(
+            enforce=config.get("prescreen", True),
+            min_chars=config.get("prescreen_min_chars") or defaults.min_chars,
+            max_chars=config.get("prescreen_max_chars") or defaults.max_chars,
+        )
+
+
+@dataclass
+class DraftMetrics:
+    chars: int
+    paragraphs: int
+    max_paragraph_lines: int
+    brick_ratio: float          # 벽돌 문단 비율
+    dialogue_ratio: float       # 대사 글자 수 / 전체 글자 수
+    sentences: int
+    avg_sentence_chars: float
+
+
+@dataclass
+class ScreenResult:
+    passed: bool                # 위반 없음 (enforce=False여도 위반 여부는 그대로)
+    metrics: DraftMetrics
+    violations: List[str] = field(default_factory=list)  # 위반 규칙 이름
+    feedback: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """GenerationLog.raw_review["prescreen"]에 저장할 값"""
+        return {"passed": self.passed, "violations": self.violations, **{k: _round(v) for k, v in asdict(self.metrics).items()}}
+
+
+def measure_draft(content: str, rules: ScreenRules = ScreenRules()) -> DraftMetrics:
+    """문단(빈 줄이 아닌 줄) / 문장 단위로 한 번씩만 훑어서 지표 계산"""
+    paragraphs = [line.strip() for line in content.splitlines() if line.strip()]
+    lengths = [len(p) for p in paragraphs]
+    total = sum(lengths)
+    screen_lines = [math.ceil(n / rules.screen_line_chars) for n in lengths]
+    bricks = sum(1 for n in screen_lines if n > rules.max_paragraph_lines)
+    dialogue = sum(n for p, n in zip(paragraphs, lengths) if p.startswith(DIALOGUE_OPENERS))
+    sentences = [s for p in paragraphs for s in (m.group(0).strip() for m in SENTENCE_END_RE.finditer(p)) if s]
+
+    return DraftMetrics(
+        chars=len(content.strip()),
+        paragraphs=len(paragraphs),
+        max_paragraph_lines=max(screen_lines, default=0),
+        brick_ratio=bricks / len(paragraphs) if paragraphs else 0.0,
+        dialogue_ratio=dialogue / total if total else 0.0,
+        sentences=len(sentences),
+        avg_sentence_chars=sum(len(s) for s in sentences) / len(sentences) if sentences else 0.0,
+    )
+
+
+def screen_draft(content: str, rules: ScreenRules) -> ScreenResult:
+    m = measure_draft(content, rules)
+    issues: List[tuple] = []  # (규칙 이름, 재작성 지시)
+
+    if m.chars < rules.min_chars:
+        issues.append(("too_short", f"- 분량 부족: {m.chars:,}자입니다. 장면을 더 쌓아 4,500자 내외(최소 {rules.min_chars:,}자)로 늘리세요."))
+    elif m.chars > rules.max_chars:
+        issues.append(("too_long", f"- 분량 초과: {m.chars:,}자입니다. 군더더기 묘사를 덜어 4,500자 내외(최대 {rules.max_chars:,}자)로 줄이세요."))
+    if m.brick_ratio > rules.max_brick_ratio:
+        issues.append(("brick_paragraphs", f"- 벽돌 문단: 문단의 {m.brick_ratio:.0%}가 {rules.max_paragraph_lines}줄을 넘습니다 (최장 {m.max_paragraph_lines}줄). 1문단 1~3줄로 끊으세요."))
+    if m.dialogue_ratio < rules.min_dialogue_ratio:
+        issues.append(("low_dialogue", f"- 대화 부족: 대사 비중이 {m.dialogue_ratio:.0%}입니다. 서술을 대사로 바꿔 대화 6 : 서술 4에 맞추세요."))
+    elif m.dialogue_ratio > rules.max_dialogue_ratio:
+        issues.append(("high_dialogue", f"- 서술 부족: 대사 비중이 {m.dialogue_ratio:.0%}입니다. 행동/리액션 서술을 넣어 대화 6 : 서술 4에 맞추세요."))
+    if m.avg_sentence_chars > rules.max_avg_sentence_chars:
+        issues.append(("long_sentences", f"- 만연체: 문장 평균 {m.avg_sentence_chars:.0f}자입니다. \"했다. 그랬다.\" 식의 단문으로 끊으세요."))
+
+    if not issues:
+        return ScreenResult(True, m)
+    feedback = "[사전 검사 반려] 아래 형식 규칙을 지키지 않아 평가 전에 반려되었습니다.\n" + "\n".join(text for _, text in issues)
+    return ScreenResult(False, m, [name for name, _ in issues], feedback)
+
+
+def _round(value: Any) -> Any:
+    return round(value, 3) if isinstance(value, float) else value
@@ -0,0 +1,71 @@
+import hashlib
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+P = TypeVar("P")
+
+# 공백/문장부호 차이는 무시 (줄바꿈만 바꾼 재작성도 같은 원고로 봄)
+_NORMALIZE_RE = re.compile(r"[\s\"'“”‘’「」『』.,!?…·~\-]+")
+
+# ----------------------------------------------------------------
+# 🧬 원고 스케치 (MinHash, bottom-k 방식)
+#   원고를 글자 k-gram(shingle) 집합으로 보고, 해시값이 가장 작은 num_hashes개만 남깁니다.
+#   두 스케치의 합집합 하위 num_hashes개 중 양쪽에 다 있는 비율이 자카드 유사도 추정치입니다.
+#   해시 함수 하나로 끝나므로(순열 N개 불필요) 4,500자 원고도 수 ms 안에 스케치가 만들어집니다.
+# ----------------------------------------------------------------
+@dataclass(frozen=True)
+class DraftSketch:
+    hashes: frozenset
+    shingles: int  # 서로 다른 shingle 수
+
+    @classmethod
+    def from_text(cls, text: str, shingle_chars: int = 5, num_hashes: int = 128) -> "DraftSketch":
+        normalized = _NORMALIZE_RE.sub(" ", text).strip()
+        # k자보다 짧은 원고는 전체가 shingle 1개, 빈 원고는 스케치가 비어 무엇과도 유사도 0
+        grams = {normalized[i:i + shingle_chars] for i in range(max(len(normalized) - shingle_chars + 1, 1))} if normalized else set()
+        hashes = (int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams)
+        return cls(frozenset(heapq.nsmallest(num_hashes, hashes)), len(grams))
+
+    def similarity(self, other: "DraftSketch") -> float:
+        """자카드 유사도 추정치 (0~1)"""
+        k = min(len(self.hashes), len(other.hashes))
+        if k == 0:
+            return 0.0
+        union_bottom = heapq.nsmallest(k, self.hashes | other.hashes)
+        both = sum(1 for h in union_bottom if h in self.hashes and h in other.hashes)
+        return both / k
+
+# ----------------------------------------------------------------
+# 🗂️ 유사 원고 색인 (회차 집필 1번 동안 유지)
+#   이번 회차의 이전 시도 원고(+ 선택적으로 최근 회차 본문)를 넣어 두고,
+#   새 원고와 가장 비슷한 항목이 threshold 이상이면 그 항목을 돌려줍니다.
+#   항목이 수십 개 수준이라 LSH 버킷 없이 전부 비교합니다.
+#   같은 라운드 후보들은 동시에 집필/평가되므로 평가 전에는 서로 비교되지 않습니다.
+#   (라운드가 끝난 뒤 색인에 넣으면서 형제 후보끼리 겹친 건 집필 온도 조절에만 반영)
+# ----------------------------------------------------------------
+class DraftIndex(Generic[P]):
+    def __init__(self, threshold: float = 0.9, shingle_chars: int = 5, num_hashes: int = 128):
+        self.threshold = threshold
+        self.shingle_chars = shingle_chars
+        self.num_hashes = num_hashes
+        self._entries: List[Tuple[DraftSketch, P]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sketch(self, text: str) -> DraftSketch:
+        return DraftSketch.from_text(text, self.shingle_chars, self.num_hashes)
+
+    def add(self, sketch: DraftSketch, payload: P):
+        self._entries.append((sketch, payload))
+
+    def nearest(self, sketch: DraftSketch) -> Optional[Tuple[float, P]]:
+        """(유사도, 항목) - threshold 이상인 것 중 가장 비슷한 항목, 없으면 None"""
+        best: Optional[Tuple[float, Any]] = None
+        for other, payload in self._entries:
+            score = sketch.similarity(other)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, payload)
+        return best
@@ -1,142 +1,521 @@
 import json
-from typing import Dict, Any, Tuple
-from sqlalchemy.orm import Session
+import asyncio
+import itertools
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Tuple, Optional, Callable, Awaitable
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, sessionmaker
+from database import BackgroundSessionLocal
 from models.chapter import Chapter
-from models.generation_log import GenerationLog
+from models.llm_call import LLMCall
 from models.novel import Novel
-from core.ai_driver import AIDriver
+from models.prompt import PromptSetting
+from core.ai_driver import get_ai_driver
+from core.context_cache import ContextCache
+from core.lock import LeaseLock, novel_lock_key
+from core.logger import logger
+from core.metrics import DRAFT_DUPLICATES_TOTAL, DRAFT_PRESCREEN_TOTAL, GENERATIONS_ACTIVE, GENERATIONS_TOTAL, span
+from core.usage import LLMCallUsage, aggregate_calls, track_llm_usage
+from modules.context_builder import get_context_assembler
+from modules.draft_screen import ScreenRules, screen_draft
+from modules.draft_similarity import DraftIndex, DraftSketch
+from modules.log_retention import compact_chapter_safely
+from modules.log_sink import get_log_sink
+from modules.prompt_template import PromptTemplate, get_prompt_template
+from modules.search_index import index_safely, novel_document, chapter_document
+from modules.stopping import LoopState, StopDecision, build_policies, should_stop
+from schemas.llm_output import NovelSummaryOutput, ReviewOutput
 
-def safe_format_prompt(template: str, kwargs: dict) -> str:
-    result = template
-    for key, value in kwargs.items():
-        result = result.replace(f"{{{key}}}", str(value))
-    return result
+# 회차 집필 동안 바뀌지 않는 큰 치환값 → 컨텍스트 캐시를 쓰면 프롬프트 맨 앞 [공통 자료]로 옮기고 본문에는 참조 문구만 남김
+CONTEXT_CACHE_REFERENCES = {
+    "world": "(위 [공통 자료]의 '세계관' 참고)",
+    "rules_json": "(위 [공통 자료]의 '설정/규칙' 참고)",
+    "context": "(위 [공통 자료]의 '최근 맥락' 참고)",
+}
+
+# 이전 시도와 거의 같은 원고가 나왔을 때 다음 라운드 집필 온도를 올리는 상한
+MAX_DRAFT_TEMPERATURE = 1.5
+
+# 진행 이벤트 수신 콜백: (이벤트 이름, 데이터) → SSE 스트리밍 등에서 사용
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+@dataclass(frozen=True)
+class NovelSnapshot:
+    """집필 시작 시점의 소설/프롬프트 값 (세션과 분리된 읽기 전용 사본)"""
+    title: str
+    story_summary: Optional[str]
+    world_setting: Any
+    rules: Dict[str, Any]
+    plot_prompt: str
+    writing_prompt: str
+    review_prompt: str
+    summary_prompt: str
+    prompt_id: Optional[int] = None
+    prompt_version: Optional[int] = None
+
+    def template(self, field: str) -> PromptTemplate:
+        """프롬프트 항목의 컴파일된 템플릿 (프롬프트 id + 버전 단위로 캐시)"""
+        return get_prompt_template(self.prompt_id, self.prompt_version, field, getattr(self, field))
 
 class NovelGenerator:
-    def __init__(self, db: Session, novel_id: int):
-        self.db = db
+    """
+    DB 커넥션은 짧은 트랜잭션 동안만 빌립니다.
+    시작할 때 필요한 값을 스냅샷으로 읽어 두고, LLM 호출을 기다리는 동안에는 세션을 열어두지 않습니다.
+    """
+
+    def __init__(self, novel_id: int, on_event: Optional[EventCallback] = None, session_factory: sessionmaker = BackgroundSessionLocal):
         self.novel_id = novel_id
-        self.ai = AIDriver()
+        self.ai = get_ai_driver()
+        self.on_event = on_event
+        self.session_factory = session_factory
+        self.chapter_num: Optional[int] = None
+        self.loop_state: Optional[LoopState] = None
+        self.context_cache: Optional[ContextCache] = None
+        self.lease: Optional[LeaseLock] = None
+        # 마지막 실행 결과 (saved / rejected / missing / locked / error / cancelled) - 워커가 작업 상태를 나눌 때 사용
+        self.outcome: Optional[str] = None
+
+    async def run_daily_routine(self, config_dict: Dict[str, Any], lease: Optional[LeaseLock] = None) -> bool:
+        """
+        메인 워크플로우
+        lease: 호출한 쪽이 이미 잡아 둔 소설 잠금 (SSE 스트리밍처럼 요청을 받을 때 중복 실행을 막은 경우, 해제도 호출한 쪽에서)
+        """
+        logger.info(f"🚀 [소설 ID: {self.novel_id}] AI 작가 에이전트 구동 시작...")
+        if lease is not None:
+            self.lease = lease
+            return await self._run_with_lease(config_dict)
 
-    def run_daily_routine(self, config_dict: Dict[str, Any]) -> bool:
-        """메인 워크플로우"""
-        print(f"\n🚀 [소설 ID: {self.novel_id}] AI 작가 에이전트 구동 시작...")
+        # 🔒 다른 프로세스/서버에서 같은 소설을 집필 중이면 중단 (같은 회차 번호 중복 생성 방지)
+        self.lease = LeaseLock(novel_lock_key(self.novel_id))
+        async with self.lease as acquired:
+            if not acquired:
+                logger.warning(f"❌ [중단] 다른 작업이 이미 이 소설을 집필 중입니다. (소설 {self.novel_id})")
+                self.outcome = "locked"
+                GENERATIONS_TOTAL.labels(outcome="locked").inc()
+                await self._emit("error", detail="다른 작업이 이미 이 소설을 집필 중입니다.")
+                return False
+            return await self._run_with_lease(config_dict)
 
-        novel = self.db.query(Novel).filter(Novel.id == self.novel_id).first()
-        if not novel or not novel.prompts: 
-            print("❌ [중단] 소설 정보 또는 프롬프트 설정이 없습니다.")
+    async def _run_with_lease(self, config_dict: Dict[str, Any]) -> bool:
+        """잠금을 쥔 채로 집필하고, 결과와 관계없이 사용량/시도 기록을 정리"""
+        # 🧮 이번 작업의 LLM 호출 기록 전체 (단계별로 llm_calls에 저장)
+        GENERATIONS_ACTIVE.inc()
+        self.outcome = "error"
+        with track_llm_usage() as llm_calls:
+            try:
+                with span("generation", novel_id=self.novel_id):
+                    success = await self._run_locked(config_dict)
+                # saved / rejected / missing은 _run_locked가 기록
+                return success
+            except asyncio.CancelledError:
+                self.outcome = "cancelled"
+                raise
+            finally:
+                if self.context_cache:
+                    await self.context_cache.close()
+                GENERATIONS_ACTIVE.dec()
+                GENERATIONS_TOTAL.labels(outcome=self.outcome).inc()
+                await asyncio.to_thread(self._save_usage, llm_calls)
+                # 🧾 성공/실패/취소와 관계없이 이번 작업의 시도 기록은 모두 DB에 반영 (실패분은 스풀에 남아 재시도)
+                flushed = await asyncio.to_thread(get_log_sink().flush)
+                # 🗄️ 기록이 모두 저장됐을 때만 이번 회차 탈락 원고 정리 (상위 K개 외에는 diff/본문 삭제)
+                if flushed and self.chapter_num:
+                    with span("log_compaction", novel_id=self.novel_id, chapter_num=self.chapter_num):
+                        await asyncio.to_thread(compact_chapter_safely, self.novel_id, self.chapter_num)
+
+    async def _run_locked(self, config_dict: Dict[str, Any]) -> bool:
+        """잠금을 보유한 상태에서 실행되는 실제 집필 흐름"""
+        loaded = await asyncio.to_thread(self._load_snapshot)
+        if not loaded:
+            logger.warning(f"❌ [중단] 소설 정보 또는 프롬프트 설정이 없습니다. (소설 {self.novel_id})")
+            self.outcome = "missing"
+            await self._emit("error", detail="소설 정보 또는 프롬프트 설정이 없습니다.")
             return False
-        
-        current_chapter_num = self._get_next_chapter_num()
-        prompt_kwargs = self._build_context_kwargs(novel, current_chapter_num)
+        novel, current_chapter_num, prompt_kwargs = loaded
+        self.chapter_num = current_chapter_num
+        # 🗂️ 세계관/설정/최근 맥락은 이번 화 모든 호출에서 같으므로 제공자 쪽 캐시에 한 번만 올림 (설정이 꺼져 있거나 작으면 None)
+        self.context_cache = self.ai.context_cache(self._context_prefix(prompt_kwargs))
+        # 시간/토큰 예산은 플롯 생성부터 계산
+        self.loop_state = LoopState(max_rounds=config_dict.get("max_attempts", 10))
 
         # 1. 플롯 생성
-        print(f"📅 [진행상황] 제 {current_chapter_num}화 플롯 구상 중...")
-        plot_p = safe_format_prompt(novel.prompts.plot_prompt, prompt_kwargs)
-        prompt_kwargs["plot"] = self.ai.generate(plot_p)
+        logger.info(f"📅 [진행상황] 소설 {self.novel_id} 제 {current_chapter_num}화 플롯 구상 중...")
+        plot_template = novel.template("plot_prompt")
+        plot_kwargs, plot_context = self._layout(plot_template, prompt_kwargs)
+        plot_p = plot_template.render(plot_kwargs)
+        await self._emit("plot_start", chapter_num=current_chapter_num)
+        with span("plot", novel_id=self.novel_id, chapter_num=current_chapter_num), track_llm_usage("plot") as plot_calls:
+            prompt_kwargs["plot"] = await self._generate_text(plot_p, "plot", use_cache=True, context=plot_context)
+        self.loop_state.add_tokens(plot_calls)
 
         # 2. 작성 및 평가 루프
         min_score = config_dict.get("min_score", 95)
-        # 성공적으로 기준을 넘었을 때만 데이터가 반환되도록 내부 로직 수정됨
-        best_content, best_score, best_feedback = self._execute_generation_loop(
+        # 채택할 원고(목표 점수 통과 또는 fallback_score 이상)가 있을 때만 본문이 반환됨
+        best_content, best_score, best_feedback = await self._execute_generation_loop(
             novel, prompt_kwargs, config_dict, current_chapter_num
         )
 
-        # 🚨 [핵심 체크] 기준 점수(min_score)를 넘지 못했다면 여기서 즉시 종료!
-        if not best_content or best_score < min_score:
-            print(f"\n⚠️ [최종 반려] 시도 횟수 내에 목표 점수({min_score}점)를 달성하지 못했습니다.")
-            print(f"   (최고 기록: {best_score}점) - DB에 저장하지 않고 종료합니다.")
+        # 🚨 [핵심 체크] 채택할 원고가 없다면 여기서 즉시 종료!
+        if not best_content:
+            logger.info(
+                f"⚠️ [최종 반려] 소설 {self.novel_id} 제 {current_chapter_num}화: 목표 점수({min_score}점)를 달성하지 못하고 중단했습니다. "
+                f"(최고 기록: {best_score}점) - DB에 저장하지 않고 종료합니다."
+            )
+            self.outcome = "rejected"
+            await self._emit("rejected", chapter_num=current_chapter_num, best_score=best_score, min_score=min_score)
             return False
 
-        # 3. 기준 통과 시에만 실행되는 저장 로직
-        print(f"\n💾 [검수 통과] 최종 점수 {best_score}점으로 저장을 시작합니다!")
-        self._save_chapter(current_chapter_num, best_content, best_score, best_feedback)
-        self._update_novel_settings(novel, prompt_kwargs, best_content)
-
-        self.db.commit()
-        print(f"🏁 [완료] 제 {current_chapter_num}화 집필 및 갱신 성공!\n")
+        # 3. 기준 통과 시에만 실행되는 저장 로직 (요약 생성이 끝난 뒤 회차 + 소설 갱신을 한 트랜잭션으로)
+        logger.info(f"💾 [검수 통과] 소설 {self.novel_id} 제 {current_chapter_num}화 최종 점수 {best_score}점으로 저장을 시작합니다!")
+        novel_updates, chapter_summary = await self._update_novel_settings(novel, prompt_kwargs, best_content)
+        # 🔒 잠금 연장이 끊겼으면 다른 프로세스가 같은 회차를 쓰고 있을 수 있으므로 저장하지 않고 실패 처리
+        self.lease.ensure_held()
+        await asyncio.to_thread(self._save_results, current_chapter_num, best_content, best_score, best_feedback, chapter_summary, novel_updates)
+        get_context_assembler().on_chapter_saved(self.novel_id, current_chapter_num, best_content, chapter_summary)
+        self.outcome = "saved"
+        logger.info(f"🏁 [완료] 소설 {self.novel_id} 제 {current_chapter_num}화 집필 및 갱신 성공!")
+        await self._emit("saved", chapter_num=current_chapter_num, score=best_score)
         return True
 
-    def _execute_generation_loop(self, novel: Novel, prompt_kwargs: Dict[str, Any], config_dict: Dict[str, Any], current_chapter_num: int) -> Tuple[str, int, str]:
-        """AI 집필 및 평가 반복 루프"""
+    async def _execute_generation_loop(self, novel: NovelSnapshot, prompt_kwargs: Dict[str, Any], config_dict: Dict[str, Any], current_chapter_num: int) -> Tuple[str, int, str]:
+        """
+        AI 집필 및 평가 반복 루프 (parallel_candidates > 1이면 라운드마다 후보 N개를 동시에 집필/평가)
+        라운드마다 중단 정책(정체/시간/토큰 예산/최대 시도)을 검사하고, 멈춘 이유를 마지막 시도 기록에 남깁니다.
+        """
         best_score, best_content, best_feedback = 0, "", "점수 미달"
         current_feedback = None 
         
         max_attempts = config_dict.get("max_attempts", 10)
         min_score = config_dict.get("min_score", 95)
+        fallback_score = config_dict.get("fallback_score")
+        parallel_candidates = config_dict.get("parallel_candidates", 1)
+        policies = build_policies(config_dict)
+        screen_rules = ScreenRules.from_config(config_dict)
+        state = self.loop_state or LoopState(max_rounds=max_attempts)
+        attempt = 0
+
+        # 🧬 이전 시도(+ 최근 회차)와 거의 같은 원고는 다시 평가하지 않음. 반복되면 다음 라운드 집필 온도를 올림
+        draft_index = await asyncio.to_thread(self._draft_index, config_dict)
+        temperature_step = config_dict.get("dedup_temperature_step") or 0.0
+        draft_config: Optional[Dict[str, Any]] = None
+
+        # 라운드마다 바뀌는 건 피드백(집필)과 원고(평가)뿐이므로 나머지는 루프 전에 한 번만 채움
+        write_template, review_template = novel.template("writing_prompt"), novel.template("review_prompt")
+        write_kwargs, write_context = self._layout(write_template, prompt_kwargs)
+        review_kwargs, review_context = self._layout(review_template, prompt_kwargs)
+        base_write_p = write_template.render(write_kwargs)
+        review_template = review_template.partial(review_kwargs, keep=("content",))
 
-        for attempt in range(1, max_attempts + 1):
-            print(f"   🔄 [시도 {attempt}/{max_attempts}] 원고 작성 중...", end="\r")
+        for round_num in itertools.count(1):
+            logger.debug(f"🔄 [라운드 {round_num}/{max_attempts}] 소설 {self.novel_id} 원고 {parallel_candidates}개 작성 중...")
             
-            write_p = safe_format_prompt(novel.prompts.writing_prompt, prompt_kwargs)
+            write_p = base_write_p
             if current_feedback:
                 write_p += f"\n\n🚨 [재작성 지시사항]\n{current_feedback}"
             
-            content = self.ai.generate(write_p)
-            if not content or len(content) < 500: continue
-            
-            prompt_kwargs["content"] = content
-            review_p = safe_format_prompt(novel.prompts.review_prompt, prompt_kwargs)
-            
-            try:
-                review_data = json.loads(self.ai.generate_json(review_p))
-                score = int(review_data.get("score", 0))
-                current_feedback = review_data.get("feedback", "피드백 없음")
-            except Exception:
-                review_data, score, current_feedback = {}, 0, "평가 파싱 오류"
-
-            # 로그 DB 저장 (모든 시도는 기록에 남김)
-            self.db.add(GenerationLog(
-                novel_id=self.novel_id, chapter_num=current_chapter_num,
-                attempt_num=attempt, content=content, score=score,
-                feedback=current_feedback, raw_review=review_data,
-                is_selected=1 if score >= min_score else 0
-            ))
-            self.db.commit()
-
-            print(f"   🧐 [시도 {attempt}] 점수: {score}점 {'✅' if score >= min_score else '❌'}")
-
-            # 목표 점수 달성 시 즉시 반환
-            if score >= min_score:
-                return content, score, current_feedback
-            
-            # 기준은 못 넘었지만 이전보다 점수가 높으면 일단 '임시 베스트'로 간주
-            if score > best_score:
-                best_score, best_content, best_feedback = score, content, current_feedback
+            # 1. 같은 집필 프롬프트로 후보 N개를 동시에 작성 → 동시에 평가
+            with track_llm_usage() as round_calls:
+                candidates = await asyncio.gather(*[
+                    self._write_and_review(review_template, write_p, round_num, candidate, write_context, review_context,
+                                           screen_rules, draft_index, draft_config)
+                    for candidate in range(parallel_candidates)
+                ])
+            state.add_tokens(round_calls)
+
+            # 2. 모든 후보는 기록에 남김 (분량 미달로 평가조차 못 받은 원고는 제외)
+            round_best, records, duplicates = None, [], 0
+            for content, score, feedback, review_data, calls, sketch in candidates:
+                if not content:
+                    continue
+                attempt += 1
+                for call in calls:
+                    call.attempt_num = attempt
+                if sketch is not None:
+                    # 같은 라운드 후보끼리는 동시에 집필되어 평가 전에 비교할 수 없음 → 이미 넣은 형제 후보와 겹치면 온도 조절에만 반영
+                    duplicates += draft_index.nearest(sketch) is not None
+                    draft_index.add(sketch, {"attempt": attempt, "score": score, "feedback": feedback, "review": review_data})
+                duplicates += "duplicate_of" in review_data
+                records.append({
+                    "novel_id": self.novel_id, "chapter_num": current_chapter_num,
+                    "attempt_num": attempt, "content": content, "score": score,
+                    "feedback": feedback, "raw_review": review_data,
+                    "is_selected": 1 if score >= min_score else 0,
+                    **aggregate_calls(calls)
+                })
+                logger.info(f"🧐 [시도 {attempt}] 소설 {self.novel_id} 점수: {score}점 {'✅' if score >= min_score else '❌'}")
+                await self._emit("review", round=round_num, attempt=attempt, score=score, feedback=feedback, passed=score >= min_score)
+                if round_best is None or score > round_best[1]:
+                    round_best = (content, score, feedback)
+
+            if duplicates and temperature_step:
+                temperature = min(MAX_DRAFT_TEMPERATURE, (draft_config or self.ai.generation_config)["temperature"] + temperature_step)
+                draft_config = {"temperature": round(temperature, 2)}
+                logger.info(f"🌡️ 소설 {self.novel_id} 거의 같은 원고 {duplicates}개 → 다음 라운드 집필 온도 {draft_config['temperature']}")
+
+            # 3. 라운드 최고 후보의 피드백만 다음 라운드로 전달
+            state.record_round(round_num, round_best[1] if round_best else None)
+            accepted = None
+            if round_best is not None:
+                content, score, current_feedback = round_best
+                if score >= min_score:
+                    # 목표 점수 달성 시 즉시 채택
+                    accepted = (content, score, current_feedback)
+                    decision = StopDecision("min_score", f"{score}점 ≥ 목표 {min_score}점")
+                elif score > best_score:
+                    # 기준은 못 넘었지만 이전보다 점수가 높으면 일단 '임시 베스트'로 간주
+                    best_score, best_content, best_feedback = score, content, current_feedback
+
+            # 4. 중단 정책 검사 → 목표 미달로 멈추면 fallback_score 이상인 최고 원고는 채택
+            if accepted is None:
+                decision = should_stop(policies, state)
+                if decision and fallback_score is not None and best_content and best_score >= fallback_score:
+                    accepted = (best_content, best_score, best_feedback)
+                    decision = StopDecision("fallback", f"{decision.reason} → 최고 {best_score}점 ≥ 대체 기준 {fallback_score}점으로 채택")
+
+            # 멈춘 이유는 이번 라운드 마지막 시도 기록에 함께 저장
+            if decision and records:
+                records[-1].update(stop_policy=decision.policy, stop_reason=decision.reason)
+            # 시도 기록은 write-behind 저장소로 (모아서 bulk INSERT, DB 저장을 기다리지 않음)
+            # 스풀 추가 + fsync는 디스크를 기다리므로 이벤트 루프 밖에서 (SSE 토큰 전송이 멈추지 않도록)
+            await asyncio.to_thread(get_log_sink().add_many, records)
+
+            if decision:
+                if decision.policy != "min_score":
+                    logger.info(f"🛑 [중단: {decision.policy}] 소설 {self.novel_id}: {decision.reason}")
+                await self._emit("stopped", round=round_num, policy=decision.policy, reason=decision.reason, accepted=accepted is not None)
+                # 채택할 원고가 없으면 위쪽 _run_locked에서 걸러낼 수 있도록 '빈 값'을 섞어서 반환
+                return accepted or ("", best_score, best_feedback)
+
+    async def _write_and_review(self, review_template: PromptTemplate, write_p: str, round_num: int = 1, candidate: int = 0,
+                                write_context: Optional[ContextCache] = None, review_context: Optional[ContextCache] = None,
+                                screen_rules: Optional[ScreenRules] = None, draft_index: Optional[DraftIndex] = None,
+                                draft_config: Optional[Dict[str, Any]] = None) -> Tuple[str, int, str, Dict[str, Any], List[LLMCallUsage], Optional[DraftSketch]]:
+        """
+        원고 1개 집필 + 평가. 분량 미달이면 빈 원고를 반환합니다. (LLM 호출 기록, 색인에 넣을 원고 스케치도 함께)
+        이전 시도와 거의 같은 원고면 그 평가를 재사용하고, 사전 검사에서 명백한 형식 위반으로 반려되면
+        평가를 호출하지 않고 0점 + 자동 재작성 지시를 반환합니다.
+        """
+        with track_llm_usage() as calls:
+            # 집필은 후보마다 다른 원고가 나와야 하므로 캐시를 쓰지 않음
+            await self._emit("draft_start", round=round_num, candidate=candidate)
+            with span("draft", novel_id=self.novel_id, round=round_num, candidate=candidate), track_llm_usage("draft"):
+                content = await self._generate_text(write_p, "draft", context=write_context, generation_config=draft_config,
+                                                    round=round_num, candidate=candidate)
+            if not content or len(content) < 500:
+                return "", 0, "", {}, calls, None
 
-        # 루프가 끝날 때까지 min_score를 못 넘었다면, 
-        # 위쪽 run_daily_routine에서 걸러낼 수 있도록 '빈 값'을 섞어서 반환
-        return "", best_score, best_feedback
+            sketch = draft_index.sketch(content) if draft_index is not None else None
+            duplicate = self._reuse_review(draft_index, sketch) if sketch is not None else None
+            if duplicate:
+                score, feedback, review_data = duplicate
+                await self._emit("duplicate", round=round_num, candidate=candidate, **review_data["duplicate_of"])
+                return content, score, feedback, review_data, calls, None
+
+            # 평가 템플릿은 content 자리만 남겨 둔 상태 (나머지는 라운드 시작 전에 채움)
+            screen = screen_draft(content, screen_rules or ScreenRules())
+            if not screen.passed and (screen_rules is None or screen_rules.enforce):
+                DRAFT_PRESCREEN_TOTAL.labels(result="rejected").inc()
+                await self._emit("prescreen_rejected", round=round_num, candidate=candidate, violations=screen.violations)
+                return content, 0, screen.feedback, {"prescreen": screen.to_dict()}, calls, sketch
+            DRAFT_PRESCREEN_TOTAL.labels(result="passed" if screen.passed else "flagged").inc()
+
+            review_p = review_template.render({"content": content})
+
+            with span("review", novel_id=self.novel_id, round=round_num, candidate=candidate), track_llm_usage("review"):
+                # 응답 스키마로 요청하고 깨진 JSON은 로컬에서 복구 (다시 호출하지 않음)
+                review, _ = await self.ai.agenerate_structured(review_p, ReviewOutput, use_cache=True, context=review_context)
+                if review is None:
+                    review_data, score, feedback = {}, 0, "평가 파싱 오류"
+                else:
+                    review_data, score, feedback = review.model_dump(exclude_none=True), review.score, review.feedback
+            review_data["prescreen"] = screen.to_dict()
+
+        return content, score, feedback, review_data, calls, sketch
+
+    def _draft_index(self, config_dict: Dict[str, Any]) -> Optional[DraftIndex]:
+        """이번 회차 유사 원고 색인 (dedup_past_chapters > 0이면 최근 회차 본문도 미리 넣음)"""
+        if not config_dict.get("dedup", True):
+            return None
+        index: DraftIndex = DraftIndex(threshold=config_dict.get("dedup_threshold", 0.9))
+        for chapter_num, content in self._load_recent_chapters(config_dict.get("dedup_past_chapters") or 0):
+            index.add(index.sketch(content), {"chapter_num": chapter_num})
+        return index
+
+    def _reuse_review(self, draft_index: DraftIndex, sketch: DraftSketch) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """
+        가장 비슷한 항목이 기준 이상이면 (점수, 피드백, raw_review)
+        - 이전 시도: 그 평가를 그대로 재사용 (평가 호출 생략)
+        - 최근 회차: 이미 쓴 장면의 반복이므로 0점 + 재작성 지시
+        """
+        match = draft_index.nearest(sketch)
+        if match is None:
+            return None
+        similarity, ref = match
+        if "chapter_num" in ref:
+            DRAFT_DUPLICATES_TOTAL.labels(source="chapter").inc()
+            feedback = (f"[중복 반려] 제 {ref['chapter_num']}화 본문과 {similarity:.0%} 겹칩니다. "
+                        "이미 쓴 장면을 되풀이하지 말고 이번 화 플롯의 새 사건으로 다시 쓰세요.")
+            return 0, feedback, {"duplicate_of": {"chapter_num": ref["chapter_num"], "similarity": round(similarity, 3)}}
+        DRAFT_DUPLICATES_TOTAL.labels(source="attempt").inc()
+        return ref["score"], ref["feedback"], {**ref["review"], "duplicate_of": {"attempt": ref["attempt"], "similarity": round(similarity, 3)}}
 
     # ----------------------------------------------------------------
-    # (나머지 헬퍼 함수들 _get_next_chapter_num, _save_chapter 등은 동일)
+    # 📡 진행 이벤트 / 스트리밍 헬퍼
     # ----------------------------------------------------------------
-    def _get_next_chapter_num(self) -> int:
-        last_chapter = self.db.query(Chapter).filter(Chapter.novel_id == self.novel_id).order_by(Chapter.chapter_num.desc()).first()
-        return int(getattr(last_chapter, "chapter_num")) + 1 if last_chapter else 1
-
-    def _build_context_kwargs(self, novel: Novel, current_chapter_num: int) -> Dict[str, Any]:
-        chapters = self.db.query(Chapter).filter(Chapter.novel_id == self.novel_id).order_by(Chapter.chapter_num.desc()).limit(10).all()
-        recent_context = "".join([f"\n[Chapter {c.chapter_num}]\n{c.content}\n" for c in reversed(chapters)])
-        rules_dict = novel.rules if isinstance(novel.rules, dict) else {}
+    async def _emit(self, event: str, **data):
+        if self.on_event:
+            await self.on_event(event, data)
+
+    async def _generate_text(self, prompt: str, event: str, use_cache: bool = False, context: Optional[ContextCache] = None,
+                             generation_config: Optional[Dict[str, Any]] = None, **meta) -> str:
+        """이벤트 수신자가 있으면 토큰 단위로 흘려보내며 생성하고, 없으면 한 번에 생성"""
+        if not self.on_event:
+            text = await self.ai.agenerate(prompt, use_cache=use_cache, context=context, generation_config=generation_config)
+        else:
+            chunks = []
+            async for delta in self.ai.astream(prompt, use_cache=use_cache, context=context, generation_config=generation_config):
+                chunks.append(delta)
+                await self._emit(event, delta=delta, **meta)
+            text = "".join(chunks)
+        return text
+
+    # ----------------------------------------------------------------
+    # 🗄️ 짧은 트랜잭션 단위의 DB 접근 (LLM 호출 중에는 커넥션을 쥐지 않음)
+    #   모두 동기 세션이므로 asyncio.to_thread로 불러 이벤트 루프를 막지 않습니다.
+    #   (SSE 스트리밍은 API 서버 루프에서 집필하므로 여기서 막히면 다른 요청도 모두 멈춤)
+    # ----------------------------------------------------------------
+    @contextmanager
+    def _unit_of_work(self, name: str) -> Iterator[Session]:
+        """블록이 끝나면 커밋(에러 시 롤백)하고 커넥션을 바로 풀에 반납 (커밋까지의 시간은 db_<name> 단계로 측정)"""
+        with span(f"db_{name}", novel_id=self.novel_id), self.session_factory() as db, db.begin():
+            yield db
+
+    def _load_snapshot(self) -> Optional[Tuple[NovelSnapshot, int, Dict[str, Any]]]:
+        """소설/프롬프트, 다음 회차 번호, 프롬프트 치환값을 한 번에 읽어 둡니다."""
+        with self._unit_of_work("load") as db:
+            row = (
+                db.query(
+                    Novel.title, Novel.story_summary, Novel.world_setting, Novel.rules,
+                    PromptSetting.plot_prompt, PromptSetting.writing_prompt,
+                    PromptSetting.review_prompt, PromptSetting.summary_prompt,
+                    PromptSetting.id.label("prompt_id"), PromptSetting.version.label("prompt_version"),
+                )
+                .join(PromptSetting, PromptSetting.novel_id == Novel.id)
+                .filter(Novel.id == self.novel_id)
+                .first()
+            )
+            if not row:
+                return None
+
+            novel = NovelSnapshot(
+                title=row.title, story_summary=row.story_summary, world_setting=row.world_setting,
+                rules=row.rules if isinstance(row.rules, dict) else {},
+                plot_prompt=row.plot_prompt, writing_prompt=row.writing_prompt,
+                review_prompt=row.review_prompt, summary_prompt=row.summary_prompt,
+                prompt_id=row.prompt_id, prompt_version=row.prompt_version,
+            )
+            current_chapter_num = self._get_next_chapter_num(db)
+            # 토큰 예산 안에서 최근 화는 원문, 이전 화는 요약으로 채운 맥락 (소설별 캐시 + 증분 갱신)
+            with span("context", novel_id=self.novel_id, chapter_num=current_chapter_num):
+                recent_context = get_context_assembler().build(db, self.novel_id)
+                prompt_kwargs = self._build_context_kwargs(novel, current_chapter_num, recent_context)
+
+        return novel, current_chapter_num, prompt_kwargs
+
+    def _load_recent_chapters(self, limit: int) -> List[Tuple[int, str]]:
+        """유사 원고 비교용 최근 회차 본문 (최신순)"""
+        if limit <= 0:
+            return []
+        with self._unit_of_work("dedup") as db:
+            rows = (
+                db.query(Chapter.chapter_num, Chapter.content)
+                .filter(Chapter.novel_id == self.novel_id)
+                .order_by(Chapter.chapter_num.desc())
+                .limit(limit)
+                .all()
+            )
+        return [(row.chapter_num, row.content) for row in rows if row.content]
+
+    def _save_results(self, chapter_num: int, content: str, score: int, feedback: str, chapter_summary: Optional[str], novel_updates: Dict[str, Any]):
+        """회차 저장 + 소설 줄거리/세계관 갱신 (한 트랜잭션)"""
+        with self._unit_of_work("save") as db:
+            chapter = Chapter(
+                novel_id=self.novel_id, chapter_num=chapter_num, content=content,
+                score=score, feedback=feedback, summary=chapter_summary
+            )
+            db.add(chapter)
+            novel = db.get(Novel, self.novel_id)
+            for key, value in novel_updates.items():
+                setattr(novel, key, value)
+            db.flush()
+            docs = [chapter_document(chapter), novel_document(novel)]
+        index_safely(docs)
+
+    def _save_usage(self, calls: List[LLMCallUsage]):
+        """이번 작업의 LLM 호출 기록 저장 (bulk INSERT 1번). 실패해도 집필 결과에는 영향 없음"""
+        if not calls or not self.chapter_num:
+            return
+        try:
+            with self._unit_of_work("usage") as db:
+                db.execute(insert(LLMCall), [{
+                    "novel_id": self.novel_id, "chapter_num": self.chapter_num, "attempt_num": c.attempt_num,
+                    "stage": c.stage, "model": c.model, "prompt_tokens": c.prompt_tokens,
+                    "output_tokens": c.output_tokens, "latency_ms": c.latency_ms,
+                    "retries": c.retries, "cached": 1 if c.cached else 0, "cached_tokens": c.cached_tokens,
+                } for c in calls])
+        except Exception as e:
+            logger.warning(f"⚠️ LLM 사용량 기록 저장 실패 (소설 {self.novel_id}, {self.chapter_num}화): {e}")
+
+    def _get_next_chapter_num(self, db: Session) -> int:
+        # (novel_id, chapter_num) 인덱스만으로 끝나도록 본문 없이 MAX만 조회
+        last_num = db.query(func.max(Chapter.chapter_num)).filter(Chapter.novel_id == self.novel_id).scalar()
+        return int(last_num) + 1 if last_num else 1
+
+    def _build_context_kwargs(self, novel: NovelSnapshot, current_chapter_num: int, recent_context: str) -> Dict[str, Any]:
         return {
             "chapter_num": current_chapter_num, "title": novel.title,
             "summary": novel.story_summary or "이야기의 시작",
             "world": json.dumps(novel.world_setting, ensure_ascii=False),
-            "rules_json": json.dumps(rules_dict, ensure_ascii=False),
-            "context": recent_context, **rules_dict
+            "rules_json": json.dumps(novel.rules, ensure_ascii=False),
+            "context": recent_context, **novel.rules
         }
 
-    def _save_chapter(self, chapter_num: int, content: str, score: int, feedback: str):
-        self.db.add(Chapter(novel_id=self.novel_id, chapter_num=chapter_num, content=content, score=score, feedback=feedback))
+    def _context_prefix(self, prompt_kwargs: Dict[str, Any]) -> str:
+        """컨텍스트 캐시에 올릴 고정 앞부분 (프롬프트 맨 앞에 오도록 배치)"""
+        return (
+            f"[공통 자료] 「{prompt_kwargs['title']}」 제 {prompt_kwargs['chapter_num']}화 집필용 - 이번 화 동안 바뀌지 않는 자료입니다.\n\n"
+            f"■ 세계관\n{prompt_kwargs['world']}\n\n"
+            f"■ 설정/규칙\n{prompt_kwargs['rules_json']}\n\n"
+            f"■ 최근 맥락\n{prompt_kwargs['context']}"
+        )
 
-    def _update_novel_settings(self, novel: Novel, prompt_kwargs: Dict[str, Any], best_content: str):
+    def _layout(self, template: PromptTemplate, prompt_kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[ContextCache]]:
+        """
+        (렌더링할 치환값, 넘길 컨텍스트 캐시)
+        템플릿이 큰 고정 블록을 쓰고 캐시가 있으면 그 자리는 참조 문구로 바꾸고 본문은 캐시 뒤에 이어 붙임
+        """
+        if self.context_cache is None or not template.placeholders & CONTEXT_CACHE_REFERENCES.keys():
+            return prompt_kwargs, None
+        return {**prompt_kwargs, **CONTEXT_CACHE_REFERENCES}, self.context_cache
+
+    async def _update_novel_settings(self, novel: NovelSnapshot, prompt_kwargs: Dict[str, Any], best_content: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        전체 줄거리/세계관 갱신값을 만듭니다 (DB 반영은 _save_results에서).
+        (소설 갱신값, 이번 화 요약) - 요약은 회차별 요약으로도 저장합니다.
+        """
         prompt_kwargs["content"] = best_content 
-        summary_p = safe_format_prompt(novel.prompts.summary_prompt, prompt_kwargs)
-        try:
-            summary_data = json.loads(self.ai.generate_json(summary_p))
-            novel.story_summary = summary_data.get("summary", novel.story_summary) # type: ignore
-            novel.world_setting = summary_data.get("updated_settings", novel.world_setting) # type: ignore
-        except Exception:
-            fallback_text = self.ai.generate(summary_p)
-            if fallback_text: novel.story_summary = fallback_text[:1000] # type: ignore
\ No newline at end of file
+        summary_template = novel.template("summary_prompt")
+        summary_kwargs, summary_context = self._layout(summary_template, prompt_kwargs)
+        summary_p = summary_template.render(summary_kwargs)
+        with span("summary", novel_id=self.novel_id), track_llm_usage("summary"):
+            summary, raw_text = await self.ai.agenerate_structured(summary_p, NovelSummaryOutput, use_cache=True, context=summary_context)
+        if summary is not None:
+            return {
+                "story_summary": summary.summary or novel.story_summary,
+                "world_setting": summary.updated_settings if summary.updated_settings is not None else novel.world_setting,
+            }, summary.summary or None
+        # 복구도 안 되면 응답 원문을 요약으로 사용 (같은 프롬프트로 다시 호출하지 않음)
+        if not raw_text:
+            return {}, None
+        return {"story_summary": raw_text[:1000]}, raw_text[:1000]
@@ -0,0 +1,161 @@
+"""
+생성 기록 보존 정책 (회차별 정리)
+
+    python -m modules.log_retention                 # 모든 회차 정리
+    python -m modules.log_retention --novel-id 3    # 특정 소설만
+
+회차마다 채택 원고(없으면 최고점 원고)와 점수 상위 K개 탈락 원고만 전문으로 남기고,
+나머지는 채택 원고 대비 줄 단위 차이(diff)만 남기거나 본문을 지우고 점수/피드백만 남깁니다.
+"""
+import argparse
+import difflib
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from core.config import settings
+from core.logger import logger
+from database import BackgroundSessionLocal
+from models.generation_log import GenerationLog
+from modules.search_index import document_for, index_safely
+
+# 관계 설정(문자열 참조)이 풀리도록 모델 모듈을 미리 불러옵니다.
+from models import novel, prompt, chapter, generation_log, generation_job  # noqa: F401
+
+# diff가 원문의 이 비율보다 크면 차이를 보관할 이득이 없으므로 본문을 지움
+MAX_DIFF_RATIO = 0.5
+
+# ----------------------------------------------------------------
+# ✂️ 줄 단위 차이 (기준 원고의 줄 범위 [i, j] 복사 / 문자열은 새로 추가된 줄)
+# ----------------------------------------------------------------
+def make_delta(base: str, target: str) -> str:
+    a, b = base.splitlines(keepends=True), target.splitlines(keepends=True)
+    ops: List[Union[List[int], str]] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False)
+
+def apply_delta(base: str, delta: str) -> str:
+    a = base.splitlines(keepends=True)
+    return "".join("".join(a[op[0]:op[1]]) if isinstance(op, list) else op for op in json.loads(delta))
+
+def restore_content(log: Any, base_content: Optional[str]) -> Optional[str]:
+    """storage에 맞춰 원문 복원 (pruned면 None)"""
+    if log.storage == "diff":
+        return apply_delta(base_content, log.content) if base_content is not None and log.content is not None else None
+    if log.storage == "pruned":
+        return None
+    return log.content
+
+# ----------------------------------------------------------------
+# 🗄️ 보존 정책 적용
+# ----------------------------------------------------------------
+class LogRetention:
+    def __init__(self, db: Session, top_k: Optional[int] = None, mode: Optional[str] = None):
+        self.db = db
+        self.top_k = settings.storage.LOG_RETENTION_TOP_K if top_k is None else top_k
+        self.mode = mode or settings.storage.LOG_RETENTION_MODE
+
+    def compact_chapter(self, novel_id: int, chapter_num: int) -> Dict[str, int]:
+        """회차 1개 정리 (커밋은 호출한 쪽에서). 새로 diff/삭제된 건수 반환"""
+        stats = {"diff": 0, "pruned": 0}
+        if self.top_k < 0:
+            return stats
+
+        rows = self.db.execute(
+            select(GenerationLog.id, GenerationLog.score, GenerationLog.is_selected, GenerationLog.storage, GenerationLog.diff_base_id)
+            .where(GenerationLog.novel_id == novel_id, GenerationLog.chapter_num == chapter_num)
+        ).all()
+        full = [r for r in rows if r.storage == "full"]
+        if not full:
+            return stats
+
+        # 1. 전문 보관 대상: 기준 원고(채택 > 최고점), 채택 원고 전부, 다른 행의 diff 기준 원고, 점수 상위 K개 탈락 원고
+        base = min(full, key=lambda r: (-(r.is_selected or 0), -(r.score or 0), r.id))
+        referenced = {r.diff_base_id for r in rows if r.diff_base_id}
+        rejected = sorted((r for r in full if not r.is_selected and r.id != base.id), key=lambda r: (-(r.score or 0), r.id))
+        keep = {base.id, *referenced, *(r.id for r in full if r.is_selected), *(r.id for r in rejected[:self.top_k])}
+        targets = [r.id for r in full if r.id not in keep]
+        if not targets:
+            return stats
+
+        # 2. 나머지는 diff 또는 본문 삭제 (본문은 회차당 한 번만 읽음)
+        base_content = self.db.scalar(select(GenerationLog.content).where(GenerationLog.id == base.id)) or ""
+        contents = dict(self.db.execute(
+            select(GenerationLog.id, GenerationLog.content).where(GenerationLog.id.in_(targets))
+        ).all())
+        updates = []
+        for log_id in targets:
+            content = contents.get(log_id) or ""
+            delta = make_delta(base_content, content) if self.mode == "diff" and content else None
+            if delta is not None and len(delta) < len(content) * MAX_DIFF_RATIO:
+                updates.append({"id": log_id, "storage": "diff", "diff_base_id": base.id, "content": delta})
+                stats["diff"] += 1
+            else:
+                updates.append({"id": log_id, "storage": "pruned", "diff_base_id": None, "content": None})
+                stats["pruned"] += 1
+
+        self.db.execute(update(GenerationLog), updates)
+        return stats
+
+    def compact_all(self, novel_id: Optional[int] = None, batch_size: int = 200) -> Dict[str, int]:
+        """전체(또는 소설 1개) 회차를 batch_size개씩 정리하며 배치마다 커밋"""
+        totals = {"chapters": 0, "diff": 0, "pruned": 0}
+        last: Tuple[int, int] = (0, 0)
+        while True:
+            query = (
+                select(GenerationLog.novel_id, GenerationLog.chapter_num)
+                .where((GenerationLog.novel_id > last[0]) | ((GenerationLog.novel_id == last[0]) & (GenerationLog.chapter_num > last[1])))
+                .group_by(GenerationLog.novel_id, GenerationLog.chapter_num)
+                .order_by(GenerationLog.novel_id, GenerationLog.chapter_num)
+                .limit(batch_size)
+            )
+            if novel_id is not None:
+                query = query.where(GenerationLog.novel_id == novel_id)
+            chapters = self.db.execute(query).all()
+            if not chapters:
+                break
+
+            for n_id, c_num in chapters:
+                stats = self.compact_chapter(n_id, c_num)
+                totals["diff"] += stats["diff"]
+                totals["pruned"] += stats["pruned"]
+            self.db.commit()
+            totals["chapters"] += len(chapters)
+            last = tuple(chapters[-1])
+        return totals
+
+
+def compact_chapter_safely(novel_id: int, chapter_num: int):
+    """집필 작업 종료 시 호출. 정리 실패가 집필 결과에 영향을 주지 않도록 로그만 남깁니다."""
+    try:
+        with BackgroundSessionLocal() as db, db.begin():
+            stats = LogRetention(db).compact_chapter(novel_id, chapter_num)
+            changed = db.execute(
+                select(GenerationLog.id, GenerationLog.novel_id, GenerationLog.chapter_num, GenerationLog.attempt_num, GenerationLog.feedback)
+                .where(GenerationLog.novel_id == novel_id, GenerationLog.chapter_num == chapter_num, GenerationLog.storage != "full")
+            ).all() if stats["diff"] or stats["pruned"] else []
+        # 정리된 원고는 검색 색인에서도 피드백만 남김
+        index_safely(document_for("log", (r.id, r.novel_id, r.chapter_num, r.attempt_num, None, r.feedback)) for r in changed)
+    except Exception as e:
+        logger.warning(f"⚠️ 생성 기록 정리 실패 (소설 {novel_id}, {chapter_num}화): {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성 기록 보존 정책 적용")
+    parser.add_argument("--novel-id", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=None, help="회차별 전문 보관할 탈락 원고 수")
+    parser.add_argument("--mode", choices=["diff", "score"], default=None)
+    parser.add_argument("--batch-size", type=int, default=200, help="커밋 단위 회차 수")
+    args = parser.parse_args()
+
+    with BackgroundSessionLocal() as db:
+        totals = LogRetention(db, top_k=args.top_k, mode=args.mode).compact_all(args.novel_id, args.batch_size)
+    logger.info(f"🗄️ 정리 완료: 회차 {totals['chapters']}개, diff {totals['diff']}건, 본문 삭제 {totals['pruned']}건")
+
+if __name__ == "__main__":
+    main()
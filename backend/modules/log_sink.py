@@ -0,0 +1,265 @@
+import atexit
+import glob
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from core.config import settings
+from core.logger import logger
+from core.metrics import span
+from database import BackgroundSessionLocal
+from models.generation_log import GenerationLog
+from modules.search_index import document_for, index_safely
+
+# bulk INSERT는 모든 행의 키가 같아야 하므로 기록을 이 컬럼 목록으로 맞춤 (이전 버전 스풀의 빠진 키는 NULL)
+# created_at은 넣지 않고 DB 기본값(func.now())에 맡김: 직접 만든 시각과 섞이면 (created_at, id) 커서 순서가 어긋남
+LOG_COLUMNS = (
+    "novel_id", "chapter_num", "attempt_num", "content", "score", "feedback", "raw_review",
+    "is_selected", "stop_policy", "stop_reason",
+    "model", "prompt_tokens", "output_tokens", "latency_ms", "retries", "spool_id",
+)
+
+# ----------------------------------------------------------------
+# 🧾 생성 기록 write-behind 저장소
+#   add()는 로컬 스풀 파일에 한 줄 추가 + 메모리 버퍼에 쌓기만 하고 바로 돌아옵니다.
+#   백그라운드 스레드가 건수/시간 기준으로 모아서 한 번의 bulk INSERT로 저장하고,
+#   저장이 끝난 기록만 스풀에서 지웁니다. (프로세스가 죽어도 스풀에 남은 기록은 다음 기동 때 복구)
+# ----------------------------------------------------------------
+class GenerationLogSink:
+    def __init__(self, spool_dir: str, batch_size: int, flush_interval: float, fsync: bool = True, session_factory=BackgroundSessionLocal):
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.session_factory = session_factory
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()        # 버퍼 + 스풀 파일 보호
+        self._flush_lock = threading.Lock()  # 저장은 한 번에 하나씩 (기록 순서 유지)
+        self._wake = threading.Event()
+        self._closed = False
+
+        os.makedirs(spool_dir, exist_ok=True)
+        self.spool_path = os.path.join(spool_dir, f"{os.getpid()}__{socket.gethostname()}.jsonl")
+
+        # 이전에 죽은 프로세스(같은 호스트)의 스풀을 먼저 넘겨받은 뒤 내 스풀을 엶
+        recovered, claimed_paths = self._claim_orphan_spools()
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+        if recovered:
+            with self._lock:
+                self._append_to_spool(recovered)
+                self._buffer.extend(recovered)
+            logger.info(f"♻️ 이전 프로세스가 남긴 생성 기록 {len(recovered)}건을 복구 대기열에 올렸습니다.")
+
+        # 내 스풀에 옮겨 적은 뒤에야 원본 삭제 (그 사이에 죽어도 다음 프로세스가 다시 넘겨받음)
+        for path in claimed_paths:
+            os.remove(path)
+
+        self._thread = threading.Thread(target=self._run, name="generation-log-sink", daemon=True)
+        self._thread.start()
+
+    # ---------------------------------------------------------
+    # 📥 기록 추가 (DB를 기다리지 않음)
+    # ---------------------------------------------------------
+    def add(self, novel_id: int, chapter_num: int, attempt_num: int, content: str, score: int,
+            feedback: Optional[str], raw_review: Optional[Dict[str, Any]], is_selected: bool) -> None:
+        self.add_many([{
+            "novel_id": novel_id, "chapter_num": chapter_num, "attempt_num": attempt_num,
+            "content": content, "score": score, "feedback": feedback, "raw_review": raw_review,
+            "is_selected": 1 if is_selected else 0,
+        }])
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """스풀 추가 + fsync까지 끝나야 돌아오므로 이벤트 루프에서는 asyncio.to_thread로 부르세요."""
+        # 기록마다 고유값을 붙여 둠 (스풀 복구 시 이미 저장된 기록인지 판별)
+        records = [{**r, "spool_id": r.get("spool_id") or uuid.uuid4().hex} for r in records]
+        if not records:
+            return
+        with self._lock:
+            self._append_to_spool(records)
+            self._buffer.extend(records)
+            size = len(self._buffer)
+        if size >= self.batch_size:
+            self._wake.set()
+
+    # ---------------------------------------------------------
+    # 💾 저장
+    # ---------------------------------------------------------
+    def flush(self) -> bool:
+        """
+        버퍼에 쌓인 기록을 모두 저장합니다. (작업 종료/실패 시 호출)
+        실패하면 기록은 버퍼와 스풀에 그대로 남고 다음 주기에 다시 시도합니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return True
+
+            try:
+                with span("db_log_flush", records=len(batch)):
+                    docs = self._insert(batch)
+            except Exception as e:
+                with self._lock:
+                    self._buffer = batch + self._buffer
+                logger.warning(f"⚠️ 생성 기록 {len(batch)}건 저장 실패 (스풀에 보관 후 재시도): {e}")
+                return False
+
+            # 저장된 기록은 스풀에서 제거 (저장 중에 새로 들어온 기록만 남김)
+            with self._lock:
+                self._rewrite_spool(self._buffer)
+        index_safely(docs)
+        return True
+
+    def close(self):
+        """남은 기록을 저장하고 스레드 종료 (다 못 쓰면 스풀에 남아 다음 기동 때 복구)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        with self._lock:
+            self._spool.close()
+            if not self._buffer and os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    # ---------------------------------------------------------
+    # 🛠️ 내부 로직
+    # ---------------------------------------------------------
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ 생성 기록 저장 스레드 오류: {e}")
+
+    def _insert(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """bulk INSERT 1번 (+ 복구분은 이미 저장된 건 제외). 색인할 문서 목록 반환"""
+        with self.session_factory() as db, db.begin():
+            rows = []
+            for record in batch:
+                row = {col: record.get(col) for col in LOG_COLUMNS}
+                if record.get("recovered") and self._already_saved(db, row, record.get("created_at")):
+                    continue
+                rows.append(row)
+            if not rows:
+                return []
+
+            if db.get_bind().dialect.insert_executemany_returning:
+                ids = db.scalars(insert(GenerationLog).returning(GenerationLog.id, sort_by_parameter_order=True), rows).all()
+                return [
+                    document_for("log", (log_id, row["novel_id"], row["chapter_num"], row["attempt_num"], row["content"], row["feedback"]))
+                    for row, log_id in zip(rows, ids)
+                ]
+
+            # MySQL은 executemany에서 RETURNING이 없음 → FULLTEXT 인덱스가 INSERT와 함께 갱신되므로 별도 색인 불필요
+            db.execute(insert(GenerationLog), rows)
+            return []
+
+    @staticmethod
+    def _already_saved(db, row: Dict[str, Any], legacy_created_at: Optional[str] = None) -> bool:
+        """저장 직후 스풀을 지우기 전에 죽은 경우를 대비한 중복 확인"""
+        if row["spool_id"]:
+            return db.query(GenerationLog.id).filter(GenerationLog.spool_id == row["spool_id"]).first() is not None
+        if not legacy_created_at:
+            return False
+        # spool_id가 없는 이전 버전 스풀: 그때는 추가한 시각을 created_at으로 저장했음
+        return db.query(GenerationLog.id).filter(
+            GenerationLog.novel_id == row["novel_id"],
+            GenerationLog.chapter_num == row["chapter_num"],
+            GenerationLog.attempt_num == row["attempt_num"],
+            GenerationLog.created_at == datetime.fromisoformat(legacy_created_at),
+        ).first() is not None
+
+    def _append_to_spool(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._spool.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._spool.flush()
+        if self.fsync:
+            os.fsync(self._spool.fileno())
+
+    def _rewrite_spool(self, records: List[Dict[str, Any]]):
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._spool.close()
+        os.replace(tmp_path, self.spool_path)
+        self._spool = open(self.spool_path, "a", encoding="utf-8")
+
+    def _claim_orphan_spools(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """같은 호스트에서 이미 종료된 프로세스의 스풀 파일을 읽어 옵니다. (기록, 넘겨받은 파일 경로)"""
+        host = socket.gethostname()
+        recovered: List[Dict[str, Any]] = []
+        claimed_paths: List[str] = []
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "*.jsonl"))):
+            pid_text, _, rest = os.path.basename(path)[:-len(".jsonl")].partition("__")
+            if not pid_text.isdigit() or rest.split("__")[0] != host:
+                continue
+            pid = int(pid_text)
+            # 컨테이너 재시작으로 PID가 같아진 경우(예: PID 1)도 이전 실행의 파일이므로 넘겨받음
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+
+            # 다른 프로세스와 동시에 넘겨받지 않도록 내 이름으로 옮긴 뒤 읽음 (내가 죽으면 다음 프로세스가 다시 넘겨받음)
+            claimed = os.path.join(self.spool_dir, f"{os.getpid()}__{host}__claim{int(time.time() * 1000)}.jsonl")
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            with open(claimed, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        recovered.append({**json.loads(line), "recovered": True})
+                    except json.JSONDecodeError:
+                        continue  # 쓰다가 끊긴 마지막 줄
+            claimed_paths.append(claimed)
+        return recovered, claimed_paths
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_log_sink() -> GenerationLogSink:
+    """프로세스 전체에서 공유하는 생성 기록 저장소 (종료 시 남은 기록 자동 저장)"""
+    sink = GenerationLogSink(
+        spool_dir=settings.log_sink.LOG_SINK_SPOOL_DIR,
+        batch_size=settings.log_sink.LOG_SINK_BATCH_SIZE,
+        flush_interval=settings.log_sink.LOG_SINK_FLUSH_INTERVAL,
+        fsync=settings.log_sink.LOG_SINK_FSYNC,
+    )
+    atexit.register(sink.close)
+    return sink
+
+
+def close_log_sink():
+    """만들어진 적이 있을 때만 닫음 (서버/워커 종료 시)"""
+    if get_log_sink.cache_info().currsize:
+        get_log_sink().close()
@@ -0,0 +1,128 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# {이름} 형태만 치환 자리로 봅니다. 이름에는 한글/하이픈도 쓸 수 있고(rules 키 {주인공}, {writing-tone}),
+# 공백/따옴표/중괄호가 든 JSON 예시 { "score": 0 }, {"fun": 0} 같은 중괄호는 그대로 둠
+PLACEHOLDER_RE = re.compile(r'\{([^{}\s"]+)\}')
+
+# 집필기가 항상 채워 주는 치환값 (이 밖의 이름은 소설 rules의 키로만 채워짐)
+BUILTIN_PLACEHOLDERS = ("chapter_num", "title", "summary", "world", "rules_json", "context", "plot", "content")
+
+# 프롬프트 항목별로 빠지면 안 되는 치환 자리
+REQUIRED_PLACEHOLDERS: Dict[str, Tuple[str, ...]] = {
+    "plot_prompt": (),
+    "writing_prompt": ("plot",),
+    "review_prompt": ("content",),
+    "summary_prompt": ("content",),
+}
+
+# ----------------------------------------------------------------
+# 🧩 컴파일된 프롬프트 템플릿
+#   템플릿을 한 번만 [고정 문자열, 자리, 고정 문자열, 자리, ...]로 쪼개 두고
+#   렌더링은 조각을 한 번 이어 붙이는 것으로 끝냅니다. (치환값마다 전체 문자열을 replace하지 않음)
+#   값이 없는 자리는 {이름} 그대로 남깁니다.
+# ----------------------------------------------------------------
+@dataclass(frozen=True)
+class PromptTemplate:
+    literals: Tuple[str, ...]  # 자리 수 + 1개
+    names: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, template: str) -> "PromptTemplate":
+        literals, names, pos = [], [], 0
+        for match in PLACEHOLDER_RE.finditer(template):
+            literals.append(template[pos:match.start()])
+            names.append(match.group(1))
+            pos = match.end()
+        literals.append(template[pos:])
+        return cls(tuple(literals), tuple(names))
+
+    @property
+    def placeholders(self) -> frozenset:
+        return frozenset(self.names)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(str(values[name]) if name in values else f"{{{name}}}")
+            parts.append(literal)
+        return "".join(parts)
+
+    def partial(self, values: Mapping[str, Any], keep: Iterable[str] = ()) -> "PromptTemplate":
+        """keep에 든 자리만 남기고 나머지는 미리 채운 템플릿 (시도마다 바뀌는 값만 나중에 렌더링)"""
+        keep = set(keep)
+        literals, names, buf = [], [], [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            if name in keep or name not in values:
+                literals.append("".join(buf))
+                names.append(name)
+                buf = [literal]
+            else:
+                buf.extend((str(values[name]), literal))
+        literals.append("".join(buf))
+        return PromptTemplate(tuple(literals), tuple(names))
+
+# ----------------------------------------------------------------
+# 🗃️ 템플릿 캐시 (프롬프트 id + 버전 + 항목 단위)
+#   prompt_settings.version은 수정될 때마다 오르므로, 버전이 같으면 내용도 같다고 보고 다시 파싱하지 않음
+# ----------------------------------------------------------------
+class PromptTemplateCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int, str], PromptTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, prompt_id: Optional[int], version: Optional[int], field: str, template: str) -> PromptTemplate:
+        if prompt_id is None or version is None:
+            return PromptTemplate.compile(template)
+        key = (prompt_id, version, field)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+        compiled = PromptTemplate.compile(template)
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = PromptTemplateCache()
+
+
+def get_prompt_template(prompt_id: Optional[int], version: Optional[int], field: str, template: str) -> PromptTemplate:
+    return _cache.get(prompt_id, version, field, template)
+
+# ----------------------------------------------------------------
+# 🔎 저장 시점 검사 (모르는 자리 / 빠진 필수 자리)
+# ----------------------------------------------------------------
+def check_placeholders(field: str, template: str, rule_keys: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """모르는 자리는 집필 때 채워지지 않고 {이름} 그대로 프롬프트에 남습니다."""
+    found = PromptTemplate.compile(template).placeholders
+    known = set(BUILTIN_PLACEHOLDERS) | set(rule_keys)
+    return {
+        "unknown": sorted(found - known),
+        "missing": [name for name in REQUIRED_PLACEHOLDERS.get(field, ()) if name not in found],
+    }
+
+
+def check_prompt_settings(prompts: Mapping[str, Optional[str]], rule_keys: Iterable[str] = ()) -> Dict[str, Dict[str, List[str]]]:
+    """항목별 검사 결과 (문제가 있는 항목만)"""
+    rule_keys = list(rule_keys)
+    issues = {}
+    for field, template in prompts.items():
+        if template is None:
+            continue
+        result = check_placeholders(field, template, rule_keys)
+        if result["unknown"] or result["missing"]:
+            issues[field] = result
+    return issues
@@ -0,0 +1,267 @@
+import html
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import case, null, text
+from sqlalchemy.orm import Session
+from core.config import settings
+from core.logger import logger
+from database import engine
+from models.novel import Novel
+from models.chapter import Chapter
+from models.generation_log import GenerationLog
+
+DOC_TYPES = ("novel", "chapter", "log")
+SNIPPET_CHARS = 160
+
+# ----------------------------------------------------------------
+# 🛠️ 공통 헬퍼
+# ----------------------------------------------------------------
+def _terms(query: str) -> List[str]:
+    return [t for t in re.split(r"\s+", query.strip()) if t]
+
+def highlight(snippet: str, terms: Sequence[str]) -> str:
+    """발췌문을 HTML 이스케이프한 뒤 검색어를 <mark>로 감쌉니다."""
+    escaped = html.escape(snippet or "")
+    for term in sorted(set(terms), key=len, reverse=True):
+        escaped = re.sub(re.escape(html.escape(term)), lambda m: f"<mark>{m.group(0)}</mark>", escaped, flags=re.IGNORECASE)
+    return escaped
+
+
+class SearchBackend(ABC):
+    """검색 백엔드 공통 인터페이스 (search만 필수, 색인이 자동인 백엔드는 나머지를 그대로 둠)"""
+
+    def ensure_schema(self) -> None:
+        pass
+
+    def index_document(self, doc_type: str, doc_id: int, novel_id: int, title: str, body: str) -> None:
+        """문서 1건 추가/갱신 (저장 직후 호출)"""
+        pass
+
+    def index_documents(self, docs: Iterable[Dict[str, Any]]) -> None:
+        for doc in docs:
+            self.index_document(**doc)
+
+    def rebuild(self, db: Session, batch_size: int = 500) -> int:
+        """전체 재색인. 색인한 문서 수 반환"""
+        return 0
+
+    @abstractmethod
+    def search(self, db: Session, query: str, doc_types: Sequence[str], novel_id: Optional[int], limit: int, offset: int) -> List[Dict[str, Any]]:
+        """점수 내림차순 검색 결과 (doc_type, doc_id, novel_id, title, snippet, score)"""
+
+# ----------------------------------------------------------------
+# 🐬 MySQL FULLTEXT (ngram 파서: 띄어쓰기가 불규칙한 한국어도 부분 일치)
+#   색인은 MySQL이 INSERT/UPDATE 시 자동으로 갱신하므로 index_document는 할 일이 없습니다.
+# ----------------------------------------------------------------
+class MySQLFulltextBackend(SearchBackend):
+    INDEXES = {
+        "ft_novels_text": ("novels", "title, story_summary"),
+        "ft_chapters_text": ("chapters", "content, summary"),
+        # 생성 기록 본문은 압축 바이너리(BLOB)라 FULLTEXT 대상이 아님 → 피드백만 (본문 검색은 채택된 회차로)
+        "ft_generation_logs_feedback": ("generation_logs", "feedback"),
+    }
+
+    def ensure_schema(self) -> None:
+        with engine.begin() as conn:
+            existing = {
+                row[0] for row in conn.execute(text(
+                    "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_TYPE = 'FULLTEXT'"
+                ))
+            }
+            for index_name, (table, columns) in self.INDEXES.items():
+                if index_name not in existing:
+                    logger.info(f"🔎 FULLTEXT 인덱스 생성: {table}({columns})")
+                    conn.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({columns}) WITH PARSER ngram"))
+
+    def search(self, db: Session, query: str, doc_types: Sequence[str], novel_id: Optional[int], limit: int, offset: int) -> List[Dict[str, Any]]:
+        terms = _terms(query)
+        if not terms:
+            return []
+
+        # 발췌문은 SQL에서 첫 검색어 주변만 잘라오므로 본문 전체를 가져오지 않습니다.
+        def snippet_sql(col: str) -> str:
+            return f"SUBSTRING(COALESCE({col}, ''), GREATEST(LOCATE(:kw, COALESCE({col}, '')) - {SNIPPET_CHARS // 3}, 1), {SNIPPET_CHARS})"
+
+        novel_filter = {
+            "novel": " AND id = :novel_id",
+            "chapter": " AND novel_id = :novel_id",
+            "log": " AND novel_id = :novel_id",
+        } if novel_id is not None else {"novel": "", "chapter": "", "log": ""}
+
+        selects = {
+            "novel": (
+                f"SELECT 'novel' AS doc_type, id AS doc_id, id AS novel_id, title, {snippet_sql('story_summary')} AS snippet, "
+                "MATCH(title, story_summary) AGAINST(:q IN NATURAL LANGUAGE MODE) AS score FROM novels "
+                "WHERE MATCH(title, story_summary) AGAINST(:q IN NATURAL LANGUAGE MODE)" + novel_filter["novel"]
+            ),
+            "chapter": (
+                f"SELECT 'chapter' AS doc_type, id AS doc_id, novel_id, CONCAT('Chapter ', chapter_num) AS title, {snippet_sql('content')} AS snippet, "
+                "MATCH(content, summary) AGAINST(:q IN NATURAL LANGUAGE MODE) AS score FROM chapters "
+                "WHERE MATCH(content, summary) AGAINST(:q IN NATURAL LANGUAGE MODE)" + novel_filter["chapter"]
+            ),
+            "log": (
+                f"SELECT 'log' AS doc_type, id AS doc_id, novel_id, CONCAT('Chapter ', chapter_num, ' #', attempt_num) AS title, {snippet_sql('feedback')} AS snippet, "
+                "MATCH(feedback) AGAINST(:q IN NATURAL LANGUAGE MODE) AS score FROM generation_logs "
+                "WHERE MATCH(feedback) AGAINST(:q IN NATURAL LANGUAGE MODE)" + novel_filter["log"]
+            ),
+        }
+
+        sql = " UNION ALL ".join(f"({selects[t]})" for t in doc_types) + " ORDER BY score DESC LIMIT :limit OFFSET :offset"
+        rows = db.execute(text(sql), {"q": query, "kw": terms[0], "novel_id": novel_id, "limit": limit, "offset": offset}).mappings().all()
+        return [{**row, "score": float(row["score"]), "snippet": highlight(row["snippet"], terms)} for row in rows]
+
+# ----------------------------------------------------------------
+# 🪶 SQLite FTS5 보조 인덱스 (MySQL FULLTEXT를 쓸 수 없는 환경용)
+#   trigram 토크나이저로 한국어 부분 일치를 지원하며, 저장 시점마다 증분 갱신합니다.
+# ----------------------------------------------------------------
+class SQLiteFTSBackend(SearchBackend):
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_docs USING fts5("
+                " doc_type UNINDEXED, doc_id UNINDEXED, novel_id UNINDEXED, title, body,"
+                " tokenize = 'trigram')"
+            )
+            self._conn.commit()
+
+    def index_document(self, doc_type: str, doc_id: int, novel_id: int, title: str, body: str) -> None:
+        self.index_documents([{"doc_type": doc_type, "doc_id": doc_id, "novel_id": novel_id, "title": title, "body": body}])
+
+    def index_documents(self, docs: Iterable[Dict[str, Any]]) -> None:
+        docs = list(docs)
+        if not docs:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM search_docs WHERE doc_type = ? AND doc_id = ?",
+                [(d["doc_type"], d["doc_id"]) for d in docs]
+            )
+            self._conn.executemany(
+                "INSERT INTO search_docs (doc_type, doc_id, novel_id, title, body) VALUES (?, ?, ?, ?, ?)",
+                [(d["doc_type"], d["doc_id"], d["novel_id"], d["title"] or "", d["body"] or "") for d in docs]
+            )
+            self._conn.commit()
+
+    def rebuild(self, db: Session, batch_size: int = 500) -> int:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_docs")
+            self._conn.commit()
+
+        total = 0
+        sources = [
+            (Novel.id, (Novel.id, Novel.id, Novel.title, Novel.story_summary), "novel"),
+            (Chapter.id, (Chapter.id, Chapter.novel_id, Chapter.chapter_num, Chapter.content, Chapter.summary), "chapter"),
+            # diff/본문 삭제로 정리된 원고는 피드백만 색인
+            (GenerationLog.id, (GenerationLog.id, GenerationLog.novel_id, GenerationLog.chapter_num, GenerationLog.attempt_num,
+                                case((GenerationLog.storage == "full", GenerationLog.content), else_=null()), GenerationLog.feedback), "log"),
+        ]
+        for id_col, columns, doc_type in sources:
+            last_id = 0
+            while True:
+                rows = db.query(*columns).filter(id_col > last_id).order_by(id_col).limit(batch_size).all()
+                if not rows:
+                    break
+                self.index_documents(document_for(doc_type, row) for row in rows)
+                total += len(rows)
+                last_id = rows[-1][0]
+        return total
+
+    def search(self, db: Session, query: str, doc_types: Sequence[str], novel_id: Optional[int], limit: int, offset: int) -> List[Dict[str, Any]]:
+        terms = _terms(query)
+        if not terms:
+            return []
+
+        type_marks = ",".join("?" for _ in doc_types)
+        where = f"doc_type IN ({type_marks})"
+        params: List[Any] = list(doc_types)
+        if novel_id is not None:
+            where += " AND novel_id = ?"
+            params.append(novel_id)
+
+        with self._lock:
+            if all(len(t) >= 3 for t in terms):
+                # trigram 색인은 3글자 이상 검색어부터 사용 가능 → bm25 순위 + 내장 snippet
+                match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+                rows = self._conn.execute(
+                    "SELECT doc_type, doc_id, novel_id, title, snippet(search_docs, 4, '\x02', '\x03', '…', 24), -bm25(search_docs) "
+                    f"FROM search_docs WHERE search_docs MATCH ? AND {where} ORDER BY bm25(search_docs) LIMIT ? OFFSET ?",
+                    [match, *params, limit, offset]
+                ).fetchall()
+                return [_fts_hit(r, html_marks=True) for r in rows]
+
+            # 2글자 이하 검색어(한국어에서 흔함)는 trigram 색인을 못 쓰므로 instr 전체 스캔으로 대체 - 최신 문서 우선
+            # (trigram 테이블에서 3글자 미만 LIKE는 결과가 비어 나오므로 instr 사용)
+            like_where = " AND ".join("(instr(body, ?) > 0 OR instr(title, ?) > 0)" for _ in terms)
+            rows = self._conn.execute(
+                "SELECT doc_type, doc_id, novel_id, title, substr(body, max(instr(body, ?) - ?, 1), ?), 0 "
+                f"FROM search_docs WHERE {like_where} AND {where} ORDER BY rowid DESC LIMIT ? OFFSET ?",
+                [terms[0], SNIPPET_CHARS // 3, SNIPPET_CHARS, *[v for t in terms for v in (t, t)], *params, limit, offset]
+            ).fetchall()
+            return [{**_fts_hit(r, html_marks=False), "snippet": highlight(r[4], terms)} for r in rows]
+
+
+def _fts_hit(row, html_marks: bool) -> Dict[str, Any]:
+    snippet = row[4] or ""
+    if html_marks:
+        snippet = html.escape(snippet).replace("\x02", "<mark>").replace("\x03", "</mark>")
+    return {"doc_type": row[0], "doc_id": int(row[1]), "novel_id": int(row[2]), "title": row[3], "snippet": snippet, "score": float(row[5])}
+
+# ----------------------------------------------------------------
+# 📦 저장 훅에서 쓰는 문서 변환 + 백엔드 선택
+# ----------------------------------------------------------------
+def document_for(doc_type: str, row: Sequence[Any]) -> Dict[str, Any]:
+    """rebuild()의 projection 행을 색인 문서로 변환"""
+    if doc_type == "novel":
+        doc_id, novel_id, title, summary = row
+        return {"doc_type": "novel", "doc_id": doc_id, "novel_id": novel_id, "title": title, "body": summary or ""}
+    if doc_type == "chapter":
+        doc_id, novel_id, chapter_num, content, summary = row
+        return {"doc_type": "chapter", "doc_id": doc_id, "novel_id": novel_id, "title": f"Chapter {chapter_num}", "body": f"{summary or ''}\n{content or ''}"}
+    doc_id, novel_id, chapter_num, attempt_num, content, feedback = row
+    return {"doc_type": "log", "doc_id": doc_id, "novel_id": novel_id, "title": f"Chapter {chapter_num} #{attempt_num}", "body": f"{feedback or ''}\n{content or ''}"}
+
+
+def novel_document(novel: Any) -> Dict[str, Any]:
+    return document_for("novel", (novel.id, novel.id, novel.title, novel.story_summary))
+
+def chapter_document(chapter: Any) -> Dict[str, Any]:
+    return document_for("chapter", (chapter.id, chapter.novel_id, chapter.chapter_num, chapter.content, chapter.summary))
+
+def log_document(log: Any) -> Dict[str, Any]:
+    return document_for("log", (log.id, log.novel_id, log.chapter_num, log.attempt_num, log.content, log.feedback))
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> SearchBackend:
+    """SEARCH_BACKEND 설정에 맞는 검색 백엔드 (프로세스당 1개)"""
+    choice = settings.search.SEARCH_BACKEND
+    if choice == "auto":
+        choice = "mysql" if engine.dialect.name == "mysql" else "sqlite"
+    if choice == "mysql":
+        return MySQLFulltextBackend()
+    return SQLiteFTSBackend(settings.search.SEARCH_INDEX_PATH)
+
+
+def index_safely(docs: Iterable[Dict[str, Any]]) -> None:
+    """저장 직후 색인 갱신. 검색 색인 실패가 본 작업(집필/저장)을 깨뜨리지 않도록 로그만 남깁니다."""
+    try:
+        get_search_backend().index_documents(docs)
+    except Exception as e:
+        logger.warning(f"⚠️ 검색 색인 갱신 실패: {e}")
@@ -0,0 +1,120 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.usage import LLMCallUsage
+
+# ----------------------------------------------------------------
+# 🛑 재작성 루프 중단 정책
+#   라운드가 끝날 때마다 순서대로 검사해 처음으로 "멈춰라"라고 답한 정책의 결정을 따릅니다.
+#   목표 점수를 못 넘고 멈췄을 때 fallback_score 이상인 최고 원고가 있으면 그 원고를 채택합니다.
+# ----------------------------------------------------------------
+@dataclass
+class LoopState:
+    max_rounds: int
+    started_at: float = field(default_factory=time.monotonic)
+    round_num: int = 0
+    round_scores: List[int] = field(default_factory=list)  # 라운드별 최고점
+    best_score: int = 0
+    tokens_used: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def record_round(self, round_num: int, score: Optional[int]):
+        self.round_num = round_num
+        self.round_scores.append(score or 0)
+        self.best_score = max(self.best_score, score or 0)
+
+    def add_tokens(self, calls: Iterable[LLMCallUsage]):
+        """LLM 호출 기록의 실제 토큰 사용량 누적 (캐시 적중은 0)"""
+        self.tokens_used += sum(c.total_tokens for c in calls)
+
+
+@dataclass(frozen=True)
+class StopDecision:
+    policy: str
+    reason: str
+
+
+class StoppingPolicy(ABC):
+    """중단 정책 공통 인터페이스"""
+    name = "base"
+
+    @abstractmethod
+    def check(self, state: LoopState) -> Optional[str]:
+        """멈춰야 하면 사유, 아니면 None"""
+
+
+class MaxAttemptsPolicy(StoppingPolicy):
+    name = "max_attempts"
+
+    def check(self, state: LoopState) -> Optional[str]:
+        if state.round_num >= state.max_rounds:
+            return f"최대 {state.max_rounds}라운드 도달"
+        return None
+
+
+class PlateauPolicy(StoppingPolicy):
+    """최근 window라운드 동안 최고점이 delta점 넘게 오르지 않으면 중단 (예: 82, 83, 82, 83)"""
+    name = "plateau"
+
+    def __init__(self, window: int, delta: int):
+        self.window = window
+        self.delta = delta
+
+    def check(self, state: LoopState) -> Optional[str]:
+        if len(state.round_scores) <= self.window:
+            return None
+        before = max(state.round_scores[:-self.window])
+        recent = max(state.round_scores[-self.window:])
+        if recent - before <= self.delta:
+            return f"최근 {self.window}라운드 최고점 {recent}점 (이전 최고 {before}점 대비 +{self.delta}점 이하)"
+        return None
+
+
+class TimeBudgetPolicy(StoppingPolicy):
+    name = "time_budget"
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+
+    def check(self, state: LoopState) -> Optional[str]:
+        if state.elapsed >= self.seconds:
+            return f"시간 예산 {self.seconds}초 초과 ({state.elapsed:.0f}초 경과)"
+        return None
+
+
+class TokenBudgetPolicy(StoppingPolicy):
+    name = "token_budget"
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+
+    def check(self, state: LoopState) -> Optional[str]:
+        if state.tokens_used >= self.tokens:
+            return f"토큰 예산 {self.tokens:,} 초과 ({state.tokens_used:,} 사용)"
+        return None
+
+
+def build_policies(config: Dict[str, Any]) -> List[StoppingPolicy]:
+    """GenerateConfig 값으로 활성화할 정책 목록 구성 (값이 없는 정책은 끔)"""
+    policies: List[StoppingPolicy] = []
+    if config.get("time_budget_seconds"):
+        policies.append(TimeBudgetPolicy(config["time_budget_seconds"]))
+    if config.get("token_budget"):
+        policies.append(TokenBudgetPolicy(config["token_budget"]))
+    if config.get("plateau_window"):
+        policies.append(PlateauPolicy(config["plateau_window"], config.get("plateau_delta", 1)))
+    policies.append(MaxAttemptsPolicy())
+    return policies
+
+
+def should_stop(policies: List[StoppingPolicy], state: LoopState) -> Optional[StopDecision]:
+    for policy in policies:
+        reason = policy.check(state)
+        if reason:
+            return StopDecision(policy.name, reason)
+    return None
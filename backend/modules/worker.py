@@ -0,0 +1,195 @@
+"""
+집필 작업 워커
+
+API 서버와 별도 프로세스로 실행되어 generation_jobs 테이블에서 작업을 가져와 처리합니다.
+
+    python -m modules.worker --processes 2 --concurrency 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+from core.logger import logger
+from core.metrics import mark_process_dead, start_metrics_server
+from database import BackgroundSessionLocal, background_engine, engine
+from models.generation_job import JobStatus
+from modules.generator import NovelGenerator
+from modules.log_sink import close_log_sink
+from service.job_service import JobService
+
+# 관계 설정(문자열 참조)이 풀리도록 모델 모듈을 미리 불러옵니다.
+from models import novel, prompt, chapter, generation_log, generation_job  # noqa: F401
+
+# 집필 결과(NovelGenerator.outcome) → (작업 상태, 실패 사유)
+OUTCOME_RESULTS: Dict[str, Tuple[str, Optional[str]]] = {
+    "saved": (JobStatus.SUCCEEDED, None),
+    "rejected": (JobStatus.FAILED, "목표 점수 미달 (채택할 원고 없음)"),
+    "missing": (JobStatus.FAILED, "소설 또는 프롬프트 설정 누락"),
+    "locked": (JobStatus.SKIPPED, "잠금 충돌: 다른 실행이 이미 이 소설을 집필 중"),
+}
+
+async def run_job(job_id: int, novel_id: int, config_dict: Dict[str, Any]) -> str:
+    """작업 1건 실행 후 집필 결과 반환 (세션은 NovelGenerator가 짧은 트랜잭션 단위로 직접 빌려 씀)"""
+    generator = NovelGenerator(novel_id)
+    await generator.run_daily_routine(config_dict)
+    return generator.outcome or "error"
+
+# ----------------------------------------------------------------
+# 🗄️ 작업 큐 DB 호출 (동기 세션이므로 스레드에서 실행)
+#   DB 오류(잠김/연결 끊김)로 슬롯이 죽지 않도록 호출하는 쪽에서 재시도합니다.
+# ----------------------------------------------------------------
+def _job_call(method: str, *args) -> Any:
+    db = BackgroundSessionLocal()
+    try:
+        return getattr(JobService(db), method)(*args)
+    finally:
+        db.close()
+
+def _claim(worker_id: str) -> Optional[Tuple[int, int, Dict[str, Any]]]:
+    db = BackgroundSessionLocal()
+    try:
+        job = JobService(db).claim_next_job(worker_id)
+        return (int(getattr(job, "id")), int(getattr(job, "novel_id")), dict(getattr(job, "config") or {})) if job else None
+    finally:
+        db.close()
+
+def _backoff(failures: int) -> float:
+    return min(settings.worker.WORKER_DB_RETRY_BACKOFF * 2 ** (failures - 1), settings.worker.WORKER_DB_RETRY_MAX)
+
+async def _record_with_retry(job_id: int, method: str, *args, max_attempts: Optional[int] = None) -> bool:
+    """
+    종료 기록은 성공할 때까지 재시도 (기록이 빠지면 running으로 남아
+    JOB_STALE_SECONDS 뒤 다른 워커가 다시 실행 → 이미 저장된 회차가 중복 생성됨)
+    """
+    failures = 0
+    while True:
+        try:
+            await asyncio.to_thread(_job_call, method, job_id, *args)
+            return True
+        except Exception as e:
+            failures += 1
+            if max_attempts and failures >= max_attempts:
+                logger.error(f"❌ [작업 {job_id}] {method} 기록 포기 ({failures}회 실패): {e}")
+                return False
+            delay = _backoff(failures)
+            logger.error(f"❌ [작업 {job_id}] {method} 기록 실패 ({failures}회째, {delay:.1f}초 후 재시도): {e}")
+            await asyncio.sleep(delay)
+
+async def watch_job(job_id: int, task: asyncio.Task, user_cancel: asyncio.Event):
+    """주기적으로 생존 신호를 남기고, 취소 요청이 들어오면 실행 중인 작업을 취소합니다."""
+    while not task.done():
+        await asyncio.sleep(settings.worker.WORKER_HEARTBEAT_INTERVAL)
+        try:
+            cancel_requested = await asyncio.to_thread(_job_call, "heartbeat", job_id)
+        except Exception as e:
+            # 한두 번 빠져도 JOB_STALE_SECONDS 안에 다시 성공하면 문제없음
+            logger.warning(f"⚠️ [작업 {job_id}] 생존 신호 기록 실패 (다음 주기에 재시도): {e}")
+            continue
+        if cancel_requested:
+            logger.info(f"🛑 [작업 {job_id}] 취소 요청 감지 → 중단합니다.")
+            user_cancel.set()
+            task.cancel()
+            return
+
+async def worker_slot(worker_id: str):
+    """작업을 하나씩 가져와 끝까지 처리하는 슬롯 (프로세스당 concurrency개)"""
+    failures = 0
+    while True:
+        try:
+            job_info = await asyncio.to_thread(_claim, worker_id)
+            failures = 0
+        except Exception as e:
+            failures += 1
+            delay = _backoff(failures)
+            logger.error(f"❌ [{worker_id}] 작업 점유 실패 ({failures}회째, {delay:.1f}초 후 재시도): {e}")
+            await asyncio.sleep(delay)
+            continue
+
+        if not job_info:
+            await asyncio.sleep(settings.worker.WORKER_POLL_INTERVAL)
+            continue
+
+        job_id, novel_id, config_dict = job_info
+        logger.info(f"👷 [{worker_id}] 작업 {job_id} (소설 {novel_id}) 시작")
+
+        task = asyncio.create_task(run_job(job_id, novel_id, config_dict))
+        user_cancel = asyncio.Event()
+        watcher = asyncio.create_task(watch_job(job_id, task, user_cancel))
+        status, error = JobStatus.FAILED, None
+        try:
+            outcome = await task
+            status, error = OUTCOME_RESULTS.get(outcome, (JobStatus.FAILED, f"집필 실패 ({outcome})"))
+        except asyncio.CancelledError:
+            if not user_cancel.is_set():
+                # 워커 종료로 슬롯 자체가 취소됨 → 작업은 대기 상태로 되돌리고 취소를 그대로 전파
+                watcher.cancel()
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                # 종료를 오래 막지 않도록 몇 번만 시도 (끝내 실패하면 JOB_STALE_SECONDS 뒤 stale 회수로 다시 실행됨)
+                if await asyncio.shield(_record_with_retry(job_id, "requeue_job", max_attempts=3)):
+                    logger.info(f"↩️ [{worker_id}] 워커 종료 → 작업 {job_id} 다시 대기열로")
+                raise
+            status = JobStatus.CANCELLED
+        except Exception as e:
+            logger.error(f"❌ [작업 {job_id}] 실행 중 오류: {e}")
+            error = str(e)
+        finally:
+            watcher.cancel()
+
+        await _record_with_retry(job_id, "finish_job", status, error)
+        logger.info(f"🏁 [{worker_id}] 작업 {job_id} 종료 ({status})")
+
+async def run_worker(concurrency: int):
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    await asyncio.gather(*[worker_slot(f"{base_id}:{slot}") for slot in range(concurrency)])
+
+def run_worker_process(concurrency: int):
+    # fork로 물려받은 커넥션은 부모와 공유되므로 버리고 새로 연결
+    engine.dispose(close=False)
+    background_engine.dispose(close=False)
+    try:
+        asyncio.run(run_worker(concurrency))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_log_sink()
+        mark_process_dead()
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 소설 집필 작업 워커")
+    parser.add_argument("--processes", type=int, default=settings.worker.WORKER_PROCESSES, help="워커 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=settings.worker.WORKER_CONCURRENCY, help="프로세스당 동시 작업 수")
+    args = parser.parse_args()
+
+    logger.info(f"🚀 집필 워커 기동: 프로세스 {args.processes}개 × 동시 작업 {args.concurrency}개")
+
+    if settings.worker.WORKER_METRICS_PORT:
+        if args.processes > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            logger.warning("⚠️ PROMETHEUS_MULTIPROC_DIR가 없어 자식 워커 프로세스의 지표는 /metrics에 보이지 않습니다.")
+        start_metrics_server(settings.worker.WORKER_METRICS_PORT)
+        logger.info(f"📈 워커 지표: http://0.0.0.0:{settings.worker.WORKER_METRICS_PORT}/metrics")
+
+    if args.processes <= 1:
+        run_worker_process(args.concurrency)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker_process, args=(args.concurrency,), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for p in processes:
+        p.start()
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        for p in processes:
+            p.terminate()
+    logger.info("🛑 집필 워커 종료.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+# ---------------------------------------------------------
+# 📋 히스토리 목록용 (본문/채점표 같은 큰 컬럼 제외)
+# ---------------------------------------------------------
+class GenerationLogSummary(BaseModel):
+    id: int
+    novel_id: int
+    chapter_num: int = Field(..., description="회차 번호")
+    attempt_num: int = Field(..., description="시도 번호")
+    score: Optional[int] = Field(None, description="AI가 매긴 점수")
+    feedback: Optional[str] = Field(None, description="AI 편집자의 피드백")
+    is_selected: Optional[int] = Field(None, description="최종 원고 채택 여부 (0/1)")
+    storage: str = Field("full", description="본문 보관 형태 (full / diff / pruned: 본문 삭제됨)")
+    stop_policy: Optional[str] = Field(None, description="이 시도에서 루프를 끝낸 정책 (min_score / fallback / plateau / time_budget / token_budget / max_attempts)")
+    stop_reason: Optional[str] = Field(None, description="중단 사유")
+    model: Optional[str] = Field(None, description="원고를 작성한 모델")
+    prompt_tokens: Optional[int] = Field(None, description="이 시도(집필 + 평가)의 입력 토큰")
+    output_tokens: Optional[int] = Field(None, description="이 시도(집필 + 평가)의 출력 토큰")
+    latency_ms: Optional[int] = Field(None, description="이 시도의 LLM 호출 시간 합계")
+    retries: Optional[int] = Field(None, description="이 시도에서 실패 후 재시도한 호출 수")
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# ---------------------------------------------------------
+# 📄 시도 1건 상세 (본문 + 상세 채점표 포함)
+# ---------------------------------------------------------
+class GenerationLogDetail(GenerationLogSummary):
+    content: Optional[str] = Field(None, description="AI가 생성한 원고 본문")
+    raw_review: Optional[Dict[str, Any]] = Field(None, description="상세 채점표 (JSON)")
+
+# ---------------------------------------------------------
+# 📚 히스토리 페이지 응답
+# ---------------------------------------------------------
+class GenerationLogPage(BaseModel):
+    items: List[GenerationLogSummary]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (없으면 마지막 페이지)")
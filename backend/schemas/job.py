@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+# ---------------------------------------------------------
+# 📤 집필 작업 상태 조회 응답
+# ---------------------------------------------------------
+class GenerationJobResponse(BaseModel):
+    id: int
+    novel_id: int
+    status: str = Field(..., description="queued / running / succeeded / failed / cancelled / skipped")
+    config: Dict[str, Any] = Field(default={}, description="요청 당시의 집필 설정")
+    worker_id: Optional[str] = Field(None, description="작업을 처리 중인 워커")
+    cancel_requested: int = Field(0, description="실행 중 취소 요청 여부")
+    error: Optional[str] = Field(None, description="실패 사유")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,50 @@
+import re
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Any, Dict, Optional, Union
+
+# ---------------------------------------------------------
+# 🧐 평가 단계 응답 (review_prompt)
+#   구조화 출력 모드에서는 이 모델에서 만든 응답 스키마를 모델에 함께 보냅니다.
+#   스키마가 없는 응답(예전 모델/수정된 프롬프트)도 같은 모델로 검증합니다.
+# ---------------------------------------------------------
+class ReviewDetails(BaseModel):
+    # 기본 채점 기준표(각 20점). 프롬프트에서 기준을 바꿨다면 다른 키도 그대로 보존
+    model_config = ConfigDict(extra="allow")
+
+    readability: Optional[int] = Field(None, description="가독성 (0~20)")
+    catharsis: Optional[int] = Field(None, description="사이다/카타르시스 (0~20)")
+    structure: Optional[int] = Field(None, description="개연성/구성 (0~20)")
+    character: Optional[int] = Field(None, description="캐릭터 (0~20)")
+    fun: Optional[int] = Field(None, description="절단신공/재미 (0~20)")
+
+class ReviewOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    score: int = Field(..., description="총점 (0~100)")
+    feedback: str = Field("피드백 없음", description="재작성을 위한 구체적인 수정 지시")
+    reason: Optional[str] = Field(None, description="점수를 준 이유")
+    details: Optional[ReviewDetails] = Field(None, description="기준별 점수")
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _parse_score(cls, value: Any) -> int:
+        # "85점", "85/100", 85.0 같은 값도 점수로 인정하고 0~100으로 자름
+        if isinstance(value, str):
+            match = re.search(r"-?\d+(?:\.\d+)?", value)
+            if not match:
+                raise ValueError(f"점수를 읽을 수 없습니다: {value!r}")
+            value = match.group(0)
+        return max(0, min(100, int(float(value))))
+
+# ---------------------------------------------------------
+# 📑 요약 단계 응답 (summary_prompt / 회차 요약 일괄 생성)
+# ---------------------------------------------------------
+class NovelSummaryOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    summary: str = Field(..., description="이번 화 핵심 요약 (1~2문장)")
+    # 세계관은 문자열로도, 항목별 객체로도 돌아오므로 둘 다 그대로 받음 (novels.world_setting은 JSON 컬럼)
+    updated_settings: Optional[Union[str, Dict[str, Any]]] = Field(None, description="새로 등장하거나 바뀐 세계관 정보")
+
+class ChapterSummaryOutput(BaseModel):
+    summary: str = Field(..., description="회차 요약")
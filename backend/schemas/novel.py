@@ -39,8 +39,31 @@ class NovelSearchResponse(NovelBase):
 
     class Config:
         from_attributes = True
+
+class NovelSearchPage(BaseModel):
+    items: List[NovelSearchResponse]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (없으면 마지막 페이지)")
         
         
 class GenerateConfig(BaseModel):
     max_attempts: int = Field(10, ge=1, le=20, description="최대 재작성 시도 횟수 (1~20)")
-    min_score: int = Field(95, ge=0, le=100, description="통과 최소 점수 (0~100)")
\ No newline at end of file
+    min_score: int = Field(95, ge=0, le=100, description="통과 최소 점수 (0~100)")
+    parallel_candidates: int = Field(1, ge=1, le=5, description="라운드당 동시에 작성/평가할 후보 원고 수 (1~5)")
+
+    # 🛑 중단 정책 (비워두면 해당 정책 미사용, max_attempts는 항상 적용)
+    plateau_window: Optional[int] = Field(None, ge=1, le=10, description="최근 N라운드 동안 최고점이 plateau_delta점 넘게 오르지 않으면 중단")
+    plateau_delta: int = Field(1, ge=0, le=20, description="정체로 판단하는 점수 상승폭 (이하면 정체)")
+    time_budget_seconds: Optional[int] = Field(None, ge=10, description="집필 루프 시간 예산 (초)")
+    token_budget: Optional[int] = Field(None, ge=1000, description="집필 루프 토큰 예산 (프롬프트 + 응답)")
+    fallback_score: Optional[int] = Field(None, ge=0, le=100, description="목표 미달로 멈췄을 때 이 점수 이상인 최고 원고는 채택")
+
+    # 📏 평가 전 로컬 사전 검사 (분량/문단 길이/대사 비율/문장 길이가 명백히 어긋나면 평가 호출 없이 반려)
+    prescreen: bool = Field(True, description="사전 검사 사용 여부 (지표는 항상 기록)")
+    prescreen_min_chars: Optional[int] = Field(None, ge=500, description="이보다 짧으면 반려 (기본 3,000자)")
+    prescreen_max_chars: Optional[int] = Field(None, ge=1000, description="이보다 길면 반려 (기본 7,000자)")
+
+    # 🧬 유사 원고 감지 (이전 시도와 거의 같은 원고는 평가를 재사용)
+    dedup: bool = Field(True, description="유사 원고 감지 사용 여부")
+    dedup_threshold: float = Field(0.9, ge=0.5, le=1.0, description="같은 원고로 보는 유사도 (자카드 추정치)")
+    dedup_past_chapters: int = Field(0, ge=0, le=20, description="최근 N개 회차 본문과도 비교 (겹치면 0점 + 재작성 지시)")
+    dedup_temperature_step: float = Field(0.0, ge=0.0, le=0.5, description="거의 같은 원고가 나오면 다음 라운드 집필 온도를 이만큼 올림 (0이면 끔)")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 
 # ---------------------------------------------------------
 # 📖 공통 필드 정의 (프롬프트의 핵심 내용)
@@ -25,6 +25,10 @@ class PromptUpdate(BaseModel):
 class PromptResponse(PromptBase):
     id: int
     novel_id: int
+    version: int = Field(..., description="수정될 때마다 오르는 버전")
+    placeholder_issues: Dict[str, Dict[str, List[str]]] = Field(
+        default={}, description="항목별 치환 자리 검사 결과 (unknown: 채워지지 않을 자리, missing: 빠진 필수 자리)"
+    )
 
     class Config:
         from_attributes = True
\ No newline at end of file
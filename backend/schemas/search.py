@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+# ---------------------------------------------------------
+# 🔎 전문 검색 결과 1건
+# ---------------------------------------------------------
+class SearchHit(BaseModel):
+    doc_type: str = Field(..., description="novel / chapter / log")
+    doc_id: int = Field(..., description="해당 테이블의 id")
+    novel_id: int
+    title: str = Field(..., description="소설 제목 또는 'Chapter N' 등 표시용 제목")
+    snippet: str = Field(..., description="검색어 주변 발췌 (<mark>로 강조)")
+    score: float = Field(..., description="관련도 점수 (클수록 관련 높음)")
+
+# ---------------------------------------------------------
+# 📚 검색 결과 페이지
+# ---------------------------------------------------------
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_offset: Optional[int] = Field(None, description="다음 페이지 offset (없으면 마지막 페이지)")
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+# ---------------------------------------------------------
+# 🧮 LLM 사용량 합계 (호출 수, 토큰, 지연 시간, 비용)
+# ---------------------------------------------------------
+class UsageTotals(BaseModel):
+    calls: int = Field(0, description="LLM 호출 수 (캐시 적중 포함)")
+    prompt_tokens: int = Field(0, description="입력 토큰 합계")
+    cached_tokens: int = Field(0, description="입력 토큰 중 컨텍스트 캐시에서 읽은 토큰")
+    output_tokens: int = Field(0, description="출력 토큰 합계")
+    total_tokens: int = Field(0, description="입력 + 출력 토큰")
+    latency_ms: int = Field(0, description="호출 시간 합계 (재시도/백오프 대기 포함)")
+    avg_latency_ms: float = Field(0.0, description="캐시 적중을 뺀 호출당 평균 시간")
+    retries: int = Field(0, description="성공 전에 실패한 모델 호출 수 합계")
+    cache_hits: int = Field(0, description="응답 캐시 적중 수")
+    cost_usd: float = Field(0.0, description="AI_MODEL_PRICES 기준 추정 비용")
+
+class ModelUsage(UsageTotals):
+    model: str
+
+# ---------------------------------------------------------
+# 🧭 단계별 (plot / draft / review / summary) 사용량
+# ---------------------------------------------------------
+class StageUsage(UsageTotals):
+    stage: str
+    token_share: float = Field(0.0, description="전체 토큰 중 이 단계 비중 (0~1)")
+    latency_share: float = Field(0.0, description="전체 호출 시간 중 이 단계 비중 (0~1)")
+    models: List[ModelUsage] = []
+
+class NovelUsage(BaseModel):
+    novel_id: int
+    chapter_num: Optional[int] = Field(None, description="특정 회차만 집계한 경우 회차 번호")
+    total: UsageTotals
+    stages: List[StageUsage] = Field([], description="토큰 사용량이 큰 단계부터")
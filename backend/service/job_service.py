@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import Session
+from fastapi import Depends
+from database import get_db
+from core.config import settings
+from models.generation_job import GenerationJob, JobStatus
+
+class JobService:
+    def __init__(self, db: Session = Depends(get_db)):
+        self.db = db
+
+    # ---------------------------------------------------------
+    # 📥 작업 등록 및 조회 (API 측)
+    # ---------------------------------------------------------
+    def enqueue(self, novel_id: int, config: Dict[str, Any]) -> GenerationJob:
+        job = GenerationJob(novel_id=novel_id, status=JobStatus.QUEUED, config=config)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_job(self, job_id: int) -> Optional[GenerationJob]:
+        return self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+
+    def get_active_job(self, novel_id: int) -> Optional[GenerationJob]:
+        """대기 중이거나 실행 중인 작업이 있으면 반환"""
+        return self.db.query(GenerationJob).filter(
+            GenerationJob.novel_id == novel_id,
+            GenerationJob.status.in_(JobStatus.ACTIVE)
+        ).first()
+
+    def count_active_jobs(self) -> Dict[str, int]:
+        """상태별 대기/실행 중 작업 수 (status 인덱스만 사용)"""
+        rows = (
+            self.db.query(GenerationJob.status, func.count())
+            .filter(GenerationJob.status.in_(JobStatus.ACTIVE))
+            .group_by(GenerationJob.status)
+            .all()
+        )
+        counts = dict(rows)
+        return {status: int(counts.get(status, 0)) for status in JobStatus.ACTIVE}
+
+    def cancel_job(self, job_id: int) -> Optional[GenerationJob]:
+        """대기 중인 작업은 즉시 취소, 실행 중인 작업은 워커가 알아채도록 취소 요청만 표시"""
+        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).with_for_update().first()
+        if not job:
+            return None
+
+        if job.status == JobStatus.QUEUED:
+            job.status = JobStatus.CANCELLED  # type: ignore
+            job.finished_at = _now()  # type: ignore
+        elif job.status == JobStatus.RUNNING:
+            job.cancel_requested = 1  # type: ignore
+
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    # ---------------------------------------------------------
+    # 👷 작업 점유 및 상태 전이 (워커 측)
+    # ---------------------------------------------------------
+    def claim_next_job(self, worker_id: str) -> Optional[GenerationJob]:
+        """
+        다음 작업 1건을 행 잠금(FOR UPDATE SKIP LOCKED)으로 가져옵니다.
+        다른 워커가 잠근 행은 건너뛰므로 여러 프로세스가 동시에 호출해도 같은 작업을 중복으로 가져가지 않습니다.
+        생존 신호가 끊긴 running 작업(워커 비정상 종료)도 다시 가져갑니다.
+        상태 변경은 읽은 값 그대로일 때만 반영되는 조건부 UPDATE라서, 행 잠금이 없는 DB(SQLite)에서
+        여러 슬롯이 같은 행을 읽어도 한 곳만 가져갑니다.
+        """
+        stale_before = _now() - timedelta(seconds=settings.worker.JOB_STALE_SECONDS)
+        job = (
+            self.db.query(GenerationJob)
+            .filter(or_(
+                GenerationJob.status == JobStatus.QUEUED,
+                and_(GenerationJob.status == JobStatus.RUNNING, GenerationJob.heartbeat_at < stale_before)
+            ))
+            .order_by(GenerationJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if not job:
+            self.db.rollback()
+            return None
+
+        now = _now()
+        claimed = (
+            self.db.query(GenerationJob)
+            .filter(
+                GenerationJob.id == job.id,
+                GenerationJob.status == job.status,
+                GenerationJob.heartbeat_at.is_(None) if job.heartbeat_at is None else GenerationJob.heartbeat_at == job.heartbeat_at,
+            )
+            .update({"status": JobStatus.RUNNING, "worker_id": worker_id, "started_at": now, "heartbeat_at": now}, synchronize_session=False)
+        )
+        self.db.commit()
+        if claimed != 1:
+            return None
+        self.db.refresh(job)
+        return job
+
+    def heartbeat(self, job_id: int) -> bool:
+        """생존 신호 갱신. 취소 요청이 들어와 있으면 True를 반환합니다."""
+        job = self.get_job(job_id)
+        if not job:
+            return True
+        job.heartbeat_at = _now()  # type: ignore
+        self.db.commit()
+        return bool(job.cancel_requested)
+
+    def requeue_job(self, job_id: int):
+        """워커 종료로 중단된 작업을 다시 대기 상태로 (다른 워커가 곧바로 가져감)"""
+        job = self.get_job(job_id)
+        if job and job.status == JobStatus.RUNNING:
+            job.status = JobStatus.QUEUED  # type: ignore
+            job.worker_id = None  # type: ignore
+            job.started_at = None  # type: ignore
+            job.heartbeat_at = None  # type: ignore
+            self.db.commit()
+
+    def finish_job(self, job_id: int, status: str, error: Optional[str] = None):
+        job = self.get_job(job_id)
+        if job:
+            job.status = status  # type: ignore
+            job.error = error  # type: ignore
+            job.finished_at = _now()  # type: ignore
+            self.db.commit()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
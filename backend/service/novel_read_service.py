@@ -0,0 +1,136 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import Text, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from fastapi import Depends
+from database import get_async_db
+from models.novel import Novel
+from models.generation_log import GenerationLog
+from models.generation_job import GenerationJob
+from models.llm_call import LLMCall
+from core.pagination import apaginate_desc
+from core.usage import estimate_cost
+from modules.log_retention import restore_content
+
+# 목록/검색 응답에 필요한 컬럼만 (world_setting, rules 같은 큰 JSON은 제외)
+NOVEL_LIST_COLUMNS = (Novel.id, Novel.title, Novel.genre, Novel.story_summary, Novel.created_at)
+
+# 히스토리 목록용 컬럼 (content, raw_review는 상세 조회에서만)
+LOG_LIST_COLUMNS = (
+    GenerationLog.id, GenerationLog.novel_id, GenerationLog.chapter_num, GenerationLog.attempt_num,
+    GenerationLog.score, GenerationLog.feedback, GenerationLog.is_selected, GenerationLog.storage,
+    GenerationLog.stop_policy, GenerationLog.stop_reason, GenerationLog.model, GenerationLog.prompt_tokens,
+    GenerationLog.output_tokens, GenerationLog.latency_ms, GenerationLog.retries, GenerationLog.created_at
+)
+
+class NovelReadService:
+    """
+    조회 전용 API 서비스 (비동기 세션).
+    집필이 동기 풀의 커넥션을 오래 붙잡고 있어도 조회 요청은 별도의 비동기 풀에서 처리됩니다.
+    """
+
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        self.db = db
+
+    # ---------------------------------------------------------
+    # 🔍 검색 로직
+    # ---------------------------------------------------------
+    async def search_content(self, keyword: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """제목, 줄거리, 세계관(JSON 텍스트 변환) 통합 검색 - (목록용 컬럼 행, 다음 커서)"""
+        stmt = select(*NOVEL_LIST_COLUMNS)
+        if keyword:
+            stmt = stmt.where(
+                Novel.title.ilike(f"%{keyword}%") |
+                Novel.story_summary.ilike(f"%{keyword}%") |
+                Novel.world_setting.cast(Text).ilike(f"%{keyword}%")
+            )
+        return await apaginate_desc(self.db, stmt, Novel.created_at, Novel.id, limit, cursor)
+
+    async def search_novels(self, title: Optional[str] = None, genre: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        stmt = select(*NOVEL_LIST_COLUMNS)
+        if title:
+            stmt = stmt.where(Novel.title.ilike(f"%{title}%"))
+        if genre:
+            stmt = stmt.where(Novel.genre.ilike(f"%{genre}%"))
+        return await apaginate_desc(self.db, stmt, Novel.created_at, Novel.id, limit, cursor)
+
+    # ---------------------------------------------------------
+    # 📊 히스토리 조회
+    # ---------------------------------------------------------
+    async def get_history(self, novel_id: int, limit: int = 50, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """본문/채점표를 뺀 가벼운 목록 - (행, 다음 커서)"""
+        stmt = select(*LOG_LIST_COLUMNS).where(GenerationLog.novel_id == novel_id)
+        return await apaginate_desc(self.db, stmt, GenerationLog.created_at, GenerationLog.id, limit, cursor)
+
+    async def get_history_detail(self, novel_id: int, log_id: int) -> Optional[GenerationLog]:
+        """시도 1건의 본문과 상세 채점표까지 조회 (diff로 정리된 원고는 기준 원고로 복원)"""
+        log = await self.db.scalar(
+            select(GenerationLog).where(GenerationLog.novel_id == novel_id, GenerationLog.id == log_id)
+        )
+        if log is not None and log.storage != "full":
+            base_content = await self.db.scalar(
+                select(GenerationLog.content).where(GenerationLog.id == log.diff_base_id)
+            ) if log.diff_base_id else None
+            # 응답용 값만 바꾸고 변경으로 추적하지 않음
+            set_committed_value(log, "content", restore_content(log, base_content))
+        return log
+
+    # ---------------------------------------------------------
+    # 🧮 LLM 사용량 (단계별 / 모델별)
+    # ---------------------------------------------------------
+    async def get_usage(self, novel_id: int, chapter_num: Optional[int] = None) -> Dict[str, Any]:
+        """llm_calls를 (단계, 모델) 단위로 DB에서 합산한 뒤 단계별 내역과 비용을 붙입니다."""
+        stmt = (
+            select(
+                LLMCall.stage, LLMCall.model, func.count().label("calls"),
+                func.sum(LLMCall.prompt_tokens).label("prompt_tokens"),
+                func.sum(LLMCall.cached_tokens).label("cached_tokens"),
+                func.sum(LLMCall.output_tokens).label("output_tokens"),
+                func.sum(LLMCall.latency_ms).label("latency_ms"),
+                func.sum(LLMCall.retries).label("retries"),
+                func.sum(LLMCall.cached).label("cache_hits"),
+            )
+            .where(LLMCall.novel_id == novel_id)
+            .group_by(LLMCall.stage, LLMCall.model)
+        )
+        if chapter_num is not None:
+            stmt = stmt.where(LLMCall.chapter_num == chapter_num)
+        rows = (await self.db.execute(stmt)).all()
+
+        stages: Dict[str, list] = {}
+        for row in rows:
+            stages.setdefault(row.stage, []).append(row)
+        total = _sum_usage(rows)
+        breakdown = []
+        for stage, stage_rows in stages.items():
+            usage = _sum_usage(stage_rows)
+            usage.update(
+                stage=stage,
+                token_share=round(usage["total_tokens"] / total["total_tokens"], 4) if total["total_tokens"] else 0.0,
+                latency_share=round(usage["latency_ms"] / total["latency_ms"], 4) if total["latency_ms"] else 0.0,
+                models=sorted(({"model": r.model, **_sum_usage([r])} for r in stage_rows), key=lambda m: -m["total_tokens"]),
+            )
+            breakdown.append(usage)
+        breakdown.sort(key=lambda u: (-u["total_tokens"], u["stage"]))
+        return {"novel_id": novel_id, "chapter_num": chapter_num, "total": total, "stages": breakdown}
+
+    # ---------------------------------------------------------
+    # 🧾 집필 작업 상태
+    # ---------------------------------------------------------
+    async def get_job(self, job_id: int) -> Optional[GenerationJob]:
+        return await self.db.get(GenerationJob, job_id)
+
+
+def _sum_usage(rows: Iterable[Any]) -> Dict[str, Any]:
+    """(단계, 모델) 집계 행들을 하나로 합산"""
+    usage = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "latency_ms": 0, "retries": 0, "cache_hits": 0, "cost_usd": 0.0}
+    for row in rows:
+        for key in ("calls", "prompt_tokens", "cached_tokens", "output_tokens", "latency_ms", "retries", "cache_hits"):
+            usage[key] += int(getattr(row, key) or 0)
+        usage["cost_usd"] += estimate_cost(row.model, int(row.prompt_tokens or 0), int(row.output_tokens or 0), int(row.cached_tokens or 0))
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["output_tokens"]
+    # 캐시 적중은 ~0ms라 평균을 왜곡하므로 실제 호출만으로 평균
+    live_calls = usage["calls"] - usage["cache_hits"]
+    usage["avg_latency_ms"] = round(usage["latency_ms"] / live_calls, 1) if live_calls else 0.0
+    usage["cost_usd"] = round(usage["cost_usd"], 6)
+    return usage
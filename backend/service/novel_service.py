@@ -1,13 +1,17 @@
-from typing import Any, Optional, List
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import Text
+from sqlalchemy import func
 from fastapi import Depends
 from database import get_db 
 from models.novel import Novel
 from models.prompt import PromptSetting
 from models.chapter import Chapter
-from models.generation_log import GenerationLog
 from schemas.novel import NovelCreate
+from schemas.prompt import PromptUpdate
+from core.logger import logger
+from modules.log_sink import get_log_sink
+from modules.prompt_template import check_prompt_settings
+from modules.search_index import index_safely, novel_document, chapter_document
 
 class NovelService:
     def __init__(self, db: Session = Depends(get_db)):
@@ -37,50 +41,57 @@ class NovelService:
         
         self.db.commit()
         self.db.refresh(db_novel)
+        index_safely([novel_document(db_novel)])
         return db_novel
 
     def get_novel(self, novel_id: int) -> Optional[Novel]:
         return self.db.query(Novel).filter(Novel.id == novel_id).first()
 
     # ---------------------------------------------------------
-    # 🔍 검색 로직 
+    # ⚙️ 프롬프트 설정
     # ---------------------------------------------------------
-    def search_content(self, keyword: Optional[str] = None) -> List[Novel]:
-        """제목, 줄거리, 세계관(JSON 텍스트 변환) 통합 검색"""
-        query = self.db.query(Novel)
-        if keyword:
-            filter_stmt = (
-                Novel.title.ilike(f"%{keyword}%") | 
-                Novel.story_summary.ilike(f"%{keyword}%") |
-                Novel.world_setting.cast(Text).ilike(f"%{keyword}%")
-            )
-            query = query.filter(filter_stmt)
-        return query.all()
-
-    def search_novels(self, title: Optional[str] = None, genre: Optional[str] = None) -> List[Novel]:
-        query = self.db.query(Novel)
-        if title:
-            query = query.filter(Novel.title.ilike(f"%{title}%"))
-        if genre:
-            query = query.filter(Novel.genre.ilike(f"%{genre}%"))
-        return query.all()
+    def get_prompts(self, novel_id: int) -> Optional[PromptSetting]:
+        return self.db.query(PromptSetting).filter(PromptSetting.novel_id == novel_id).first()
+
+    def check_prompts(self, novel: Novel, prompt: PromptSetting) -> Dict[str, Dict[str, List[str]]]:
+        """치환 자리 검사 (소설 rules의 키도 치환값으로 인정)"""
+        rules = novel.rules if isinstance(novel.rules, dict) else {}
+        return check_prompt_settings(
+            {field: getattr(prompt, field) for field in PromptUpdate.model_fields}, rules.keys()
+        )
+
+    def update_prompts(self, novel: Novel, prompt_in: PromptUpdate) -> Tuple[Optional[PromptSetting], Dict[str, Dict[str, List[str]]]]:
+        """보낸 항목만 수정 (버전은 ORM이 자동으로 올림). 저장은 막지 않고 치환 자리 문제만 함께 돌려줌"""
+        prompt = self.get_prompts(int(getattr(novel, "id")))
+        if not prompt:
+            return None, {}
+        for field, value in prompt_in.model_dump(exclude_unset=True, exclude_none=True).items():
+            setattr(prompt, field, value)
+        self.db.commit()
+        self.db.refresh(prompt)
+
+        issues = self.check_prompts(novel, prompt)
+        if issues:
+            logger.warning(f"⚠️ 소설 {novel.id} 프롬프트 치환 자리 확인 필요: {issues}")
+        return prompt, issues
 
     # ---------------------------------------------------------
     # ✍️ 집필 프로세스 지원 로직
     # ---------------------------------------------------------
     def get_last_chapter_num(self, novel_id: int) -> int:
-        last = self.db.query(Chapter).filter(Chapter.novel_id == novel_id).order_by(Chapter.chapter_num.desc()).first()
-        return int(getattr(last, "chapter_num")) if last else 0  # Pylance 에러 방어
+        last_num = self.db.query(func.max(Chapter.chapter_num)).filter(Chapter.novel_id == novel_id).scalar()
+        return int(last_num) if last_num else 0
 
     def get_recent_context(self, novel_id: int, count: int = 3) -> str:
-        chapters = self.db.query(Chapter).filter(Chapter.novel_id == novel_id).order_by(Chapter.chapter_num.desc()).limit(count).all()
+        chapters = self.db.query(Chapter.chapter_num, Chapter.content).filter(Chapter.novel_id == novel_id).order_by(Chapter.chapter_num.desc()).limit(count).all()
         return "".join([f"\n[Chapter {c.chapter_num}]\n{c.content}\n" for c in reversed(chapters)])
 
     # ---------------------------------------------------------
     # 💾 기록 및 저장
     # ---------------------------------------------------------
     def log_attempt(self, novel_id: int, chapter_num: int, attempt: int, content: str, review: dict, is_selected: bool):
-        self.db.add(GenerationLog(
+        """시도 기록은 write-behind 저장소에 맡김 (건수/시간 기준으로 모아서 bulk INSERT)"""
+        get_log_sink().add(
             novel_id=novel_id,
             chapter_num=chapter_num,
             attempt_num=attempt,
@@ -88,9 +99,8 @@ class NovelService:
             score=int(review.get("score", 0)),
             feedback=review.get("feedback", ""),
             raw_review=review,
-            is_selected=1 if is_selected else 0
-        ))
-        self.db.commit()
+            is_selected=is_selected
+        )
 
     def save_chapter(self, novel_id: int, chapter_num: int, content: str, score: int, feedback: str) -> Chapter:
         db_chapter = Chapter(
@@ -101,7 +111,10 @@ class NovelService:
             feedback=feedback
         )
         self.db.add(db_chapter)
+        self.db.flush()
+        doc = chapter_document(db_chapter)
         self.db.commit()
+        index_safely([doc])
         return db_chapter
 
     def update_world_and_summary(self, novel_id: int, new_world: Any, new_summary: str):
@@ -111,12 +124,7 @@ class NovelService:
             novel.story_summary = new_summary # type: ignore
             self.db.commit()
             self.db.refresh(novel)
-
-    # ---------------------------------------------------------
-    # 📊 히스토리 조회
-    # ---------------------------------------------------------
-    def get_history(self, novel_id: int):
-        return self.db.query(GenerationLog).filter(GenerationLog.novel_id == novel_id).order_by(GenerationLog.created_at.desc()).all()
+            index_safely([novel_document(novel)])
 
     # ---------------------------------------------------------
     # 🛠️ 프라이빗 헬퍼 메서드
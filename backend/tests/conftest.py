@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# 앱 모듈이 설정을 읽기 전에 외부 의존성(MySQL, Gemini) 없이 동작하도록 환경을 고정합니다.
+_tmp = tempfile.mkdtemp(prefix="creative-tests-")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(_tmp, 'test.sqlite3')}")
+os.environ.setdefault("AI_BACKEND", "fake")
+os.environ.setdefault("LOCK_BACKEND", "memory")
+os.environ.setdefault("LOG_SINK_SPOOL_DIR", os.path.join(_tmp, "spool"))
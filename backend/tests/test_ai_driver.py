@@ -0,0 +1,16 @@
+import asyncio
+
+from core.ai_driver import get_ai_driver
+
+
+def test_semaphore_is_created_per_event_loop():
+    driver = get_ai_driver()
+
+    async def semaphore():
+        first = driver._get_semaphore()
+        assert driver._get_semaphore() is first
+        async with first:  # 다른 루프에서 만든 세마포어였다면 여기서 RuntimeError
+            await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(semaphore()) is not asyncio.run(semaphore())
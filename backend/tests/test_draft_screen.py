@@ -0,0 +1,89 @@
+import pytest
+
+from modules.draft_screen import ScreenRules, measure_draft, screen_draft
+
+DIALOGUE = '"오늘은 꼭 이겨야 해." 민준이 말했다.'   # 대사 문단
+NARRATION = "그는 검을 고쳐 쥐었다. 바람이 불었다."   # 서술 문단
+
+
+def _draft(dialogue: int, narration: int, repeat: int = 1) -> str:
+    """대사/서술 문단을 섞은 원고 (빈 줄로 문단 구분)"""
+    paragraphs = ([DIALOGUE] * dialogue + [NARRATION] * narration) * repeat
+    return "\n\n".join(paragraphs)
+
+
+# ----------------------------------------------------------------
+# 📏 지표 계산
+# ----------------------------------------------------------------
+def test_dialogue_ratio_counts_quoted_paragraphs():
+    m = measure_draft(_draft(dialogue=3, narration=2))
+    total = 3 * len(DIALOGUE) + 2 * len(NARRATION)
+    assert m.paragraphs == 5
+    assert m.dialogue_ratio == pytest.approx(3 * len(DIALOGUE) / total)
+
+
+@pytest.mark.parametrize("opener", ['"', "“", "「", "『", "'", "‘"])
+def test_dialogue_openers(opener):
+    assert measure_draft(f"{opener}대사").dialogue_ratio == 1.0
+
+
+def test_brick_paragraphs_use_screen_lines():
+    rules = ScreenRules(screen_line_chars=30, max_paragraph_lines=3)
+    brick = "가" * 91   # 4줄
+    fine = "가" * 90    # 3줄
+    m = measure_draft("\n".join([brick, fine, fine, fine]), rules)
+    assert m.max_paragraph_lines == 4
+    assert m.brick_ratio == 0.25
+
+
+def test_korean_sentence_splitting():
+    m = measure_draft('"가자." 그는 말했다. 비가 왔다… 정말?! 끝\n"어디로…?"')
+    # "가자." / 그는 말했다. / 비가 왔다… / 정말?! / 끝 / "어디로…?"
+    assert m.sentences == 6
+
+
+def test_empty_draft():
+    m = measure_draft("\n\n  \n")
+    assert (m.chars, m.paragraphs, m.sentences, m.dialogue_ratio, m.brick_ratio) == (0, 0, 0, 0.0, 0.0)
+
+
+# ----------------------------------------------------------------
+# 🚦 사전 검사
+# ----------------------------------------------------------------
+LOOSE = ScreenRules(min_chars=100, max_chars=10000)
+
+
+def test_well_formed_draft_passes():
+    result = screen_draft(_draft(dialogue=3, narration=2, repeat=5), LOOSE)
+    assert result.passed
+    assert result.violations == [] and result.feedback == ""
+
+
+def test_length_violations():
+    assert screen_draft(_draft(3, 2), ScreenRules(min_chars=1000)).violations == ["too_short"]
+    assert screen_draft(_draft(3, 2, repeat=10), ScreenRules(min_chars=100, max_chars=500)).violations == ["too_long"]
+
+
+def test_dialogue_violations():
+    assert "low_dialogue" in screen_draft(_draft(dialogue=0, narration=5, repeat=5), LOOSE).violations
+    assert "high_dialogue" in screen_draft(_draft(dialogue=5, narration=0, repeat=5), LOOSE).violations
+
+
+def test_brick_and_long_sentence_violations():
+    brick = "그는 " + "아주 " * 60 + "천천히 걸었다."
+    draft = "\n".join([brick, DIALOGUE, brick, DIALOGUE])
+    result = screen_draft(draft, LOOSE)
+    assert {"brick_paragraphs", "long_sentences"} <= set(result.violations)
+    assert result.feedback.startswith("[사전 검사 반려]")
+    assert "벽돌 문단" in result.feedback and "만연체" in result.feedback
+
+
+def test_to_dict_rounds_metrics():
+    data = screen_draft(_draft(dialogue=2, narration=1, repeat=3), LOOSE).to_dict()
+    assert data["passed"] is True
+    assert data["dialogue_ratio"] == round(data["dialogue_ratio"], 3)
+
+
+def test_rules_from_config():
+    rules = ScreenRules.from_config({"prescreen": False, "prescreen_min_chars": 2000})
+    assert (rules.enforce, rules.min_chars, rules.max_chars) == (False, 2000, ScreenRules().max_chars)
@@ -0,0 +1,84 @@
+import random
+
+from modules.draft_similarity import DraftIndex, DraftSketch
+
+
+def _text(seed: int, length: int = 4000) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice("가나다라마바사아자차카타파하 ") for _ in range(length))
+
+
+BASE = _text(1)
+EDITED = BASE[:2000] + "새로운 문장이 하나 들어갔다" + BASE[2000:]
+
+
+# ----------------------------------------------------------------
+# 🧬 스케치 유사도
+# ----------------------------------------------------------------
+def test_identical_and_reformatted_texts_are_the_same_draft():
+    sketch = DraftSketch.from_text(BASE)
+    assert sketch.similarity(DraftSketch.from_text(BASE)) == 1.0
+    # 줄바꿈/문장부호만 바뀐 재작성은 같은 원고
+    assert sketch.similarity(DraftSketch.from_text(BASE.replace(" ", "\n"))) == 1.0
+
+
+def test_small_edit_is_near_and_unrelated_text_is_far():
+    sketch = DraftSketch.from_text(BASE)
+    assert sketch.similarity(DraftSketch.from_text(EDITED)) > 0.9
+    assert sketch.similarity(DraftSketch.from_text(_text(2))) < 0.1
+
+
+def test_similarity_is_symmetric():
+    a, b = DraftSketch.from_text(BASE), DraftSketch.from_text(EDITED)
+    assert a.similarity(b) == b.similarity(a)
+
+
+def test_text_shorter_than_shingle_is_a_single_shingle():
+    short = DraftSketch.from_text("짧다", shingle_chars=5)
+    assert short.shingles == 1
+    assert short.similarity(DraftSketch.from_text("짧다", shingle_chars=5)) == 1.0
+    assert short.similarity(DraftSketch.from_text("길다", shingle_chars=5)) == 0.0
+
+
+def test_fewer_shingles_than_hashes_uses_all_of_them():
+    text = "그는 문을 열고 밖으로 나갔다 비가 오고 있었다"
+    sketch = DraftSketch.from_text(text, num_hashes=128)
+    assert len(sketch.hashes) == sketch.shingles < 128
+    assert 0.0 < sketch.similarity(DraftSketch.from_text(text + " 우산은 없었다")) < 1.0
+
+
+def test_empty_text_matches_nothing():
+    empty = DraftSketch.from_text("  \n ")
+    assert empty.shingles == 0
+    assert empty.similarity(DraftSketch.from_text("")) == 0.0
+    assert empty.similarity(DraftSketch.from_text(BASE)) == 0.0
+
+
+# ----------------------------------------------------------------
+# 🗂️ 유사 원고 색인
+# ----------------------------------------------------------------
+def test_nearest_returns_none_on_empty_index():
+    index = DraftIndex()
+    assert len(index) == 0
+    assert index.nearest(index.sketch(BASE)) is None
+
+
+def test_nearest_respects_threshold():
+    index = DraftIndex(threshold=0.9)
+    index.add(index.sketch(BASE), "base")
+    similarity, payload = index.nearest(index.sketch(EDITED))
+    assert payload == "base" and similarity >= 0.9
+    assert index.nearest(index.sketch(_text(2))) is None
+
+    exact = DraftIndex(threshold=1.0)
+    exact.add(exact.sketch(BASE), "base")
+    assert exact.nearest(exact.sketch(EDITED)) is None
+    assert exact.nearest(exact.sketch(BASE)) == (1.0, "base")
+
+
+def test_nearest_picks_the_most_similar_entry():
+    index = DraftIndex(threshold=0.5)
+    index.add(index.sketch(EDITED), "edited")
+    index.add(index.sketch(BASE), "base")
+    index.add(index.sketch(_text(2)), "other")
+    assert index.nearest(index.sketch(BASE)) == (1.0, "base")
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from core.config import settings
+from core.lock import InProcessLockBackend, LeaseLock, LeaseLostError, LockBackend
+
+
+def test_lock_backend_is_abstract():
+    with pytest.raises(TypeError):
+        LockBackend()
+
+    class Partial(LockBackend):
+        def acquire(self, key, owner, ttl):
+            return True
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+class _FlakyBackend(InProcessLockBackend):
+    mode = "ok"
+
+    def refresh(self, key, owner, ttl):
+        if self.mode == "error":
+            raise RuntimeError("db down")
+        if self.mode == "stolen":
+            return False
+        return super().refresh(key, owner, ttl)
+
+
+def test_lease_is_lost_when_refresh_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings.lock, "LOCK_HEARTBEAT_INTERVAL", 0.01)
+    backend = _FlakyBackend()
+
+    async def run():
+        lock = LeaseLock("novel:1", ttl=5, backend=backend)
+        async with lock as acquired:
+            assert acquired
+            await asyncio.sleep(0.05)
+            lock.ensure_held()
+            # 일시적인 오류는 ttl 안에서는 보유로 봄
+            backend.mode = "error"
+            await asyncio.sleep(0.05)
+            assert lock.held
+            backend.mode = "stolen"
+            await asyncio.sleep(0.05)
+            assert lock.lost and not lock.held
+            with pytest.raises(LeaseLostError):
+                lock.ensure_held()
+
+    asyncio.run(run())
+
+
+def test_lease_expires_when_refresh_keeps_failing(monkeypatch):
+    monkeypatch.setattr(settings.lock, "LOCK_HEARTBEAT_INTERVAL", 0.01)
+    backend = _FlakyBackend()
+    backend.mode = "error"
+
+    async def run():
+        lock = LeaseLock("novel:2", ttl=1, backend=backend)
+        async with lock:
+            lock._refreshed_at -= 1  # 마지막 연장 후 ttl이 지난 것으로
+            assert not lock.held and not lock.lost
+
+    asyncio.run(run())
+
+
+def test_lease_acquired_outside_context_blocks_others_until_released():
+    backend = InProcessLockBackend()
+
+    async def run():
+        lease = LeaseLock("novel:3", ttl=5, backend=backend)
+        assert await lease.acquire()
+        async with LeaseLock("novel:3", ttl=5, backend=backend) as acquired:
+            assert not acquired
+        await lease.release()
+        await lease.release()  # 두 번 풀어도 무해
+        async with LeaseLock("novel:3", ttl=5, backend=backend) as acquired:
+            assert acquired
+
+    asyncio.run(run())
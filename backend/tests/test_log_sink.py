@@ -0,0 +1,70 @@
+import json
+import os
+import socket
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import chapter, generation_job, generation_log, novel, prompt  # noqa: F401 (관계 설정)
+from models.generation_log import GenerationLog
+from modules.log_sink import GenerationLogSink
+
+DEAD_PID = 999999
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr("modules.log_sink.index_safely", lambda docs: None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.sqlite3'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _sink(tmp_path, session_factory) -> GenerationLogSink:
+    # 주기 저장은 끄고(긴 간격) 테스트에서 flush()로만 저장
+    return GenerationLogSink(str(tmp_path / "spool"), batch_size=1000, flush_interval=3600, fsync=False, session_factory=session_factory)
+
+
+def _record(attempt: int, **extra):
+    return {"novel_id": 1, "chapter_num": 1, "attempt_num": attempt, "content": f"원고 {attempt}", "score": 80,
+            "feedback": "f", "raw_review": {}, "is_selected": 0, **extra}
+
+
+def test_created_at_comes_from_the_database_default(tmp_path, session_factory):
+    sink = _sink(tmp_path, session_factory)
+    sink.add_many([_record(1), _record(2)])
+    assert sink.flush()
+    sink.close()
+
+    with session_factory() as db:
+        rows = db.query(GenerationLog.attempt_num, GenerationLog.created_at, GenerationLog.spool_id).order_by(GenerationLog.id).all()
+        server_now = db.scalar(select(func.now()))
+    assert [r.attempt_num for r in rows] == [1, 2]
+    assert all(r.spool_id and len(r.spool_id) == 32 for r in rows)
+    # DB 기본값과 같은 시계 (SQLite CURRENT_TIMESTAMP) - 시간대가 섞이면 몇 시간씩 차이남
+    assert all(abs((server_now - r.created_at.replace(tzinfo=None)).total_seconds()) < 60 for r in rows)
+
+
+def test_recovered_spool_skips_records_already_saved(tmp_path, session_factory):
+    spool_dir = tmp_path / "spool"
+    os.makedirs(spool_dir)
+    saved, lost = _record(1, spool_id="a" * 32), _record(2, spool_id="b" * 32)
+    with session_factory() as db:
+        db.add(GenerationLog(**saved))
+        db.commit()
+    # 저장 직후 스풀을 지우기 전에 죽은 프로세스의 스풀
+    with open(spool_dir / f"{DEAD_PID}__{socket.gethostname()}.jsonl", "w", encoding="utf-8") as f:
+        for record in (saved, lost):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    sink = _sink(tmp_path, session_factory)
+    assert sink.pending() == 2
+    assert sink.flush()
+    sink.close()
+
+    with session_factory() as db:
+        assert sorted(db.query(GenerationLog.spool_id).all()) == [("a" * 32,), ("b" * 32,)]
+    assert os.listdir(spool_dir) == []
@@ -0,0 +1,111 @@
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import Session, declarative_base
+
+from core.pagination import apaginate_desc, decode_cursor, encode_cursor, paginate_desc
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime)
+
+
+T0 = datetime(2026, 10, 1, 12, 0, 0)
+# 같은 시각이 여러 행인 경우 포함 (id로 순서 결정)
+CREATED = {1: T0, 2: T0, 3: T0 + timedelta(seconds=1), 4: T0, 5: T0 + timedelta(seconds=1), 6: T0 - timedelta(seconds=1), 7: T0}
+EXPECTED = sorted(CREATED, key=lambda i: (CREATED[i], i), reverse=True)  # [5, 3, 7, 4, 2, 1, 6]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'page.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Row(id=i, created_at=c) for i, c in CREATED.items()])
+        session.commit()
+        yield session
+
+
+# ----------------------------------------------------------------
+# 🔖 커서 인코딩
+# ----------------------------------------------------------------
+@pytest.mark.parametrize("created_at", [T0, datetime(2026, 10, 1, 3, 4, 5, 678901, tzinfo=timezone.utc), None])
+def test_cursor_round_trip(created_at):
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor) == (created_at, 42)
+    # URL 쿼리에 그대로 넣을 수 있는 문자만 사용
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'{"c": null}').decode(),
+    base64.urlsafe_b64encode(b'{"c": "yesterday", "i": 1}').decode(),
+    base64.urlsafe_b64encode(b'{"c": null, "i": "abc"}').decode(),
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="잘못된 커서"):
+        decode_cursor(cursor)
+
+
+# ----------------------------------------------------------------
+# 📄 keyset 순서 (created_at DESC, id DESC)
+# ----------------------------------------------------------------
+def _walk(fetch, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = fetch(limit, cursor)
+        seen.extend(r.id for r in rows)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_pages_follow_created_at_then_id_with_ties(db, limit):
+    seen, pages = _walk(lambda n, c: paginate_desc(db.query(Row), Row.created_at, Row.id, n, c), limit)
+    assert seen == EXPECTED
+    assert pages == max(1, -(-len(EXPECTED) // limit))
+
+
+def test_cursor_inside_a_tie_continues_with_smaller_ids(db):
+    rows, cursor = paginate_desc(db.query(Row), Row.created_at, Row.id, 3)
+    assert [r.id for r in rows] == [5, 3, 7]
+    assert decode_cursor(cursor) == (T0, 7)
+    rows, _ = paginate_desc(db.query(Row), Row.created_at, Row.id, 2, cursor)
+    assert [r.id for r in rows] == [4, 2]
+
+
+def test_last_full_page_has_no_next_cursor(db):
+    rows, cursor = paginate_desc(db.query(Row), Row.created_at, Row.id, len(EXPECTED))
+    assert len(rows) == len(EXPECTED) and cursor is None
+
+
+def test_async_pagination_matches_sync(tmp_path):
+    async def walk():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'apage.sqlite3'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add_all([Row(id=i, created_at=c) for i, c in CREATED.items()])
+            await db.commit()
+            seen, cursor = [], None
+            while True:
+                rows, cursor = await apaginate_desc(db, select(Row.id, Row.created_at), Row.created_at, Row.id, 2, cursor)
+                seen.extend(r.id for r in rows)
+                if cursor is None:
+                    break
+        await engine.dispose()
+        return seen
+
+    assert asyncio.run(walk()) == EXPECTED
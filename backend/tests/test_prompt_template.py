@@ -0,0 +1,109 @@
+from modules.prompt_template import PromptTemplate, PromptTemplateCache, check_placeholders, check_prompt_settings
+
+REVIEW = '원고:\n{content}\n\n제목: {title}\n아래 형식으로만 답하세요.\n{ "score": 0, "details": {"fun": 0} }'
+
+
+# ----------------------------------------------------------------
+# 🧩 컴파일 / 렌더링
+# ----------------------------------------------------------------
+def test_compile_splits_literals_and_names():
+    template = PromptTemplate.compile("제 {chapter_num}화 {title}")
+    assert template.literals == ("제 ", "화 ", "")
+    assert template.names == ("chapter_num", "title")
+    assert template.placeholders == {"chapter_num", "title"}
+
+
+def test_json_braces_are_not_placeholders():
+    template = PromptTemplate.compile(REVIEW)
+    assert template.placeholders == {"content", "title"}
+    rendered = template.render({"content": "본문", "title": "회귀"})
+    assert rendered.endswith('{ "score": 0, "details": {"fun": 0} }')
+
+
+def test_render_keeps_unfilled_placeholders():
+    assert PromptTemplate.compile("{title} / {hero}").render({"title": "회귀"}) == "회귀 / {hero}"
+
+
+def test_render_does_not_expand_placeholders_inside_values():
+    # 값 안에 {이름}이 있어도 다시 치환하지 않음 (replace 연쇄와 다른 점)
+    assert PromptTemplate.compile("{plot} {title}").render({"plot": "{title}", "title": "회귀"}) == "{title} 회귀"
+
+
+def test_repeated_placeholder_is_filled_everywhere():
+    assert PromptTemplate.compile("{hero}와 {hero}").render({"hero": "민준"}) == "민준와 민준"
+
+
+# ----------------------------------------------------------------
+# 🧷 partial (일부만 미리 채우기)
+# ----------------------------------------------------------------
+def test_partial_keeps_only_keep_set_and_missing_values():
+    template = PromptTemplate.compile("{title} {content} {hero}").partial({"title": "회귀", "content": "X"}, keep=("content",))
+    assert template.names == ("content", "hero")
+    assert template.render({"content": "본문"}) == "회귀 본문 {hero}"
+
+
+def test_partial_then_render_matches_full_render():
+    template = PromptTemplate.compile(REVIEW)
+    values = {"title": "회귀", "content": "본문"}
+    assert template.partial({"title": "회귀"}, keep=("content",)).render({"content": "본문"}) == template.render(values)
+
+
+def test_partial_without_keep_fills_everything():
+    template = PromptTemplate.compile("{a}-{b}").partial({"a": 1, "b": 2})
+    assert template.names == ()
+    assert template.render({}) == "1-2"
+
+
+# ----------------------------------------------------------------
+# 🗃️ 캐시
+# ----------------------------------------------------------------
+def test_cache_reuses_same_version_and_evicts_oldest():
+    cache = PromptTemplateCache(max_entries=2)
+    first = cache.get(1, 1, "plot_prompt", "{title}")
+    assert cache.get(1, 1, "plot_prompt", "무시됨") is first
+    assert cache.get(1, 2, "plot_prompt", "{plot}").names == ("plot",)
+    cache.get(2, 1, "plot_prompt", "{title}")
+    assert cache.get(1, 1, "plot_prompt", "{context}").names == ("context",)
+    # id/버전이 없으면 캐시하지 않음
+    assert cache.get(None, None, "plot_prompt", "{a}") is not cache.get(None, None, "plot_prompt", "{a}")
+
+
+# ----------------------------------------------------------------
+# 🔎 저장 시점 검사
+# ----------------------------------------------------------------
+def test_check_placeholders_reports_unknown_and_missing():
+    assert check_placeholders("review_prompt", "{title} {hero} {villain}", rule_keys=["hero"]) == {
+        "unknown": ["villain"], "missing": ["content"],
+    }
+
+
+def test_check_placeholders_ignores_json_example():
+    assert check_placeholders("review_prompt", REVIEW) == {"unknown": [], "missing": []}
+
+
+def test_check_prompt_settings_returns_only_problem_fields():
+    issues = check_prompt_settings({
+        "plot_prompt": "{title}",
+        "writing_prompt": "{hero}",
+        "review_prompt": None,
+    })
+    assert issues == {"writing_prompt": {"unknown": ["hero"], "missing": ["plot"]}}
+
+
+# ----------------------------------------------------------------
+# 🔤 한글 / 하이픈 이름 (소설 rules 키)
+# ----------------------------------------------------------------
+def test_korean_and_hyphenated_placeholders_are_rendered():
+    template = PromptTemplate.compile("주인공: {주인공} / 톤: {writing-tone} / {world}")
+    assert template.names == ("주인공", "writing-tone", "world")
+    assert template.render({"주인공": "민준", "writing-tone": "건조체", "world": "W"}) == "주인공: 민준 / 톤: 건조체 / W"
+    assert template.partial({"주인공": "민준"}, keep=("world",)).render({"world": "W"}) == "주인공: 민준 / 톤: {writing-tone} / W"
+
+
+def test_korean_and_hyphenated_placeholders_are_checked():
+    assert check_placeholders("writing_prompt", "{주인공} {writing-tone} {plot}", ["주인공"]) == {
+        "unknown": ["writing-tone"], "missing": [],
+    }
+    assert check_placeholders("writing_prompt", "{주인공} {writing-tone}", ["주인공", "writing-tone"]) == {
+        "unknown": [], "missing": ["plot"],
+    }
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from core.usage import LLMCallUsage
+from modules.generator import NovelGenerator, NovelSnapshot
+from modules.stopping import (
+    LoopState, MaxAttemptsPolicy, PlateauPolicy, StoppingPolicy, TimeBudgetPolicy, TokenBudgetPolicy,
+    build_policies, should_stop,
+)
+
+
+def _state(*scores: int, max_rounds: int = 10) -> LoopState:
+    state = LoopState(max_rounds=max_rounds)
+    for i, score in enumerate(scores, start=1):
+        state.record_round(i, score)
+    return state
+
+
+# ----------------------------------------------------------------
+# 🛑 중단 정책
+# ----------------------------------------------------------------
+def test_stopping_policy_is_abstract():
+    with pytest.raises(TypeError):
+        StoppingPolicy()
+
+
+def test_plateau_waits_until_window_is_full():
+    policy = PlateauPolicy(window=3, delta=1)
+    assert policy.check(_state(80, 80, 80)) is None
+
+
+def test_plateau_stops_when_recent_best_does_not_improve():
+    policy = PlateauPolicy(window=3, delta=1)
+    assert policy.check(_state(82, 83, 82, 83)) is not None
+
+
+def test_plateau_keeps_going_while_scores_climb():
+    policy = PlateauPolicy(window=2, delta=1)
+    assert policy.check(_state(70, 75, 80)) is None
+    # 실패 라운드(None → 0점)가 섞여도 최근 최고점으로 판단
+    assert policy.check(_state(70, 0, 72)) is None
+
+
+def test_time_budget(monkeypatch):
+    state = LoopState(max_rounds=10, started_at=100.0)
+    monkeypatch.setattr("modules.stopping.time.monotonic", lambda: 159.0)
+    assert TimeBudgetPolicy(60).check(state) is None
+    monkeypatch.setattr("modules.stopping.time.monotonic", lambda: 160.0)
+    assert "60초" in TimeBudgetPolicy(60).check(state)
+
+
+def test_token_budget_counts_actual_usage():
+    state = LoopState(max_rounds=10)
+    state.add_tokens([LLMCallUsage(stage="draft", model="m", prompt_tokens=600, output_tokens=300)])
+    assert TokenBudgetPolicy(1000).check(state) is None
+    state.add_tokens([LLMCallUsage(stage="review", model="m", prompt_tokens=100, output_tokens=0)])
+    assert TokenBudgetPolicy(1000).check(state) is not None
+
+
+def test_should_stop_returns_first_policy_in_order():
+    state = _state(80, 80, 80, 80, max_rounds=4)
+    state.tokens_used = 5000
+    decision = should_stop(build_policies({"token_budget": 1000, "plateau_window": 2}), state)
+    assert decision.policy == "token_budget"
+    assert should_stop([MaxAttemptsPolicy()], state).policy == "max_attempts"
+    assert should_stop([MaxAttemptsPolicy()], _state(80, max_rounds=4)) is None
+
+
+# ----------------------------------------------------------------
+# 🔁 목표 미달로 멈췄을 때 fallback_score 채택
+# ----------------------------------------------------------------
+class _Sink:
+    def __init__(self):
+        self.records = []
+
+    def add_many(self, records):
+        self.records.extend(records)
+
+
+def _run_loop(monkeypatch, scores, config):
+    generator = NovelGenerator(novel_id=1)
+    sink = _Sink()
+    monkeypatch.setattr("modules.generator.get_log_sink", lambda: sink)
+    it = iter(scores)
+
+    async def write_and_review(*args, **kwargs):
+        score = next(it)
+        return f"원고 {score}", score, f"피드백 {score}", {"score": score}, [], None
+
+    monkeypatch.setattr(generator, "_write_and_review", write_and_review)
+    novel = NovelSnapshot(
+        title="t", story_summary="", world_setting={}, rules={},
+        plot_prompt="plot", writing_prompt="write", review_prompt="review {content}", summary_prompt="summary",
+    )
+    result = asyncio.run(generator._execute_generation_loop(novel, {}, {"dedup": False, **config}, 1))
+    return result, sink.records
+
+
+def test_fallback_accepts_best_draft_when_policies_stop(monkeypatch):
+    (content, score, feedback), records = _run_loop(
+        monkeypatch, [70, 85, 82], {"max_attempts": 3, "min_score": 95, "fallback_score": 80}
+    )
+    assert (content, score, feedback) == ("원고 85", 85, "피드백 85")
+    assert records[-1]["stop_policy"] == "fallback"
+    assert "최대 3라운드" in records[-1]["stop_reason"]
+
+
+def test_fallback_rejects_when_best_is_below_fallback_score(monkeypatch):
+    (content, score, _), records = _run_loop(
+        monkeypatch, [70, 85, 82], {"max_attempts": 3, "min_score": 95, "fallback_score": 90}
+    )
+    assert content == ""
+    assert score == 85
+    assert records[-1]["stop_policy"] == "max_attempts"
+
+
+def test_min_score_stops_before_fallback(monkeypatch):
+    (content, score, _), records = _run_loop(
+        monkeypatch, [70, 96], {"max_attempts": 5, "min_score": 95, "fallback_score": 60}
+    )
+    assert (content, score) == ("원고 96", 96)
+    assert records[-1]["stop_policy"] == "min_score"
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from core.structured_output import extract_json_object, parse_structured, repair_json, response_schema, salvage_fields
+from schemas.llm_output import NovelSummaryOutput, ReviewOutput
+
+
+# ----------------------------------------------------------------
+# 🧩 첫 번째 { } 블록 추출
+# ----------------------------------------------------------------
+def test_extract_ignores_prose_and_second_object():
+    text = '평가 결과입니다.\n{"score": 80} 참고로 {"score": 10}도 있습니다.'
+    assert extract_json_object(text) == '{"score": 80}'
+
+
+def test_extract_ignores_braces_inside_strings():
+    text = '{"feedback": "대사 {괄호}와 \\"따옴표\\" }", "score": 70} 끝'
+    assert json.loads(extract_json_object(text)) == {"feedback": '대사 {괄호}와 "따옴표" }', "score": 70}
+
+
+def test_extract_closes_truncated_object():
+    assert json.loads(extract_json_object('{"score": 80, "details": {"fun": 15')) == {"score": 80, "details": {"fun": 15}}
+    assert json.loads(extract_json_object('{"score": 80, "feedback": "잘린 문')) == {"score": 80, "feedback": "잘린 문"}
+
+
+def test_extract_without_object():
+    assert extract_json_object("JSON이 없습니다") is None
+
+
+# ----------------------------------------------------------------
+# 🩹 로컬 복구
+# ----------------------------------------------------------------
+def test_repair_strips_code_fence():
+    assert json.loads(repair_json('```json\n{"score": 90}\n```')) == {"score": 90}
+
+
+def test_repair_escapes_raw_newlines_and_tabs_in_strings():
+    repaired = repair_json('{"feedback": "첫 줄\n둘째\t줄", "score": 70}')
+    assert json.loads(repaired)["feedback"] == "첫 줄\n둘째\t줄"
+
+
+def test_repair_removes_trailing_commas():
+    assert json.loads(repair_json('{"score": 70, "details": {"fun": 10,}, "tags": [1, 2,],}')) == {
+        "score": 70, "details": {"fun": 10}, "tags": [1, 2]
+    }
+
+
+def test_salvage_reads_top_level_fields_from_broken_object():
+    text = '{"score": "85점", "feedback": "문단을\n짧게", "details": {"fun": oops'
+    assert salvage_fields(text, ReviewOutput) == {"score": "85점", "feedback": "문단을\n짧게"}
+
+
+# ----------------------------------------------------------------
+# ✅ 검증 경로 (valid / repaired / salvaged / invalid)
+# ----------------------------------------------------------------
+def test_parse_valid():
+    review, result = parse_structured('{"score": 92, "feedback": "좋음"}', ReviewOutput)
+    assert result == "valid"
+    assert (review.score, review.feedback) == (92, "좋음")
+
+
+def test_parse_repaired():
+    review, result = parse_structured('```json\n{"score": 81, "feedback": "줄\n바꿈",}\n```', ReviewOutput)
+    assert result == "repaired"
+    assert (review.score, review.feedback) == (81, "줄\n바꿈")
+
+
+def test_parse_salvaged():
+    review, result = parse_structured('{"score": 77, "feedback": "좋아요", "details": {"fun": [}}', ReviewOutput)
+    assert result == "salvaged"
+    assert (review.score, review.feedback) == (77, "좋아요")
+
+
+@pytest.mark.parametrize("text", ["", "점수를 매길 수 없습니다.", '{"feedback": "점수 없음"}'])
+def test_parse_invalid(text):
+    assert parse_structured(text, ReviewOutput) == (None, "invalid")
+
+
+@pytest.mark.parametrize("raw, expected", [("85점", 85), ("85/100", 85), (85.7, 85), (130, 100), (-5, 0)])
+def test_review_score_accepts_loose_values(raw, expected):
+    review, _ = parse_structured(json.dumps({"score": raw}), ReviewOutput)
+    assert review.score == expected
+
+
+def test_review_score_without_number_is_invalid():
+    assert parse_structured('{"score": "만점"}', ReviewOutput) == (None, "invalid")
+
+
+# ----------------------------------------------------------------
+# 📐 응답 스키마
+# ----------------------------------------------------------------
+def test_response_schema_uses_supported_keys_only():
+    schema = response_schema(ReviewOutput)
+    assert schema["required"] == ["score"]
+    assert schema["properties"]["reason"]["nullable"] is True
+    assert schema["properties"]["details"]["properties"]["fun"]["type"] == "integer"
+    assert "title" not in json.dumps(schema) and "$ref" not in json.dumps(schema)
+
+
+# ----------------------------------------------------------------
+# 📑 요약 응답의 세계관 갱신값 (문자열 / 객체)
+# ----------------------------------------------------------------
+@pytest.mark.parametrize("updated", [{"장치": "증기기관", "도시": ["런던"]}, "증기기관이 보급되었다"])
+def test_summary_keeps_world_settings_as_string_or_object(updated):
+    text = json.dumps({"summary": "s", "updated_settings": updated}, ensure_ascii=False)
+    summary, result = parse_structured(text, NovelSummaryOutput)
+    assert result == "valid"
+    assert summary.updated_settings == updated
+
+
+def test_summary_world_settings_object_survives_repair():
+    summary, result = parse_structured('```json\n{"summary": "s", "updated_settings": {"장치": "증기기관",},}\n```', NovelSummaryOutput)
+    assert result == "repaired"
+    assert summary.updated_settings == {"장치": "증기기관"}
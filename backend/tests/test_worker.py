@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from models.generation_job import JobStatus
+from modules import worker
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """작업 큐 DB 호출을 기록만 하고, 작업 1건을 넘겨준 뒤에는 슬롯을 멈춤"""
+    recorded = []
+
+    def job_call(method, *args):
+        recorded.append((method, *args))
+
+    claimed = iter([(7, 1, {})])
+
+    def claim(worker_id):
+        try:
+            return next(claimed)
+        except StopIteration:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(worker, "_job_call", job_call)
+    monkeypatch.setattr(worker, "_claim", claim)
+    return recorded
+
+
+@pytest.mark.parametrize("outcome, status, error", [
+    ("saved", JobStatus.SUCCEEDED, None),
+    ("rejected", JobStatus.FAILED, "목표 점수 미달"),
+    ("missing", JobStatus.FAILED, "설정 누락"),
+    ("locked", JobStatus.SKIPPED, "잠금 충돌"),
+    ("error", JobStatus.FAILED, "error"),
+])
+def test_outcome_is_recorded_as_its_own_status(monkeypatch, calls, outcome, status, error):
+    async def run_job(job_id, novel_id, config_dict):
+        return outcome
+
+    monkeypatch.setattr(worker, "run_job", run_job)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(worker.worker_slot("test:0"))
+
+    (method, job_id, recorded_status, recorded_error), = [c for c in calls if c[0] == "finish_job"]
+    assert (job_id, recorded_status) == (7, status)
+    assert recorded_error is None if error is None else error in recorded_error